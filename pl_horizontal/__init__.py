@@ -1,32 +1,58 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Literal
 
 import polars as pl
 from polars.plugins import register_plugin_function
 
 from pl_horizontal._internal import __version__ as __version__
+from pl_horizontal import _internal
 from pl_horizontal._expr_builders import build_arg_true_horizontal_first_known_col
 
 if TYPE_CHECKING:
-    from pl_horizontal.typing import IntoExprColumn
+    from pl_horizontal.typing import FrameT, IntoExprColumn
     from collections.abc import Iterable
 
 LIB = Path(__file__).parent
 
 
-def collapse_columns(expr: IntoExprColumn, *, is_null_sentinel: bool) -> pl.Expr:
+def collapse_columns(
+    expr: IntoExprColumn,
+    *,
+    is_null_sentinel: bool,
+    zero_copy: bool = False,
+    to_array: int | None = None,
+    fill: Any = None,
+    unique: bool = False,
+) -> pl.Expr:
     """Collapse columns horizontally into a list column, while excluding Nulls.
 
+    Works on every numeric dtype, Boolean, String, Date, Datetime, Duration, Decimal,
+    Categorical and Enum. Integer columns of different widths are collapsed in their
+    supertype; Categorical columns must share a dictionary (global string cache).
+
     Args:
         expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
         is_null_sentinel (bool): Whether the columns are arranged as a null-sentinel
             problem, where nulls are pushed to the back. This enables a fast path
             where the first null triggers an early stop.
+        zero_copy (bool): For String inputs, build the list values from the input string
+            views and share their data buffers, so no string bytes are copied. The output
+            then keeps every input data buffer alive for as long as it lives, so a small
+            (e.g. filtered) result can pin far more memory than it shows. When False, the
+            kept strings are copied into compact buffers. Defaults to False.
+        to_array (int | None): Write a fixed-width `Array` of this width instead of a list,
+            keeping the first `to_array` non-null values of each row. Rows stop being scanned
+            once they are full. Defaults to None.
+        fill (Any): Value for the unfilled slots of `to_array` rows; they are null when not
+            given. Requires `to_array`. Defaults to None.
+        unique (bool): Drop repeated values within each row while collapsing, instead of a
+            `.list.unique()` afterwards. Values keep their first-seen order; with `to_array`,
+            the first `to_array` unique values are kept. Defaults to False.
 
     Returns:
-        pl.Expr: Expression evaluating to a list column of collapsed values.
+        pl.Expr: Expression evaluating to a list (or array) column of collapsed values.
 
     Examples:
         >>> import polars as pl
@@ -46,17 +72,156 @@ def collapse_columns(expr: IntoExprColumn, *, is_null_sentinel: bool) -> pl.Expr
         >>> # Fast path: nulls are guaranteed to be after all non-nulls in each row
         >>> res = df.select(f = collapse_columns(pl.col("a", "b", "c"), is_null_sentinel=True))
         >>> assert res["f"].to_list() == [['x', 'y'], [], ['z']]
+
+        >>> df = pl.DataFrame({"a": [1, None], "b": [2.5, 3.5]})
+        >>> res = df.select(f = collapse_columns(pl.all().cast(pl.Float64), is_null_sentinel=False))
+        >>> assert res["f"].to_list() == [[1.0, 2.5], [3.5]]
+
+        >>> df = pl.DataFrame({"a": [1, None], "b": [2, 3], "c": [4, None]})
+        >>> res = df.select(f = collapse_columns(pl.all(), is_null_sentinel=False, to_array=2, fill=0))
+        >>> assert res["f"].to_list() == [[1, 2], [3, 0]]
+
+        >>> df = pl.DataFrame({"a": ["x", "y"], "b": ["y", "y"], "c": ["x", None]})
+        >>> res = df.select(f = collapse_columns(pl.all(), is_null_sentinel=False, unique=True))
+        >>> assert res["f"].to_list() == [["x", "y"], ["y"]]
     """
+    if to_array is not None and to_array < 1:
+        raise ValueError(f"`to_array` must be at least 1, got {to_array}")
+    if fill is not None and to_array is None:
+        raise ValueError("`fill` requires `to_array`")
+
+    args = [expr] if fill is None else [expr, pl.lit(fill)]
     return register_plugin_function(
-        args=[expr],
+        args=args,
         plugin_path=LIB,
         function_name="collapse_columns",
         is_elementwise=True,
         input_wildcard_expansion=True,
+        kwargs={
+            "is_null_sentinel": is_null_sentinel,
+            "zero_copy": zero_copy,
+            "to_array": to_array,
+            "has_fill": fill is not None,
+            "unique": unique,
+        },
+    )
+
+
+def collapse_columns_sparse(
+    expr: IntoExprColumn, *, is_null_sentinel: bool = False
+) -> pl.Expr:
+    """Collapse columns horizontally into a list of `(col, value)` pairs, while excluding Nulls.
+
+    The sparse counterpart of `collapse_columns`: each kept value is paired with the name
+    of its column, as an Enum over the input column names shared by every row.
+
+    Args:
+        expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
+        is_null_sentinel (bool): Whether nulls are pushed to the back of each row, so the
+            first null ends the row. Defaults to False.
+
+    Returns:
+        pl.Expr: Expression evaluating to a `List[Struct{col: Enum, value}]` column.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({"a": [1, None], "b": [None, 2], "c": [3, 4]})
+        >>> res = df.select(f = collapse_columns_sparse(pl.all()))
+        >>> assert res["f"].to_list() == [
+        ...     [{"col": "a", "value": 1}, {"col": "c", "value": 3}],
+        ...     [{"col": "b", "value": 2}, {"col": "c", "value": 4}],
+        ... ]
+    """
+    return register_plugin_function(
+        args=[expr],
+        plugin_path=LIB,
+        function_name="collapse_columns_sparse",
+        is_elementwise=True,
+        input_wildcard_expansion=True,
         kwargs={"is_null_sentinel": is_null_sentinel},
     )
 
 
+def _unpivot_sparse_expr(columns: IntoExprColumn) -> pl.Expr:
+    """Struct of `row_idx`, `col_idx` and `value`, one row per kept cell."""
+    return register_plugin_function(
+        args=[columns],
+        plugin_path=LIB,
+        function_name="unpivot_sparse",
+        is_elementwise=False,
+        # One row per kept cell, not per input row
+        changes_length=True,
+        input_wildcard_expansion=True,
+    )
+
+
+def unpivot_sparse(frame: FrameT, columns: IntoExprColumn | None = None) -> FrameT:
+    """Unpivot a wide frame into long `(row_idx, col_idx, value)` coordinates of its non-null cells.
+
+    Unlike `frame.unpivot().drop_nulls()`, the rows x columns long frame is never
+    materialized: the validity bitmaps are counted first and the output is written at
+    its final size. Boolean columns only keep their true cells.
+
+    Args:
+        frame (pl.DataFrame | pl.LazyFrame): The wide frame.
+        columns (IntoExprColumn | None): Columns to unpivot, in order; `col_idx` indexes
+            into them. Defaults to every column.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Frame of `row_idx`, `col_idx` and `value`, in row-major order.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({"a": [1, None], "b": [None, None], "c": [3, 4]})
+        >>> res = unpivot_sparse(df)
+        >>> assert res.rows() == [(0, 0, 1), (0, 2, 3), (1, 2, 4)]
+    """
+    coo = _unpivot_sparse_expr(pl.all() if columns is None else columns)
+    return frame.select(coo.alias("coo")).unnest("coo")
+
+
+def spread_list(
+    expr: IntoExprColumn, n: int, *, names: Iterable[str] | None = None
+) -> pl.Expr:
+    """Spread a list (or array) column back into a struct of `n` fields.
+
+    The inverse of `collapse_columns`: field `i` holds the `i`-th element of each row,
+    or null when the row is shorter, so null-sentinel layouts round-trip. All fields
+    are gathered from a single pass over the list offsets, instead of scanning the
+    column once per `list.get(i)`.
+
+    Args:
+        expr (IntoExprColumn): List or Array column.
+        n (int): Number of fields to emit; longer rows are truncated.
+        names (Iterable[str] | None): Field names, `field_0`, `field_1`, ... when not
+            given. Defaults to None.
+
+    Returns:
+        pl.Expr: Expression evaluating to a struct of `n` fields; `unnest` it to get
+            the columns back.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({"a": [["x", "y"], ["z"], None]})
+        >>> res = df.select(spread_list(pl.col("a"), 2, names=["b", "c"])).unnest("a")
+        >>> assert res["b"].to_list() == ["x", "z", None]
+        >>> assert res["c"].to_list() == ["y", None, None]
+    """
+    if n < 1:
+        raise ValueError(f"`n` must be at least 1, got {n}")
+    names = [f"field_{i}" for i in range(n)] if names is None else list(names)
+    if len(names) != n:
+        raise ValueError(f"`names` must hold {n} names, got {len(names)}")
+
+    return register_plugin_function(
+        args=[expr],
+        plugin_path=LIB,
+        function_name="spread_list",
+        is_elementwise=True,
+        kwargs={"names": names},
+    )
+
+
 def arg_true_horizontal(expr: IntoExprColumn) -> pl.Expr:
     """
     Return a horizontal boolean expression that indicates whether each row has any True value.
@@ -109,19 +274,47 @@ def arg_first_true_horizontal(expr: IntoExprColumn | Iterable[str]) -> pl.Expr:
     )
 
 
-def multi_index(expr: IntoExprColumn, lookup: pl.Series) -> pl.Expr:
+def multi_index(
+    expr: IntoExprColumn,
+    lookup: IntoExprColumn | None = None,
+    *,
+    lookup_name: str | None = None,
+    as_struct: bool = False,
+    check_bounds: bool = False,
+    null_on_oob: bool = False,
+    as_enum: bool = False,
+) -> pl.Expr:
     """Take integer cols and use them as an index against the lookup.
 
     This is functionally equivalent to using `gather` but against multiple columns
-    in a dataframe context. Function is unsafe(!), and will panic on a bad index;
-    done to increase performance during the indexing.
+    in a dataframe context. By default there is no prepass: negative or too large
+    indices raise an error while gathering, they are never read as null. `check_bounds`
+    validates them up front with a min/max pass, which costs a fraction of the gather,
+    and `null_on_oob` reads them as null instead.
 
     Args:
         expr (IntoExprColumn): Integer column, ideally uint32.
-        lookup (pl.Series): String series to index into.
+        lookup (IntoExprColumn | None): Values to index into, of any dtype. Either a
+            series, which is embedded in the plan, or an expression (or column name)
+            evaluated in the same context as `expr`; it does not need the frame's length.
+        lookup_name (str | None): Name of a lookup stored with `register_lookup`, used
+            instead of `lookup`; this keeps the lookup out of the plan.
+        as_struct (bool): Gather every column of `expr` in a single call and return
+            them as the fields of one struct, so the lookup is prepared once for all of
+            them. Use `.struct.unnest()` to get one column per index. Defaults to False.
+        check_bounds (bool): Raise a `ComputeError` naming the offending index when
+            any index is negative or past the end of the lookup. Any integer dtype is
+            accepted, wide indices are never truncated. Defaults to False.
+        null_on_oob (bool): Return null for out-of-bounds indices instead of raising;
+            implies `check_bounds`. Defaults to False.
+        as_enum (bool): Return an `Enum` whose categories are the lookup, with the indices
+            as its codes. No strings are gathered or copied, and UInt32 indices are used
+            as they are. The lookup must be a Series (or `lookup_name`) of unique,
+            non-null strings, so the categories are known when planning; indices are
+            always bounds checked. Defaults to False.
 
     Returns:
-        pl.Expr: Expression evaluating to the indexed string series.
+        pl.Expr: Expression evaluating to the indexed values, in the lookup's dtype.
 
     Example:
         >>> df = pl.DataFrame({"idx": [2, 0, 2, 1]})
@@ -129,28 +322,157 @@ def multi_index(expr: IntoExprColumn, lookup: pl.Series) -> pl.Expr:
         >>> out = df.select(multi_index(pl.col("idx"), ser))
         >>> # idx 2 → "gamma", idx 0 → "alpha", idx 1 → "beta"
         >>> assert out.to_series().to_list() == ["gamma", "alpha", "gamma", "beta"]
-    """
-    if not lookup.dtype.is_(pl.String):
-        raise TypeError(f"`lookup` must be a String series, not `{type(lookup)}`")
 
-    # TODO: Let lookup be any old into expression too
+        >>> df = pl.DataFrame({"idx": [1, 0], "dim": [10.5, 20.5]})
+        >>> out = df.select(multi_index(pl.col("idx"), "dim"))
+        >>> assert out.to_series().to_list() == [20.5, 10.5]
+
+        >>> df = pl.DataFrame({"a": [0, 1], "b": [1, 1]})
+        >>> out = df.select(multi_index(pl.all(), ser, as_struct=True).struct.unnest())
+        >>> assert out.rows() == [("alpha", "beta"), ("beta", "beta")]
+
+        >>> df = pl.DataFrame({"idx": [-1, 1, 3]})
+        >>> out = df.select(multi_index(pl.col("idx"), ser, null_on_oob=True))
+        >>> assert out.to_series().to_list() == [None, "beta", None]
 
+        >>> df = pl.DataFrame({"idx": [2, 0]}, schema={"idx": pl.UInt32})
+        >>> out = df.select(multi_index(pl.col("idx"), ser, as_enum=True))
+        >>> assert out.to_series().dtype == pl.Enum(["alpha", "beta", "gamma"])
+        >>> assert out.to_series().to_list() == ["gamma", "alpha"]
+    """
+    if (lookup is None) == (lookup_name is None):
+        raise ValueError("pass exactly one of `lookup` and `lookup_name`")
+
+    registered = lookup_name is not None
+    enum_categories = None
+    if as_enum and not registered:
+        if not isinstance(lookup, pl.Series):
+            raise ValueError(
+                "`as_enum` requires a Series or registered lookup, "
+                "the categories of an expression lookup are not known when planning"
+            )
+        if (
+            lookup.dtype != pl.String
+            or lookup.null_count() > 0
+            or lookup.n_unique() != lookup.len()
+        ):
+            raise ValueError("`as_enum` requires a lookup of unique, non-null strings")
+        # The categories go in the kwargs so the output dtype is known when planning
+        enum_categories = lookup.to_list()
+
+    inline = not registered and enum_categories is None
     return register_plugin_function(
-        args=[expr, lookup],
+        args=[expr, lookup] if inline else [expr],
         plugin_path=LIB,
         function_name="multi_index",
-        is_elementwise=True,  # Full `lookup` must be available for each row
+        # Registered and series lookups are whole in every batch; an expression lookup
+        # has to be evaluated whole
+        is_elementwise=not inline or isinstance(lookup, pl.Series),
+        input_wildcard_expansion=as_struct,
+        kwargs={
+            "as_struct": as_struct,
+            "check_bounds": check_bounds,
+            "null_on_oob": null_on_oob,
+            "as_enum": as_enum,
+            "lookup_name": lookup_name,
+            "enum_categories": enum_categories,
+        },
     )
 
 
+def register_lookup(name: str, lookup: pl.Series) -> None:
+    """Store a lookup in the process-wide cache, for `multi_index(expr, lookup_name=name)`.
+
+    The lookup is prepared once (rechunked, and its Enum dictionary built on the first
+    `as_enum` use), so each call or streaming batch only pays for the gather, and the
+    plan only carries the name. Registering a name again replaces the lookup. When the
+    cache exceeds its memory cap (see `set_lookup_cache_size`) the least recently used
+    lookups are evicted; using an evicted name raises.
+
+    Args:
+        name (str): Name to refer to the lookup by.
+        lookup (pl.Series): Values to index into, of any dtype.
+
+    Example:
+        >>> register_lookup("greek", pl.Series(["alpha", "beta", "gamma"]))
+        >>> df = pl.DataFrame({"idx": [2, 0]})
+        >>> out = df.select(multi_index(pl.col("idx"), lookup_name="greek"))
+        >>> assert out.to_series().to_list() == ["gamma", "alpha"]
+        >>> assert unregister_lookup("greek")
+    """
+    if not isinstance(lookup, pl.Series):
+        raise TypeError(f"`lookup` must be a Series, not `{type(lookup)}`")
+    _internal.register_lookup(name, lookup)
+
+
+def unregister_lookup(name: str) -> bool:
+    """Drop a registered lookup from the cache.
+
+    Args:
+        name (str): Name the lookup was registered as.
+
+    Returns:
+        bool: Whether a lookup was registered under `name`.
+    """
+    return _internal.unregister_lookup(name)
+
+
+def set_lookup_cache_size(max_bytes: int) -> None:
+    """Set the memory cap of the registered lookup cache, 1 GiB by default.
+
+    Least recently used lookups are evicted until the cache fits.
+
+    Args:
+        max_bytes (int): Maximum estimated size of all registered lookups, in bytes.
+    """
+    if max_bytes < 0:
+        raise ValueError(f"`max_bytes` must be non-negative, got {max_bytes}")
+    _internal.set_lookup_cache_size(max_bytes)
+
+
+def _arg_minmax_kwargs(
+    *, return_colname: bool, as_enum: bool, ties: str, nan: str
+) -> dict[str, str]:
+    if as_enum and not return_colname:
+        raise ValueError("`as_enum` requires `return_colname=True`")
+    if ties not in ("first", "last", "all"):
+        raise ValueError(
+            f"`ties` must be one of 'first', 'last' or 'all', got {ties!r}"
+        )
+    if nan not in ("propagate", "ignore", "as_max"):
+        raise ValueError(
+            f"`nan` must be one of 'propagate', 'ignore' or 'as_max', got {nan!r}"
+        )
+    if as_enum and ties == "all":
+        raise ValueError("`as_enum` cannot be combined with `ties='all'`")
+    return {"ties": ties, "nan": nan}
+
+
 def arg_max_horizontal(
-    expr: IntoExprColumn, *, return_colname: bool = False
+    expr: IntoExprColumn,
+    *,
+    return_colname: bool = False,
+    as_enum: bool = False,
+    ties: Literal["first", "last", "all"] = "first",
+    nan: Literal["propagate", "ignore", "as_max"] = "ignore",
 ) -> pl.Expr:
     """Return the index of the maximum value per row, or None if all values are null.
 
+    Supports all integer and float widths, Boolean, Date, Datetime, Duration, Decimal
+    and String (lexicographic). Integer columns of different widths are compared in
+    their supertype without casting; any other dtype mismatch raises.
+
     Args:
         expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
         return_colname (bool): Whether to return the column name instead of index.
+        as_enum (bool): Return the column names as an `Enum` of the input column names,
+            storing only a `u32` code per row instead of a string. Requires
+            `return_colname`. Defaults to False.
+        ties (str): Which index wins when several columns hold the maximum: "first",
+            "last", or "all" to return a list of every tied index. Defaults to "first".
+        nan (str): How float NaN is compared: "propagate" (any NaN wins), "ignore"
+            (NaN is treated as null) or "as_max" (NaN is larger than every number).
+            Defaults to "ignore".
 
     Returns:
         pl.Expr: Expression evaluating to the index or column name of the maximum value.
@@ -166,14 +488,26 @@ def arg_max_horizontal(
         >>> assert res["f"].to_list() == [1, 2, 0]  # indices of max values
         >>> res = df.select(f = arg_max_horizontal(pl.col('a','b','c'), return_colname=True))
         >>> assert res["f"].to_list() == ['b', 'c', 'a']  # names of max value columns
+        >>> res = df.select(f = arg_max_horizontal(pl.all(), return_colname=True, as_enum=True))
+        >>> assert res["f"].dtype == pl.Enum(["a", "b", "c"])
+        >>> df = pl.DataFrame({"a": [1, 2], "b": [1, 3], "c": [0, 3]})
+        >>> res = df.select(f = arg_max_horizontal(pl.all(), ties="all"))
+        >>> assert res["f"].to_list() == [[0, 1], [1, 2]]
     """
+    kwargs = _arg_minmax_kwargs(
+        return_colname=return_colname, as_enum=as_enum, ties=ties, nan=nan
+    )
+
     if return_colname:
         return register_plugin_function(
             args=[expr],
             plugin_path=LIB,
-            function_name="arg_max_horizontal_colname",
+            function_name=(
+                "arg_max_horizontal_enum" if as_enum else "arg_max_horizontal_colname"
+            ),
             is_elementwise=True,
             input_wildcard_expansion=True,
+            kwargs=kwargs,
         )
     return register_plugin_function(
         args=[expr],
@@ -181,17 +515,35 @@ def arg_max_horizontal(
         function_name="arg_max_horizontal",
         is_elementwise=True,
         input_wildcard_expansion=True,
+        kwargs=kwargs,
     )
 
 
 def arg_min_horizontal(
-    expr: IntoExprColumn, *, return_colname: bool = False
+    expr: IntoExprColumn,
+    *,
+    return_colname: bool = False,
+    as_enum: bool = False,
+    ties: Literal["first", "last", "all"] = "first",
+    nan: Literal["propagate", "ignore", "as_max"] = "ignore",
 ) -> pl.Expr:
     """Return the index of the minimum value per row, or None if all values are null.
 
+    Supports all integer and float widths, Boolean, Date, Datetime, Duration, Decimal
+    and String (lexicographic). Integer columns of different widths are compared in
+    their supertype without casting; any other dtype mismatch raises.
+
     Args:
         expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
         return_colname (bool, optional): Return the column name instead of the index. Defaults to False.
+        as_enum (bool, optional): Return the column names as an `Enum` of the input column
+            names, storing only a `u32` code per row instead of a string. Requires
+            `return_colname`. Defaults to False.
+        ties (str, optional): Which index wins when several columns hold the minimum:
+            "first", "last", or "all" to return a list of every tied index. Defaults to "first".
+        nan (str, optional): How float NaN is compared: "propagate" (any NaN wins), "ignore"
+            (NaN is treated as null) or "as_max" (NaN is larger than every number, so it
+            only wins when the row has nothing else). Defaults to "ignore".
 
     Returns:
         pl.Expr: Expression evaluating to the index or column name of the minimum value.
@@ -207,14 +559,26 @@ def arg_min_horizontal(
         >>> assert res["f"].to_list() == [0, 1, 2]  # indices of min values
         >>> res = df.select(f = arg_min_horizontal(pl.col('a','b','c'), return_colname=True))
         >>> assert res["f"].to_list() == ['a', 'b', 'c']  # names of min value columns
+        >>> res = df.select(f = arg_min_horizontal(pl.all(), return_colname=True, as_enum=True))
+        >>> assert res["f"].dtype == pl.Enum(["a", "b", "c"])
+        >>> df = pl.DataFrame({"a": [1, 2], "b": [1, 3], "c": [0, 2]})
+        >>> res = df.select(f = arg_min_horizontal(pl.all(), ties="last"))
+        >>> assert res["f"].to_list() == [2, 2]
     """
+    kwargs = _arg_minmax_kwargs(
+        return_colname=return_colname, as_enum=as_enum, ties=ties, nan=nan
+    )
+
     if return_colname:
         return register_plugin_function(
             args=[expr],
             plugin_path=LIB,
-            function_name="arg_min_horizontal_colname",
+            function_name=(
+                "arg_min_horizontal_enum" if as_enum else "arg_min_horizontal_colname"
+            ),
             is_elementwise=True,
             input_wildcard_expansion=True,
+            kwargs=kwargs,
         )
     return register_plugin_function(
         args=[expr],
@@ -222,14 +586,181 @@ def arg_min_horizontal(
         function_name="arg_min_horizontal",
         is_elementwise=True,
         input_wildcard_expansion=True,
+        kwargs=kwargs,
+    )
+
+
+def max_with_arg_horizontal(expr: IntoExprColumn) -> pl.Expr:
+    """Return the maximum value per row together with its column index.
+
+    Same semantics as `arg_max_horizontal`, but the winning value is returned
+    from the same pass instead of a second `pl.max_horizontal`.
+
+    Args:
+        expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
+
+    Returns:
+        pl.Expr: Expression evaluating to a struct of `value` and `index`.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({
+        ...     "a": [1, None, 3],
+        ...     "b": [2, 2, None],
+        ...     "c": [None, 3, 1]
+        ... })
+        >>> res = df.select(f = max_with_arg_horizontal(pl.all())).unnest("f")
+        >>> assert res["value"].to_list() == [2, 3, 3]
+        >>> assert res["index"].to_list() == [1, 2, 0]
+    """
+    return register_plugin_function(
+        args=[expr],
+        plugin_path=LIB,
+        function_name="max_with_arg_horizontal",
+        is_elementwise=True,
+        input_wildcard_expansion=True,
+    )
+
+
+def min_with_arg_horizontal(expr: IntoExprColumn) -> pl.Expr:
+    """Return the minimum value per row together with its column index.
+
+    Same semantics as `arg_min_horizontal`, but the winning value is returned
+    from the same pass instead of a second `pl.min_horizontal`.
+
+    Args:
+        expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
+
+    Returns:
+        pl.Expr: Expression evaluating to a struct of `value` and `index`.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({
+        ...     "a": [1, None, 3],
+        ...     "b": [2, 2, None],
+        ...     "c": [None, 3, 1]
+        ... })
+        >>> res = df.select(f = min_with_arg_horizontal(pl.all())).unnest("f")
+        >>> assert res["value"].to_list() == [1, 2, 1]
+        >>> assert res["index"].to_list() == [0, 1, 2]
+    """
+    return register_plugin_function(
+        args=[expr],
+        plugin_path=LIB,
+        function_name="min_with_arg_horizontal",
+        is_elementwise=True,
+        input_wildcard_expansion=True,
     )
 
 
-def is_max(expr: IntoExprColumn) -> pl.Expr:
+def min_max_horizontal(
+    expr: IntoExprColumn,
+    *,
+    fields: Iterable[str] = ("min", "max", "arg_min", "arg_max"),
+) -> pl.Expr:
+    """Compute the horizontal min, max and their indices in a single pass.
+
+    Equivalent to calling `pl.min_horizontal`, `pl.max_horizontal`,
+    `arg_min_horizontal` and `arg_max_horizontal` on the same columns, but every
+    column is only traversed once. Only the requested fields are computed.
+
+    Args:
+        expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
+        fields (Iterable[str]): Struct fields to return, any of `min`, `max`,
+            `arg_min` and `arg_max`. Defaults to all four.
+
+    Returns:
+        pl.Expr: Expression evaluating to a struct of the requested fields.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({
+        ...     "a": [1, None, 3],
+        ...     "b": [2, 2, None],
+        ...     "c": [None, 3, 1]
+        ... })
+        >>> res = df.select(f = min_max_horizontal(pl.col('a','b','c'))).unnest("f")
+        >>> assert res["min"].to_list() == [1, 2, 1]
+        >>> assert res["max"].to_list() == [2, 3, 3]
+        >>> assert res["arg_min"].to_list() == [0, 1, 2]
+        >>> assert res["arg_max"].to_list() == [1, 2, 0]
+        >>> res = df.select(f = min_max_horizontal(pl.all(), fields=["max"]))
+        >>> assert res["f"].struct.fields == ["max"]
+    """
+    fields = set([fields] if isinstance(fields, str) else fields)
+    valid = {"min", "max", "arg_min", "arg_max"}
+    if not fields or not fields <= valid:
+        raise ValueError(f"`fields` must be a non-empty subset of {sorted(valid)}")
+
+    return register_plugin_function(
+        args=[expr],
+        plugin_path=LIB,
+        function_name="min_max_horizontal",
+        is_elementwise=True,
+        input_wildcard_expansion=True,
+        kwargs={field: field in fields for field in sorted(valid)},
+    )
+
+
+def arg_top_k_horizontal(
+    expr: IntoExprColumn,
+    k: int,
+    *,
+    descending: bool = True,
+    return_colname: bool = False,
+) -> pl.Expr:
+    """Return the indices of the k best values per row as a fixed-size array.
+
+    Nulls and NaNs are skipped, as with the default `nan="ignore"` of
+    `arg_max_horizontal`; rows with fewer than `k` remaining values are padded with
+    nulls. Ties keep the lower column index first, and -0.0 ties with 0.0. Like `arg_max_horizontal`, numeric, temporal,
+    Decimal, Boolean (true ranks above false) and String (lexicographic) columns are
+    supported.
+
+    Args:
+        expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
+        k (int): Number of columns to return per row.
+        descending (bool): Return the largest values first; smallest when False.
+            Defaults to True.
+        return_colname (bool): Return the column names instead of indices.
+            Defaults to False.
+
+    Returns:
+        pl.Expr: Expression evaluating to an `Array[UInt32, k]` (or `Array[String, k]`).
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({
+        ...     "a": [1, None, 3],
+        ...     "b": [2, 2, None],
+        ...     "c": [None, 3, 1]
+        ... })
+        >>> res = df.select(f = arg_top_k_horizontal(pl.col('a','b','c'), 2))
+        >>> assert res["f"].to_list() == [[1, 0], [2, 1], [0, 2]]
+        >>> res = df.select(f = arg_top_k_horizontal(pl.all(), 2, return_colname=True))
+        >>> assert res["f"].to_list() == [['b', 'a'], ['c', 'b'], ['a', 'c']]
+    """
+    if k < 1:
+        raise ValueError(f"`k` must be at least 1, not `{k}`")
+
+    return register_plugin_function(
+        args=[expr],
+        plugin_path=LIB,
+        function_name="arg_top_k_horizontal",
+        is_elementwise=True,
+        input_wildcard_expansion=True,
+        kwargs={"k": k, "descending": descending, "return_colname": return_colname},
+    )
+
+
+def is_max(expr: IntoExprColumn, *, keep: Literal["first", "all"] = "first") -> pl.Expr:
     """Return a boolean mask indicating the maximum value(s) per row.
 
     Args:
         expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
+        keep (str): "first" marks only the first maximum, "all" marks every value tied
+            with it. Defaults to "first".
 
     Returns:
         pl.Expr: Expression evaluating to a boolean mask of maximum values.
@@ -243,20 +774,29 @@ def is_max(expr: IntoExprColumn) -> pl.Expr:
         ... })
         >>> res = df.select(is_max(pl.col('a','b','c')))
         >>> assert res.to_series().to_list() == [False, False, True]  # max values mask
+        >>> df = pl.DataFrame({"g": ["x", "x", "y"], "v": [2, 2, 1]})
+        >>> res = df.select(is_max(pl.col("v"), keep="all").over("g"))
+        >>> assert res.to_series().to_list() == [True, True, True]
     """
+    if keep not in ("first", "all"):
+        raise ValueError(f"`keep` must be one of 'first' or 'all', got {keep!r}")
+
     return register_plugin_function(
         args=[expr],
         plugin_path=LIB,
         function_name="is_max",
         is_elementwise=False,  # ? must be `False` for `over` to work properly
+        kwargs={"keep": keep},
     )
 
 
-def is_min(expr: IntoExprColumn) -> pl.Expr:
+def is_min(expr: IntoExprColumn, *, keep: Literal["first", "all"] = "first") -> pl.Expr:
     """Return a boolean mask indicating the minimum value(s) per row.
 
     Args:
         expr (IntoExprColumn): Columns across the dataframe, evaluated in order.
+        keep (str): "first" marks only the first minimum, "all" marks every value tied
+            with it. Defaults to "first".
 
     Returns:
         pl.Expr: Expression evaluating to a boolean mask of minimum values.
@@ -270,12 +810,137 @@ def is_min(expr: IntoExprColumn) -> pl.Expr:
         ... })
         >>> res = df.select(is_min(pl.col('a','b','c')))
         >>> assert res.to_series().to_list() == [True, False, False]  # min values mask
+        >>> df = pl.DataFrame({"v": [1, 3, 1]})
+        >>> res = df.select(is_min(pl.col("v"), keep="all"))
+        >>> assert res.to_series().to_list() == [True, False, True]
     """
+    if keep not in ("first", "all"):
+        raise ValueError(f"`keep` must be one of 'first' or 'all', got {keep!r}")
+
     return register_plugin_function(
         args=[expr],
         plugin_path=LIB,
         function_name="is_min",
         is_elementwise=False,  # ? must be `False` for `over` to work properly
+        kwargs={"keep": keep},
+    )
+
+
+def is_max_by(
+    expr: IntoExprColumn,
+    by: IntoExprColumn | Iterable[str],
+    *,
+    keep: Literal["first", "all"] = "first",
+) -> pl.Expr:
+    """Return a boolean mask of the maximum value(s) within each group of `by`.
+
+    Equivalent to `is_max(expr, keep=keep).over(by)`, but every group is resolved
+    in a single call over the whole column instead of one plugin call per group,
+    which matters with many small groups.
+
+    Args:
+        expr (IntoExprColumn): Column to rank.
+        by (IntoExprColumn | Iterable[str]): Group key column; several column names
+            are combined into one key. Null keys form their own group.
+        keep (str): "first" marks only the first maximum per group, "all" marks every
+            value tied with it. Defaults to "first".
+
+    Returns:
+        pl.Expr: Expression evaluating to a boolean mask of maximum values per group.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({"g": ["x", "x", "y", "y"], "v": [1, 3, 5, 2]})
+        >>> res = df.select(is_max_by(pl.col("v"), "g"))
+        >>> assert res.to_series().to_list() == [False, True, True, False]
+    """
+    if keep not in ("first", "all"):
+        raise ValueError(f"`keep` must be one of 'first' or 'all', got {keep!r}")
+    if isinstance(by, (list, tuple)):
+        by = pl.struct(by)
+
+    return register_plugin_function(
+        args=[expr, by],
+        plugin_path=LIB,
+        function_name="is_max_by",
+        is_elementwise=False,
+        kwargs={"keep": keep},
+    )
+
+
+def is_min_by(
+    expr: IntoExprColumn,
+    by: IntoExprColumn | Iterable[str],
+    *,
+    keep: Literal["first", "all"] = "first",
+) -> pl.Expr:
+    """Return a boolean mask of the minimum value(s) within each group of `by`.
+
+    Equivalent to `is_min(expr, keep=keep).over(by)`, but every group is resolved
+    in a single call over the whole column instead of one plugin call per group,
+    which matters with many small groups.
+
+    Args:
+        expr (IntoExprColumn): Column to rank.
+        by (IntoExprColumn | Iterable[str]): Group key column; several column names
+            are combined into one key. Null keys form their own group.
+        keep (str): "first" marks only the first minimum per group, "all" marks every
+            value tied with it. Defaults to "first".
+
+    Returns:
+        pl.Expr: Expression evaluating to a boolean mask of minimum values per group.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({"g": ["x", "x", "y", "y"], "v": [1, 3, 5, 2]})
+        >>> res = df.select(is_min_by(pl.col("v"), "g"))
+        >>> assert res.to_series().to_list() == [True, False, False, True]
+    """
+    if keep not in ("first", "all"):
+        raise ValueError(f"`keep` must be one of 'first' or 'all', got {keep!r}")
+    if isinstance(by, (list, tuple)):
+        by = pl.struct(by)
+
+    return register_plugin_function(
+        args=[expr, by],
+        plugin_path=LIB,
+        function_name="is_min_by",
+        is_elementwise=False,
+        kwargs={"keep": keep},
+    )
+
+
+def is_top_k(expr: IntoExprColumn, k: int, *, descending: bool = True) -> pl.Expr:
+    """Return a boolean mask of the k largest (or smallest) values.
+
+    Like `is_max`, this works with `over` to mark the top k within each group. Nulls
+    and NaN are never marked; ties keep the earlier rows.
+
+    Args:
+        expr (IntoExprColumn): Column to rank.
+        k (int): Number of values to mark.
+        descending (bool): Mark the largest values, otherwise the smallest. Defaults to True.
+
+    Returns:
+        pl.Expr: Expression evaluating to a boolean mask of the top k values.
+
+    Examples:
+        >>> import polars as pl
+        >>> df = pl.DataFrame({"g": ["x", "x", "x", "y"], "v": [3, 1, 2, None]})
+        >>> res = df.select(is_top_k(pl.col("v"), 2).over("g"))
+        >>> assert res.to_series().to_list() == [True, False, True, False]
+        >>> res = df.select(is_top_k(pl.col("v"), 1, descending=False))
+        >>> assert res.to_series().to_list() == [False, True, False, False]
+    """
+    if k < 1:
+        raise ValueError(f"`k` must be at least 1, got {k}")
+
+    return register_plugin_function(
+        args=[expr],
+        plugin_path=LIB,
+        function_name="is_top_k",
+        is_elementwise=False,  # ? must be `False` for `over` to work properly
+        kwargs={"k": k, "descending": descending},
     )
 
 
@@ -1 +1,7 @@
+import polars as pl
+
 __version__: str
+
+def register_lookup(name: str, lookup: pl.Series) -> None: ...
+def unregister_lookup(name: str) -> bool: ...
+def set_lookup_cache_size(max_bytes: int) -> None: ...
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
 
 if TYPE_CHECKING:
     import polars as pl
@@ -7,3 +7,4 @@ if TYPE_CHECKING:
 
     type IntoExprColumn = pl.Expr | str | pl.Series
     type PolarsDataType = DataType | DataTypeClass
+    FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
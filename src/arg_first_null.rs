@@ -1,29 +1,59 @@
+use crate::bitmap::{bitmap_from_words, for_each_set_bit, full_words, validity_words};
 use polars::datatypes::PlSmallStr;
 use polars::prelude::*;
-use polars_arrow::legacy::trusted_len::TrustedLenPush;
 use pyo3_polars::derive::polars_expr;
 
 #[polars_expr(output_type=UInt32)]
 fn arg_first_null_horizontal(inputs: &[Series]) -> PolarsResult<Series> {
-    // Get the idx of the first null value in each row
-    let vec_size: usize = inputs[0].len();
+    // Get the idx of the first null value in each row, walking the validity
+    // bitmaps column by column, 64 rows at a time.
+    let len: usize = inputs[0].len();
 
-    let mut result: Vec<Option<u32>> = Vec::with_capacity(vec_size);
+    let mut result: Vec<u32> = vec![0; len];
 
-    for row_idx in 0..vec_size {
-        let mut found: Option<u32> = None;
+    // One bit per row that has not seen a null yet
+    let mut unresolved: Vec<u64> = full_words(len);
+    let mut n_unresolved: usize = len;
 
-        for (col_idx, s) in inputs.iter().enumerate() {
-            if s.get(row_idx).unwrap().is_null() {
-                found = Some(col_idx as u32);
-                break;
+    for (col_idx, s) in inputs.iter().enumerate() {
+        if n_unresolved == 0 {
+            break;
+        }
+
+        // No nulls, this column cannot resolve any row
+        if s.null_count() == 0 {
+            continue;
+        }
+
+        let s: Series = s.rechunk();
+        let validity: Vec<u64> = validity_words(&s).unwrap();
+
+        for (word_idx, (valid, pending)) in validity.iter().zip(unresolved.iter_mut()).enumerate() {
+            // Every row in this block already found its null
+            if *pending == 0 {
+                continue;
             }
+
+            let hits: u64 = !valid & *pending;
+            if hits == 0 {
+                continue;
+            }
+
+            *pending &= !hits;
+            n_unresolved -= hits.count_ones() as usize;
+
+            let offset: usize = word_idx * 64;
+            for_each_set_bit(hits, |bit| result[offset + bit] = col_idx as u32);
         }
-        unsafe { result.push_unchecked(found) };
     }
 
-    Ok(
-        UInt32Chunked::from_iter_options(PlSmallStr::from_str(""), result.into_iter())
-            .into_series(),
-    )
+    // Rows that never hit a null are null in the output
+    let resolved: Vec<u64> = full_words(len)
+        .iter()
+        .zip(unresolved.iter())
+        .map(|(all, pending)| all & !pending)
+        .collect();
+    let validity = bitmap_from_words(&resolved, len)?;
+
+    Ok(UInt32Chunked::from_vec_validity(PlSmallStr::EMPTY, result, Some(validity)).into_series())
 }
@@ -1,148 +1,1007 @@
+use crate::bitmap::for_each_set_bit;
 use polars::datatypes::PlSmallStr;
 use polars::prelude::*;
-use polars_arrow::legacy::trusted_len::TrustedLenPush;
+use polars_arrow::array::{Array, BooleanArray, ListArray, PrimitiveArray, Utf8ViewArray};
+use polars_arrow::bitmap::Bitmap;
+use polars_arrow::datatypes::ArrowDataType;
+use polars_arrow::offset::OffsetsBuffer;
 use pyo3_polars::derive::polars_expr;
+use serde::Deserialize;
 
-fn _check_types(inputs: &[Series]) -> PolarsResult<()> {
-    let first_type: &DataType = inputs[0].dtype();
-    for s in inputs.iter().skip(1) {
-        if s.dtype() != first_type {
-            return Err(PolarsError::SchemaMismatch(
-                "All input Series must have the same data type".into(),
-            ));
+/// How the inputs are compared: natively when every column shares one dtype,
+/// or widened per element when integer columns of different widths are mixed.
+pub(crate) enum InputKind {
+    Uniform(DataType),
+    MixedInt(DataType),
+}
+
+pub(crate) fn _check_types(inputs: &[Series]) -> PolarsResult<InputKind> {
+    let dtypes: Vec<&DataType> = inputs.iter().map(|s| s.dtype()).collect();
+    let dtype: DataType = _value_dtype(&dtypes)?;
+
+    // Mixed integer widths are compared in their supertype without casting copies
+    if dtypes.iter().all(|dt| **dt == dtype) {
+        Ok(InputKind::Uniform(dtype))
+    } else {
+        Ok(InputKind::MixedInt(dtype))
+    }
+}
+
+#[inline(always)]
+pub(crate) fn _is_better<T: PartialOrd, const IS_MAX: bool>(value: T, current_best: T) -> bool {
+    if IS_MAX {
+        value > current_best
+    } else {
+        value < current_best
+    }
+}
+
+/// Values the running-best engine can fold and hand back as a series.
+pub(crate) trait KernelValue: Copy + PartialOrd + Default {
+    fn into_series(values: Vec<Self>, validity: Option<Bitmap>) -> Series;
+
+    #[inline(always)]
+    fn is_nan(self) -> bool {
+        false
+    }
+}
+
+macro_rules! impl_kernel_value_native {
+    ($($rust_type:ty => $polars_type:ty),*) => {
+        $(impl KernelValue for $rust_type {
+            fn into_series(values: Vec<Self>, validity: Option<Bitmap>) -> Series {
+                ChunkedArray::<$polars_type>::from_vec_validity(PlSmallStr::EMPTY, values, validity)
+                    .into_series()
+            }
+        })*
+    };
+}
+
+impl_kernel_value_native!(
+    i8 => Int8Type, i16 => Int16Type, i32 => Int32Type, i64 => Int64Type, i128 => Int128Type,
+    u8 => UInt8Type, u16 => UInt16Type, u32 => UInt32Type, u64 => UInt64Type
+);
+
+macro_rules! impl_kernel_value_float {
+    ($($rust_type:ty => $polars_type:ty),*) => {
+        $(impl KernelValue for $rust_type {
+            fn into_series(values: Vec<Self>, validity: Option<Bitmap>) -> Series {
+                ChunkedArray::<$polars_type>::from_vec_validity(PlSmallStr::EMPTY, values, validity)
+                    .into_series()
+            }
+
+            #[inline(always)]
+            fn is_nan(self) -> bool {
+                <$rust_type>::is_nan(self)
+            }
+        })*
+    };
+}
+
+impl_kernel_value_float!(f32 => Float32Type, f64 => Float64Type);
+
+impl KernelValue for bool {
+    fn into_series(values: Vec<Self>, validity: Option<Bitmap>) -> Series {
+        let arr = BooleanArray::new(
+            ArrowDataType::Boolean,
+            values.into_iter().collect(),
+            validity,
+        );
+        BooleanChunked::with_chunk(PlSmallStr::EMPTY, arr).into_series()
+    }
+}
+
+impl KernelValue for &str {
+    fn into_series(values: Vec<Self>, validity: Option<Bitmap>) -> Series {
+        let ca: StringChunked = match validity {
+            Some(validity) => values
+                .into_iter()
+                .zip(validity.iter())
+                .map(|(value, valid)| valid.then_some(value))
+                .collect(),
+            None => values.into_iter().map(Some).collect(),
+        };
+        ca.into_series()
+    }
+}
+
+/// Re-attach the logical dtype to values folded on their physical representation.
+pub(crate) fn _restore_logical(s: Series, dtype: &DataType) -> PolarsResult<Series> {
+    let out: Series = match dtype {
+        DataType::Date => s.i32()?.clone().into_date().into_series(),
+        DataType::Datetime(tu, tz) => s
+            .i64()?
+            .clone()
+            .into_datetime(*tu, tz.clone())
+            .into_series(),
+        DataType::Duration(tu) => s.i64()?.clone().into_duration(*tu).into_series(),
+        DataType::Decimal(precision, scale) => s
+            .i128()?
+            .clone()
+            .into_decimal_unchecked(*precision, scale.unwrap_or(0))
+            .into_series(),
+        _ => s,
+    };
+    Ok(out)
+}
+
+/// Which index wins when several columns share the best value.
+#[derive(Clone, Copy, PartialEq, Eq)]
+pub(crate) enum Ties {
+    First,
+    Last,
+    All,
+}
+
+/// How float NaN values take part in the comparison.
+#[derive(Clone, Copy, PartialEq, Eq)]
+pub(crate) enum NanPolicy {
+    /// Any NaN in the row wins, for both max and min
+    Propagate,
+    /// NaN is treated as null
+    Ignore,
+    /// NaN is larger than every number
+    AsMax,
+}
+
+#[derive(Clone, Copy)]
+pub(crate) struct FoldOptions {
+    ties: Ties,
+    nan: NanPolicy,
+}
+
+impl Default for FoldOptions {
+    fn default() -> Self {
+        Self {
+            ties: Ties::First,
+            nan: NanPolicy::Ignore,
         }
     }
-    Ok(())
+}
+
+#[derive(Deserialize)]
+struct ArgMinMaxArgs {
+    ties: String,
+    nan: String,
+}
+
+impl ArgMinMaxArgs {
+    fn options(&self) -> PolarsResult<FoldOptions> {
+        let ties: Ties = match self.ties.as_str() {
+            "first" => Ties::First,
+            "last" => Ties::Last,
+            "all" => Ties::All,
+            other => polars_bail!(InvalidOperation: "invalid `ties`: {}", other),
+        };
+        let nan: NanPolicy = match self.nan.as_str() {
+            "propagate" => NanPolicy::Propagate,
+            "ignore" => NanPolicy::Ignore,
+            "as_max" => NanPolicy::AsMax,
+            other => polars_bail!(InvalidOperation: "invalid `nan`: {}", other),
+        };
+        Ok(FoldOptions { ties, nan })
+    }
+}
+
+/// Comparison rules resolved once per fold, so the inner loops only do boolean algebra.
+#[derive(Clone, Copy)]
+struct Comparator<const IS_MAX: bool> {
+    take_equal: bool,
+    ignore_nan: bool,
+    nan_wins: bool,
+    nan_loses: bool,
+}
+
+impl<const IS_MAX: bool> Comparator<IS_MAX> {
+    fn new(options: FoldOptions) -> Self {
+        Self {
+            take_equal: options.ties == Ties::Last,
+            ignore_nan: options.nan == NanPolicy::Ignore,
+            nan_wins: options.nan == NanPolicy::Propagate
+                || (options.nan == NanPolicy::AsMax && IS_MAX),
+            nan_loses: options.nan == NanPolicy::AsMax && !IS_MAX,
+        }
+    }
+
+    #[inline(always)]
+    fn is_valid<T: KernelValue>(&self, value: T) -> bool {
+        !(self.ignore_nan & value.is_nan())
+    }
+
+    /// Whether `value` strictly beats `best`, and whether they tie.
+    #[inline(always)]
+    fn compare<T: KernelValue>(&self, value: T, best: T) -> (bool, bool) {
+        let value_nan: bool = value.is_nan();
+        let best_nan: bool = best.is_nan();
+        let numbers: bool = !value_nan & !best_nan;
+
+        let better: bool = (numbers & _is_better::<T, IS_MAX>(value, best))
+            | (self.nan_wins & value_nan & !best_nan)
+            | (self.nan_loses & !value_nan & best_nan);
+        let equal: bool = (numbers & (value == best)) | (value_nan & best_nan);
+        (better, equal)
+    }
+
+    #[inline(always)]
+    fn take<T: KernelValue>(&self, value: T, best: T) -> bool {
+        let (better, equal) = self.compare(value, best);
+        better | (self.take_equal & equal)
+    }
+}
+
+/// Column-major running best: each column is folded into contiguous
+/// `best_value`/`best_idx` buffers with compare-and-select, so the inner
+/// loops are branch-free and can be auto-vectorized.
+pub(crate) struct RunningBest<T, const IS_MAX: bool> {
+    best_value: Vec<T>,
+    best_idx: Vec<u32>,
+    // 1 once a row has seen a non-null value
+    seen: Vec<u8>,
+    all_seen: bool,
+    // Whether the current column skipped a non-null value (an ignored NaN)
+    column_skipped: bool,
+    options: FoldOptions,
+    // `Ties::All` only: a `len`-sized plane of row bitmasks per 64 columns, and
+    // per row the first plane that belongs to the current best
+    tie_masks: Vec<u64>,
+    tie_first_plane: Vec<u32>,
+}
+
+impl<T: KernelValue, const IS_MAX: bool> RunningBest<T, IS_MAX> {
+    fn new(len: usize, options: FoldOptions) -> Self {
+        let tie_first_plane: Vec<u32> = if options.ties == Ties::All {
+            vec![0; len]
+        } else {
+            Vec::new()
+        };
+        Self {
+            best_value: vec![T::default(); len],
+            best_idx: vec![0; len],
+            seen: vec![0; len],
+            all_seen: len == 0,
+            column_skipped: false,
+            options,
+            tie_masks: Vec::new(),
+            tie_first_plane,
+        }
+    }
+
+    /// Fold `values` into rows `offset..offset + values.len()`.
+    ///
+    /// `validity` must already be sliced to the block, and `None` when it has no nulls.
+    fn fold_block<S: Copy + Into<T>>(
+        &mut self,
+        col_idx: u32,
+        offset: usize,
+        values: &[S],
+        validity: Option<&Bitmap>,
+    ) {
+        if self.options.ties == Ties::All {
+            return self.fold_block_all_ties(col_idx, offset, values, validity);
+        }
+
+        let cmp: Comparator<IS_MAX> = Comparator::new(self.options);
+        let end: usize = offset + values.len();
+        let best_values = self.best_value[offset..end].iter_mut();
+        let best_idxs = self.best_idx[offset..end].iter_mut();
+        let seens = self.seen[offset..end].iter_mut();
+
+        match validity {
+            // Fast path: no nulls and every row already has a candidate
+            None if self.all_seen => {
+                for ((value, best), idx) in values.iter().zip(best_values).zip(best_idxs) {
+                    let value: T = (*value).into();
+                    let take: bool = cmp.is_valid(value) & cmp.take(value, *best);
+                    *best = if take { value } else { *best };
+                    *idx = if take { col_idx } else { *idx };
+                }
+            }
+            None => {
+                let mut skipped: bool = false;
+                for (((value, best), idx), seen) in
+                    values.iter().zip(best_values).zip(best_idxs).zip(seens)
+                {
+                    let value: T = (*value).into();
+                    let valid: bool = cmp.is_valid(value);
+                    let take: bool = valid & ((*seen == 0) | cmp.take(value, *best));
+                    *best = if take { value } else { *best };
+                    *idx = if take { col_idx } else { *idx };
+                    *seen |= valid as u8;
+                    skipped |= !valid;
+                }
+                self.column_skipped |= skipped;
+            }
+            Some(validity) => {
+                for ((((value, valid), best), idx), seen) in values
+                    .iter()
+                    .zip(validity.iter())
+                    .zip(best_values)
+                    .zip(best_idxs)
+                    .zip(seens)
+                {
+                    let value: T = (*value).into();
+                    let valid: bool = valid & cmp.is_valid(value);
+                    let take: bool = valid & ((*seen == 0) | cmp.take(value, *best));
+                    *best = if take { value } else { *best };
+                    *idx = if take { col_idx } else { *idx };
+                    *seen |= valid as u8;
+                }
+            }
+        }
+    }
+
+    /// `Ties::All`: a strictly better value restarts the row's bitmask, a tie adds to it.
+    fn fold_block_all_ties<S: Copy + Into<T>>(
+        &mut self,
+        col_idx: u32,
+        offset: usize,
+        values: &[S],
+        validity: Option<&Bitmap>,
+    ) {
+        let cmp: Comparator<IS_MAX> = Comparator::new(self.options);
+        let len: usize = self.best_idx.len();
+        let plane: usize = col_idx as usize / 64;
+        let bit: u64 = 1 << (col_idx % 64);
+
+        // Planes are only ever touched by their own 64 columns, in order, so a
+        // fresh plane starts zeroed for every row
+        if self.tie_masks.len() < (plane + 1) * len {
+            self.tie_masks.resize((plane + 1) * len, 0);
+        }
+        let masks: &mut [u64] = &mut self.tie_masks[plane * len..(plane + 1) * len];
+
+        for (i, value) in values.iter().enumerate() {
+            let row: usize = offset + i;
+            let value: T = (*value).into();
+            if !validity.map_or(true, |v| v.get_bit(i)) {
+                continue;
+            }
+            if !cmp.is_valid(value) {
+                self.column_skipped = true;
+                continue;
+            }
+
+            let (better, equal) = if self.seen[row] == 0 {
+                (true, false)
+            } else {
+                cmp.compare(value, self.best_value[row])
+            };
+
+            if better {
+                self.best_value[row] = value;
+                self.best_idx[row] = col_idx;
+                self.seen[row] = 1;
+                self.tie_first_plane[row] = plane as u32;
+                masks[row] = bit;
+            } else if equal {
+                masks[row] |= bit;
+            }
+        }
+    }
+
+    /// Called once a whole column has been folded.
+    fn finish_column(&mut self, had_nulls: bool) {
+        // Ignored NaNs behave like nulls, so only a column without either sees every row
+        self.all_seen |= !had_nulls && !self.column_skipped;
+        self.column_skipped = false;
+    }
+
+    fn validity(&self) -> Option<Bitmap> {
+        if self.all_seen {
+            return None;
+        }
+        Some(self.seen.iter().map(|seen| *seen != 0).collect())
+    }
+
+    pub(crate) fn into_idx(self) -> UInt32Chunked {
+        let validity: Option<Bitmap> = self.validity();
+        UInt32Chunked::from_vec_validity(PlSmallStr::EMPTY, self.best_idx, validity)
+    }
+
+    /// Every tied index per row, ascending; only meaningful under `Ties::All`.
+    pub(crate) fn into_tied_idx(self) -> ListChunked {
+        let len: usize = self.best_idx.len();
+        let n_planes: usize = if len == 0 {
+            0
+        } else {
+            self.tie_masks.len() / len
+        };
+        let masks: &[u64] = &self.tie_masks;
+        let first_planes: &[u32] = &self.tie_first_plane;
+        let row_words = |row: usize| {
+            let first: usize = first_planes[row] as usize;
+            (first..n_planes).map(move |plane| (plane, masks[plane * len + row]))
+        };
+
+        let mut offsets: Vec<i64> = Vec::with_capacity(len + 1);
+        offsets.push(0);
+        let mut total: i64 = 0;
+        for row in 0..len {
+            if self.seen[row] != 0 {
+                total += row_words(row)
+                    .map(|(_, w)| w.count_ones() as i64)
+                    .sum::<i64>();
+            }
+            offsets.push(total);
+        }
+
+        let mut values: Vec<u32> = Vec::with_capacity(total as usize);
+        for row in (0..len).filter(|row| self.seen[*row] != 0) {
+            for (plane, word) in row_words(row) {
+                for_each_set_bit(word, |bit| values.push((plane * 64 + bit) as u32));
+            }
+        }
+
+        let offsets: OffsetsBuffer<i64> = unsafe { OffsetsBuffer::new_unchecked(offsets.into()) };
+        let arr: ListArray<i64> = ListArray::<i64>::new(
+            ListArray::<i64>::default_datatype(ArrowDataType::UInt32),
+            offsets,
+            PrimitiveArray::<u32>::from_vec(values).boxed(),
+            self.validity(),
+        );
+        ListChunked::with_chunk(PlSmallStr::EMPTY, arr)
+    }
+
+    /// The winning values (on the physical dtype the kernel folded) and their indices.
+    pub(crate) fn into_parts(self) -> (Series, UInt32Chunked) {
+        let validity: Option<Bitmap> = self.validity();
+        let values: Series = T::into_series(self.best_value, validity.clone());
+        let idx: UInt32Chunked =
+            UInt32Chunked::from_vec_validity(PlSmallStr::EMPTY, self.best_idx, validity);
+        (values, idx)
+    }
+}
+
+/// A state the dtype dispatch can fold columns into, one column at a time.
+pub(crate) trait ColumnFold<T> {
+    fn fold<S: Copy + Into<T>>(&mut self, col_idx: u32, values: &[S], validity: Option<&Bitmap>);
+}
+
+impl<T: KernelValue, const IS_MAX: bool> ColumnFold<T> for RunningBest<T, IS_MAX> {
+    fn fold<S: Copy + Into<T>>(&mut self, col_idx: u32, values: &[S], validity: Option<&Bitmap>) {
+        let validity: Option<&Bitmap> = validity.filter(|v| v.unset_bits() > 0);
+        self.fold_block(col_idx, 0, values, validity);
+        self.finish_column(validity.is_some());
+    }
+}
+
+// Rows per block when several states share one pass, keeps the column block in cache
+const FUSED_BLOCK_SIZE: usize = 4096;
+
+/// Running min and max folded together, block by block, in one pass over each column.
+pub(crate) struct RunningMinMax<T> {
+    len: usize,
+    min: Option<RunningBest<T, false>>,
+    max: Option<RunningBest<T, true>>,
+}
+
+impl<T: KernelValue> ColumnFold<T> for RunningMinMax<T> {
+    fn fold<S: Copy + Into<T>>(&mut self, col_idx: u32, values: &[S], validity: Option<&Bitmap>) {
+        let validity: Option<&Bitmap> = validity.filter(|v| v.unset_bits() > 0);
+
+        for offset in (0..values.len()).step_by(FUSED_BLOCK_SIZE) {
+            let block_len: usize = FUSED_BLOCK_SIZE.min(values.len() - offset);
+            let block: &[S] = &values[offset..offset + block_len];
+            let block_validity: Option<Bitmap> =
+                validity.map(|v| v.clone().sliced(offset, block_len));
+
+            if let Some(min) = self.min.as_mut() {
+                min.fold_block(col_idx, offset, block, block_validity.as_ref());
+            }
+            if let Some(max) = self.max.as_mut() {
+                max.fold_block(col_idx, offset, block, block_validity.as_ref());
+            }
+        }
+
+        self.min
+            .iter_mut()
+            .for_each(|min| min.finish_column(validity.is_some()));
+        self.max
+            .iter_mut()
+            .for_each(|max| max.finish_column(validity.is_some()));
+    }
+}
+
+/// What to fold the columns into and how to turn the folded state into output.
+pub(crate) trait HorizontalReduce {
+    type State<T: KernelValue>: ColumnFold<T>;
+
+    fn new_state<T: KernelValue>(&self, len: usize) -> Self::State<T>;
+
+    /// `dtype` is the logical dtype the values were compared in.
+    fn finish<T: KernelValue>(
+        &self,
+        state: Self::State<T>,
+        dtype: &DataType,
+    ) -> PolarsResult<Series>;
+}
+
+/// Index of the best value per row, or every tied index under `Ties::All`.
+struct ArgBest<const IS_MAX: bool> {
+    options: FoldOptions,
+}
+
+impl<const IS_MAX: bool> HorizontalReduce for ArgBest<IS_MAX> {
+    type State<T: KernelValue> = RunningBest<T, IS_MAX>;
+
+    fn new_state<T: KernelValue>(&self, len: usize) -> Self::State<T> {
+        RunningBest::new(len, self.options)
+    }
+
+    fn finish<T: KernelValue>(
+        &self,
+        state: Self::State<T>,
+        _dtype: &DataType,
+    ) -> PolarsResult<Series> {
+        match self.options.ties {
+            Ties::All => Ok(state.into_tied_idx().into_series()),
+            _ => Ok(state.into_idx().into_series()),
+        }
+    }
+}
+
+/// Best value per row together with its index, from the same fold.
+struct ValueWithArg<const IS_MAX: bool>;
+
+impl<const IS_MAX: bool> HorizontalReduce for ValueWithArg<IS_MAX> {
+    type State<T: KernelValue> = RunningBest<T, IS_MAX>;
+
+    fn new_state<T: KernelValue>(&self, len: usize) -> Self::State<T> {
+        RunningBest::new(len, FoldOptions::default())
+    }
+
+    fn finish<T: KernelValue>(
+        &self,
+        state: Self::State<T>,
+        dtype: &DataType,
+    ) -> PolarsResult<Series> {
+        let len: usize = state.best_idx.len();
+        let (values, idx) = state.into_parts();
+        let fields: [Series; 2] = [
+            _restore_logical(values, dtype)?.with_name(PlSmallStr::from_static("value")),
+            idx.into_series()
+                .with_name(PlSmallStr::from_static("index")),
+        ];
+        Ok(StructChunked::from_series(PlSmallStr::EMPTY, len, fields.iter())?.into_series())
+    }
+}
+
+fn value_with_arg_output_type(input_fields: &[Field]) -> PolarsResult<Field> {
+    let dtypes: Vec<&DataType> = input_fields.iter().map(|f| f.dtype()).collect();
+    let fields: Vec<Field> = vec![
+        Field::new(PlSmallStr::from_static("value"), _value_dtype(&dtypes)?),
+        Field::new(PlSmallStr::from_static("index"), DataType::UInt32),
+    ];
+    Ok(Field::new(
+        PlSmallStr::from_static(""),
+        DataType::Struct(fields),
+    ))
+}
+
+#[derive(Deserialize)]
+struct MinMaxHorizontalArgs {
+    min: bool,
+    max: bool,
+    arg_min: bool,
+    arg_max: bool,
+}
+
+impl HorizontalReduce for MinMaxHorizontalArgs {
+    type State<T: KernelValue> = RunningMinMax<T>;
+
+    fn new_state<T: KernelValue>(&self, len: usize) -> Self::State<T> {
+        RunningMinMax {
+            len,
+            min: (self.min || self.arg_min).then(|| RunningBest::new(len, FoldOptions::default())),
+            max: (self.max || self.arg_max).then(|| RunningBest::new(len, FoldOptions::default())),
+        }
+    }
+
+    fn finish<T: KernelValue>(
+        &self,
+        state: Self::State<T>,
+        dtype: &DataType,
+    ) -> PolarsResult<Series> {
+        let len: usize = state.len;
+        let (min, arg_min) = state.min.map(|min| min.into_parts()).unzip();
+        let (max, arg_max) = state.max.map(|max| max.into_parts()).unzip();
+
+        let mut fields: Vec<Series> = Vec::with_capacity(4);
+        for (name, wanted, values) in [("min", self.min, min), ("max", self.max, max)] {
+            if let (true, Some(values)) = (wanted, values) {
+                let values: Series = _restore_logical(values, dtype)?;
+                fields.push(values.with_name(PlSmallStr::from_static(name)));
+            }
+        }
+        for (name, wanted, idx) in [
+            ("arg_min", self.arg_min, arg_min),
+            ("arg_max", self.arg_max, arg_max),
+        ] {
+            if let (true, Some(idx)) = (wanted, idx) {
+                fields.push(idx.into_series().with_name(PlSmallStr::from_static(name)));
+            }
+        }
+
+        Ok(StructChunked::from_series(PlSmallStr::EMPTY, len, fields.iter())?.into_series())
+    }
+}
+
+fn min_max_horizontal_output_type(
+    input_fields: &[Field],
+    kwargs: MinMaxHorizontalArgs,
+) -> PolarsResult<Field> {
+    let dtypes: Vec<&DataType> = input_fields.iter().map(|f| f.dtype()).collect();
+    let value_dtype: DataType = _value_dtype(&dtypes)?;
+
+    let mut fields: Vec<Field> = Vec::with_capacity(4);
+    if kwargs.min {
+        fields.push(Field::new(
+            PlSmallStr::from_static("min"),
+            value_dtype.clone(),
+        ));
+    }
+    if kwargs.max {
+        fields.push(Field::new(
+            PlSmallStr::from_static("max"),
+            value_dtype.clone(),
+        ));
+    }
+    if kwargs.arg_min {
+        fields.push(Field::new(
+            PlSmallStr::from_static("arg_min"),
+            DataType::UInt32,
+        ));
+    }
+    if kwargs.arg_max {
+        fields.push(Field::new(
+            PlSmallStr::from_static("arg_max"),
+            DataType::UInt32,
+        ));
+    }
+
+    Ok(Field::new(
+        PlSmallStr::from_static(""),
+        DataType::Struct(fields),
+    ))
 }
 
 macro_rules! impl_argminmax_const_for_type {
-    ($inputs:expr, $len:expr, $polars_type:ident, $rust_type:ty, $is_max:expr) => {{
-        
-        // eliminates runtime branching in inner loop
-        const IS_MAX: bool = $is_max; // true for arg_max, false for arg_min
-
-        let typed_inputs: Vec<_> = $inputs.iter().map(|s| s.$polars_type().unwrap()).collect();
-        let mut result = Vec::with_capacity($len);
-
-        for row_idx in 0..$len {
-            let mut best_idx: Option<u32> = None;
-            let mut best_value: Option<$rust_type> = None;
-
-            for (col_idx, ca) in typed_inputs.iter().enumerate() {
-                let opt_value = unsafe { ca.get_unchecked(row_idx) };
-                if let Some(value) = opt_value {
-                    let should_update = best_value.map_or(true, |current_best| {
-                        if IS_MAX {
-                            value > current_best
-                        } else {
-                            value < current_best
-                        }
-                    });
-
-                    if should_update {
-                        best_value = Some(value);
-                        best_idx = Some(col_idx as u32);
+    ($inputs:expr, $state:expr, $polars_type:ident, $rust_type:ty) => {{
+        let mut state = $state;
+        for (col_idx, s) in $inputs.iter().enumerate() {
+            // Logical types (temporal, decimal) compare on their physical values
+            let s: Series = s.to_physical_repr().rechunk();
+            if let Some(arr) = s.$polars_type()?.downcast_iter().next() {
+                ColumnFold::<$rust_type>::fold(
+                    &mut state,
+                    col_idx as u32,
+                    arr.values().as_slice(),
+                    arr.validity(),
+                );
+            }
+        }
+        state
+    }};
+}
+
+macro_rules! impl_argminmax_widening {
+    ($inputs:expr, $state:expr, $rust_type:ty, [$($dtype:ident => $polars_type:ident),*]) => {{
+        // Each column is widened element by element inside the fold
+        let mut state = $state;
+        for (col_idx, s) in $inputs.iter().enumerate() {
+            let s: Series = s.rechunk();
+            match s.dtype() {
+                $(DataType::$dtype => {
+                    if let Some(arr) = s.$polars_type()?.downcast_iter().next() {
+                        ColumnFold::<$rust_type>::fold(
+                            &mut state,
+                            col_idx as u32,
+                            arr.values().as_slice(),
+                            arr.validity(),
+                        );
                     }
-                }
+                })*
+                dt => polars_bail!(
+                    SchemaMismatch: "cannot compare {} within {}", dt, stringify!($rust_type)
+                ),
             }
-            unsafe { result.push_unchecked(best_idx) };
         }
-        result
+        state
     }};
 }
 
-fn _arg_max_horizontal_idx(inputs: &[Series]) -> PolarsResult<Series> {
-    let len: usize = inputs[0].len();
+fn _fold_bool<R: HorizontalReduce>(
+    inputs: &[Series],
+    reduce: &R,
+    len: usize,
+) -> PolarsResult<R::State<bool>> {
+    let mut state = reduce.new_state::<bool>(len);
+    for (col_idx, s) in inputs.iter().enumerate() {
+        let s: Series = s.rechunk();
+        if let Some(arr) = s.bool()?.downcast_iter().next() {
+            let values: Vec<bool> = arr.values().iter().collect();
+            state.fold(col_idx as u32, &values, arr.validity());
+        }
+    }
+    Ok(state)
+}
 
-    _check_types(inputs)?;
+/// Lexicographic comparison on the string values; `inputs` must be rechunked
+/// by the caller, since the running best borrows from them.
+fn _fold_str<'a, R: HorizontalReduce>(
+    inputs: &'a [Series],
+    reduce: &R,
+    len: usize,
+) -> PolarsResult<R::State<&'a str>> {
+    let mut state = reduce.new_state::<&str>(len);
+    for (col_idx, s) in inputs.iter().enumerate() {
+        if let Some(arr) = s.str()?.downcast_iter().next() {
+            let values: Vec<&str> = arr.values_iter().collect();
+            state.fold(col_idx as u32, &values, arr.validity());
+        }
+    }
+    Ok(state)
+}
+
+/// Dtype of the values compared by the kernels; the supertype for mixed integers.
+pub(crate) fn _value_dtype(dtypes: &[&DataType]) -> PolarsResult<DataType> {
+    let first_type: &DataType = dtypes[0];
+    if dtypes.iter().skip(1).all(|dt| *dt == first_type) {
+        return Ok(first_type.clone());
+    }
 
-    let dtype: &DataType = inputs[0].dtype();
+    if dtypes.iter().all(|dt| dt.is_integer()) {
+        let any_signed: bool = dtypes.iter().any(|dt| dt.is_signed_integer());
+        let any_u64: bool = dtypes.iter().any(|dt| **dt == DataType::UInt64);
+        let supertype: DataType = match (any_signed, any_u64) {
+            (true, true) => DataType::Int128,
+            (true, false) => DataType::Int64,
+            (false, _) => DataType::UInt64,
+        };
+        return Ok(supertype);
+    }
+
+    Err(PolarsError::SchemaMismatch(
+        "All input Series must have the same data type".into(),
+    ))
+}
 
-    let result: Vec<Option<u32>> = match dtype {
-        DataType::Float64 => impl_argminmax_const_for_type!(inputs, len, f64, f64, true),
-        DataType::Float32 => impl_argminmax_const_for_type!(inputs, len, f32, f32, true),
-        DataType::Int64 => impl_argminmax_const_for_type!(inputs, len, i64, i64, true),
-        DataType::Int32 => impl_argminmax_const_for_type!(inputs, len, i32, i32, true),
-        DataType::UInt64 => impl_argminmax_const_for_type!(inputs, len, u64, u64, true),
-        DataType::UInt32 => impl_argminmax_const_for_type!(inputs, len, u32, u32, true),
-        _ => {
-            return Err(PolarsError::ComputeError(
-                format!("Unsupported dtype: {:?}", dtype).into(),
-            ))
+/// Fold every input column into the reducer's state, dispatching on dtype once.
+pub(crate) fn reduce_horizontal<R: HorizontalReduce>(
+    inputs: &[Series],
+    reduce: &R,
+) -> PolarsResult<Series> {
+    let len: usize = inputs[0].len();
+
+    let dtype: DataType = match _check_types(inputs)? {
+        InputKind::Uniform(dtype) => dtype,
+        InputKind::MixedInt(supertype) => {
+            return match supertype {
+                DataType::Int64 => reduce.finish(
+                    impl_argminmax_widening!(inputs, reduce.new_state::<i64>(len), i64, [
+                        Int8 => i8, Int16 => i16, Int32 => i32, Int64 => i64,
+                        UInt8 => u8, UInt16 => u16, UInt32 => u32
+                    ]),
+                    &supertype,
+                ),
+                DataType::UInt64 => reduce.finish(
+                    impl_argminmax_widening!(inputs, reduce.new_state::<u64>(len), u64, [
+                        UInt8 => u8, UInt16 => u16, UInt32 => u32, UInt64 => u64
+                    ]),
+                    &supertype,
+                ),
+                _ => reduce.finish(
+                    impl_argminmax_widening!(inputs, reduce.new_state::<i128>(len), i128, [
+                        Int8 => i8, Int16 => i16, Int32 => i32, Int64 => i64,
+                        UInt8 => u8, UInt16 => u16, UInt32 => u32, UInt64 => u64
+                    ]),
+                    &supertype,
+                ),
+            };
         }
     };
 
-    Ok(
-        UInt32Chunked::from_iter_options(PlSmallStr::from_static(""), result.into_iter())
-            .into_series(),
+    macro_rules! native {
+        ($polars_type:ident, $rust_type:ty) => {
+            reduce.finish(
+                impl_argminmax_const_for_type!(
+                    inputs,
+                    reduce.new_state::<$rust_type>(len),
+                    $polars_type,
+                    $rust_type
+                ),
+                &dtype,
+            )
+        };
+    }
+
+    match dtype {
+        DataType::Float64 => native!(f64, f64),
+        DataType::Float32 => native!(f32, f32),
+        DataType::Int64 => native!(i64, i64),
+        DataType::Int32 => native!(i32, i32),
+        DataType::Int16 => native!(i16, i16),
+        DataType::Int8 => native!(i8, i8),
+        DataType::UInt64 => native!(u64, u64),
+        DataType::UInt32 => native!(u32, u32),
+        DataType::UInt16 => native!(u16, u16),
+        DataType::UInt8 => native!(u8, u8),
+        DataType::Date => native!(i32, i32),
+        DataType::Datetime(_, _) | DataType::Duration(_) => native!(i64, i64),
+        DataType::Decimal(_, _) => native!(i128, i128),
+        DataType::Boolean => reduce.finish(_fold_bool(inputs, reduce, len)?, &dtype),
+        DataType::String => {
+            let rechunked: Vec<Series> = inputs.iter().map(|s| s.rechunk()).collect();
+            reduce.finish(_fold_str(&rechunked, reduce, len)?, &dtype)
+        }
+        _ => Err(PolarsError::ComputeError(
+            format!("Unsupported dtype: {:?}", dtype).into(),
+        )),
+    }
+}
+
+fn _arg_max_horizontal_idx(inputs: &[Series], kwargs: &ArgMinMaxArgs) -> PolarsResult<Series> {
+    reduce_horizontal(
+        inputs,
+        &ArgBest::<true> {
+            options: kwargs.options()?,
+        },
     )
 }
 
-fn _arg_min_horizontal_idx(inputs: &[Series]) -> PolarsResult<Series> {
-    let len: usize = inputs[0].len();
+fn _arg_min_horizontal_idx(inputs: &[Series], kwargs: &ArgMinMaxArgs) -> PolarsResult<Series> {
+    reduce_horizontal(
+        inputs,
+        &ArgBest::<false> {
+            options: kwargs.options()?,
+        },
+    )
+}
 
-    _check_types(inputs)?;
+/// `inner` for a single winner, a list of it when every tie is returned.
+fn _arg_minmax_dtype(inner: DataType, kwargs: &ArgMinMaxArgs) -> PolarsResult<DataType> {
+    match kwargs.options()?.ties {
+        Ties::All => Ok(DataType::List(Box::new(inner))),
+        _ => Ok(inner),
+    }
+}
 
-    let dtype: &DataType = inputs[0].dtype();
+fn arg_minmax_output_type(_input_fields: &[Field], kwargs: ArgMinMaxArgs) -> PolarsResult<Field> {
+    let dtype: DataType = _arg_minmax_dtype(DataType::UInt32, &kwargs)?;
+    Ok(Field::new(PlSmallStr::from_static(""), dtype))
+}
 
-    let result: Vec<Option<u32>> = match dtype {
-        DataType::Float64 => impl_argminmax_const_for_type!(inputs, len, f64, f64, false),
-        DataType::Float32 => impl_argminmax_const_for_type!(inputs, len, f32, f32, false),
-        DataType::Int64 => impl_argminmax_const_for_type!(inputs, len, i64, i64, false),
-        DataType::Int32 => impl_argminmax_const_for_type!(inputs, len, i32, i32, false),
-        DataType::UInt64 => impl_argminmax_const_for_type!(inputs, len, u64, u64, false),
-        DataType::UInt32 => impl_argminmax_const_for_type!(inputs, len, u32, u32, false),
-        _ => {
-            return Err(PolarsError::ComputeError(
-                format!("Unsupported dtype: {:?}", dtype).into(),
-            ))
-        }
+fn arg_minmax_colname_output_type(
+    _input_fields: &[Field],
+    kwargs: ArgMinMaxArgs,
+) -> PolarsResult<Field> {
+    let dtype: DataType = _arg_minmax_dtype(DataType::String, &kwargs)?;
+    Ok(Field::new(PlSmallStr::from_static(""), dtype))
+}
+
+/// Gather the input column names through the index output, keeping list offsets as is.
+fn _idx_to_colname(idx_ser: Series, inputs: &[Series]) -> PolarsResult<Series> {
+    let colnames: StringChunked = inputs.iter().map(|s| Some(s.name().as_str())).collect();
+
+    let DataType::List(_) = idx_ser.dtype() else {
+        return Ok(colnames.take(idx_ser.u32()?)?.into_series());
     };
 
-    Ok(
-        UInt32Chunked::from_iter_options(PlSmallStr::from_static(""), result.into_iter())
-            .into_series(),
-    )
+    let lists: &ListChunked = idx_ser.list()?;
+    let Some(arr) = lists.downcast_iter().next() else {
+        return Ok(Series::new_empty(
+            PlSmallStr::EMPTY,
+            &DataType::List(Box::new(DataType::String)),
+        ));
+    };
+    let idx: UInt32Chunked = UInt32Chunked::with_chunk(
+        PlSmallStr::EMPTY,
+        arr.values()
+            .as_any()
+            .downcast_ref::<PrimitiveArray<u32>>()
+            .unwrap()
+            .clone(),
+    );
+    let values: Box<dyn Array> = colnames.take(&idx)?.into_series().rechunk().chunks()[0].clone();
+
+    let out: ListArray<i64> = ListArray::<i64>::new(
+        ListArray::<i64>::default_datatype(values.dtype().clone()),
+        arr.offsets().clone(),
+        values,
+        arr.validity().cloned(),
+    );
+    Ok(ListChunked::with_chunk(PlSmallStr::EMPTY, out).into_series())
+}
+
+#[polars_expr(output_type_func_with_kwargs=arg_minmax_colname_output_type)]
+fn arg_max_horizontal_colname(inputs: &[Series], kwargs: ArgMinMaxArgs) -> PolarsResult<Series> {
+    _idx_to_colname(_arg_max_horizontal_idx(inputs, &kwargs)?, inputs)
+}
+
+#[polars_expr(output_type_func_with_kwargs=arg_minmax_colname_output_type)]
+fn arg_min_horizontal_colname(inputs: &[Series], kwargs: ArgMinMaxArgs) -> PolarsResult<Series> {
+    _idx_to_colname(_arg_min_horizontal_idx(inputs, &kwargs)?, inputs)
+}
+
+/// Enum over the input column names; the output is the index buffer plus this dictionary.
+pub(crate) fn _colname_enum_dtype(names: &[&str]) -> DataType {
+    create_enum_dtype(Utf8ViewArray::from_slice_values(names))
 }
 
-#[polars_expr(output_type=String)]
-fn arg_max_horizontal_colname(inputs: &[Series]) -> PolarsResult<Series> {
-    let idx_ser: Series = _arg_max_horizontal_idx(inputs)?;
+/// The names become Enum categories, so a column passed twice cannot be encoded.
+pub(crate) fn _ensure_unique_colnames(names: &[&str]) -> PolarsResult<()> {
+    let mut seen: PlHashSet<&str> = PlHashSet::with_capacity(names.len());
+    for name in names {
+        polars_ensure!(
+            seen.insert(*name),
+            ComputeError: "column names must be unique to form an Enum, '{}' is passed more than once",
+            name
+        );
+    }
+    Ok(())
+}
 
-    // Extract column names from the inputs
+pub(crate) fn _idx_to_colname_enum(idx_ser: Series, inputs: &[Series]) -> PolarsResult<Series> {
     let colnames: Vec<&str> = inputs.iter().map(|s| s.name().as_str()).collect();
+    _ensure_unique_colnames(&colnames)?;
+    let DataType::Enum(Some(rev_map), ordering) = _colname_enum_dtype(&colnames) else {
+        unreachable!()
+    };
+
+    // Indices are always < n_columns, so they are valid codes into the dictionary
+    let cats: UInt32Chunked = idx_ser.u32()?.clone();
+    let out: CategoricalChunked = unsafe {
+        CategoricalChunked::from_cats_and_rev_map_unchecked(cats, rev_map, true, ordering)
+    };
 
-    let result: ChunkedArray<StringType> = idx_ser
-        .u32()?
-        .into_iter()
-        .map(|opt_idx| opt_idx.map(|idx| colnames.get(idx as usize).copied().unwrap_or("")))
-        .collect();
+    Ok(out.into_series())
+}
 
-    Ok(result.into_series())
+fn arg_minmax_enum_output_type(
+    input_fields: &[Field],
+    kwargs: ArgMinMaxArgs,
+) -> PolarsResult<Field> {
+    polars_ensure!(
+        kwargs.options()?.ties != Ties::All,
+        InvalidOperation: "`ties='all'` cannot be returned as an Enum"
+    );
+    let colnames: Vec<&str> = input_fields.iter().map(|f| f.name().as_str()).collect();
+    _ensure_unique_colnames(&colnames)?;
+    let field = Field::new(PlSmallStr::from_static(""), _colname_enum_dtype(&colnames));
+    Ok(field)
 }
 
-#[polars_expr(output_type=String)]
-fn arg_min_horizontal_colname(inputs: &[Series]) -> PolarsResult<Series> {
-    let idx_ser: Series = _arg_min_horizontal_idx(inputs)?;
+#[polars_expr(output_type_func_with_kwargs=arg_minmax_enum_output_type)]
+fn arg_max_horizontal_enum(inputs: &[Series], kwargs: ArgMinMaxArgs) -> PolarsResult<Series> {
+    _idx_to_colname_enum(_arg_max_horizontal_idx(inputs, &kwargs)?, inputs)
+}
 
-    // Extract column names from the inputs
-    let colnames: Vec<&str> = inputs.iter().map(|s| s.name().as_str()).collect();
+#[polars_expr(output_type_func_with_kwargs=arg_minmax_enum_output_type)]
+fn arg_min_horizontal_enum(inputs: &[Series], kwargs: ArgMinMaxArgs) -> PolarsResult<Series> {
+    _idx_to_colname_enum(_arg_min_horizontal_idx(inputs, &kwargs)?, inputs)
+}
 
-    let result: ChunkedArray<StringType> = idx_ser
-        .u32()?
-        .into_iter()
-        .map(|opt_idx| opt_idx.map(|idx| colnames.get(idx as usize).copied().unwrap_or("")))
-        .collect();
+#[polars_expr(output_type_func_with_kwargs=arg_minmax_output_type)]
+fn arg_max_horizontal(inputs: &[Series], kwargs: ArgMinMaxArgs) -> PolarsResult<Series> {
+    _arg_max_horizontal_idx(inputs, &kwargs)
+}
+
+#[polars_expr(output_type_func_with_kwargs=arg_minmax_output_type)]
+fn arg_min_horizontal(inputs: &[Series], kwargs: ArgMinMaxArgs) -> PolarsResult<Series> {
+    _arg_min_horizontal_idx(inputs, &kwargs)
+}
 
-    Ok(result.into_series())
+#[polars_expr(output_type_func_with_kwargs=min_max_horizontal_output_type)]
+fn min_max_horizontal(inputs: &[Series], kwargs: MinMaxHorizontalArgs) -> PolarsResult<Series> {
+    reduce_horizontal(inputs, &kwargs)
 }
 
-#[polars_expr(output_type=UInt32)]
-fn arg_max_horizontal(inputs: &[Series]) -> PolarsResult<Series> {
-    _arg_max_horizontal_idx(inputs)
+#[polars_expr(output_type_func=value_with_arg_output_type)]
+fn max_with_arg_horizontal(inputs: &[Series]) -> PolarsResult<Series> {
+    reduce_horizontal(inputs, &ValueWithArg::<true>)
 }
 
-#[polars_expr(output_type=UInt32)]
-fn arg_min_horizontal(inputs: &[Series]) -> PolarsResult<Series> {
-    _arg_min_horizontal_idx(inputs)
+#[polars_expr(output_type_func=value_with_arg_output_type)]
+fn min_with_arg_horizontal(inputs: &[Series]) -> PolarsResult<Series> {
+    reduce_horizontal(inputs, &ValueWithArg::<false>)
 }
@@ -0,0 +1,218 @@
+use crate::arg_minmax::{InputKind, _check_types};
+use polars::datatypes::PlSmallStr;
+use polars::prelude::*;
+use polars_arrow::array::{Array, FixedSizeListArray, PrimitiveArray};
+use polars_arrow::bitmap::{Bitmap, MutableBitmap};
+use polars_arrow::datatypes::ArrowDataType;
+use pyo3_polars::derive::polars_expr;
+use serde::Deserialize;
+use std::cmp::Ordering;
+
+#[derive(Deserialize)]
+struct ArgTopKArgs {
+    k: usize,
+    descending: bool,
+    return_colname: bool,
+}
+
+fn arg_top_k_output_type(_input_fields: &[Field], kwargs: ArgTopKArgs) -> PolarsResult<Field> {
+    let inner: DataType = if kwargs.return_colname {
+        DataType::String
+    } else {
+        DataType::UInt32
+    };
+    let field = Field::new(
+        PlSmallStr::from_static(""),
+        DataType::Array(Box::new(inner), kwargs.k),
+    );
+    Ok(field)
+}
+
+/// Order used for selection. NaN slots are skipped like nulls before ranking, as with
+/// the `nan="ignore"` default of arg_max/arg_min, so -0.0 and 0.0 simply tie.
+trait TopKValue: Copy {
+    fn total_order(&self, other: &Self) -> Ordering;
+
+    #[inline(always)]
+    fn is_nan(&self) -> bool {
+        false
+    }
+}
+
+macro_rules! impl_top_k_value_ord {
+    ($($t:ty),*) => {
+        $(impl TopKValue for $t {
+            #[inline(always)]
+            fn total_order(&self, other: &Self) -> Ordering {
+                self.cmp(other)
+            }
+        })*
+    };
+}
+
+macro_rules! impl_top_k_value_float {
+    ($($t:ty),*) => {
+        $(impl TopKValue for $t {
+            #[inline(always)]
+            fn total_order(&self, other: &Self) -> Ordering {
+                self.partial_cmp(other).unwrap_or(Ordering::Equal)
+            }
+
+            #[inline(always)]
+            fn is_nan(&self) -> bool {
+                <$t>::is_nan(*self)
+            }
+        })*
+    };
+}
+
+impl_top_k_value_ord!(i8, i16, i32, i64, i128, u8, u16, u32, u64);
+impl_top_k_value_float!(f32, f64);
+
+/// Strings are ranked lexicographically.
+impl TopKValue for &str {
+    #[inline(always)]
+    fn total_order(&self, other: &Self) -> Ordering {
+        self.cmp(other)
+    }
+}
+
+/// Select the k best columns per row with a partial selection over a reusable
+/// scratch buffer. Rows with fewer than k non-null, non-NaN values are padded with nulls.
+///
+/// `get(col_idx, row_idx)` reads a value, it is only called on valid slots.
+fn _top_k<T: TopKValue>(
+    validities: &[Option<&Bitmap>],
+    get: impl Fn(usize, usize) -> T,
+    len: usize,
+    k: usize,
+    descending: bool,
+) -> (Vec<u32>, Bitmap) {
+    let mut scratch: Vec<(T, u32)> = Vec::with_capacity(validities.len());
+    let mut indices: Vec<u32> = Vec::with_capacity(len * k);
+    let mut validity: MutableBitmap = MutableBitmap::with_capacity(len * k);
+
+    // Best first, ties keep the lower column index
+    let compare = |a: &(T, u32), b: &(T, u32)| {
+        let ord: Ordering = a.0.total_order(&b.0);
+        let ord: Ordering = if descending { ord.reverse() } else { ord };
+        ord.then(a.1.cmp(&b.1))
+    };
+
+    for row_idx in 0..len {
+        scratch.clear();
+
+        for (col_idx, col_validity) in validities.iter().enumerate() {
+            let is_valid: bool =
+                col_validity.is_none_or(|v| unsafe { v.get_bit_unchecked(row_idx) });
+            if is_valid {
+                let value: T = get(col_idx, row_idx);
+                if !value.is_nan() {
+                    scratch.push((value, col_idx as u32));
+                }
+            }
+        }
+
+        if scratch.len() > k {
+            scratch.select_nth_unstable_by(k - 1, compare);
+            scratch.truncate(k);
+        }
+        scratch.sort_unstable_by(compare);
+
+        for (_, col_idx) in scratch.iter() {
+            indices.push(*col_idx);
+            validity.push(true);
+        }
+        for _ in scratch.len()..k {
+            indices.push(0);
+            validity.push(false);
+        }
+    }
+
+    (indices, validity.into())
+}
+
+macro_rules! impl_top_k_for_type {
+    ($inputs:expr, $len:expr, $k:expr, $descending:expr, $polars_type:ident) => {{
+        let arrays = $inputs
+            .iter()
+            .map(|s| Ok(s.$polars_type()?.downcast_iter().next().unwrap()))
+            .collect::<PolarsResult<Vec<_>>>()?;
+        let validities: Vec<Option<&Bitmap>> = arrays.iter().map(|arr| arr.validity()).collect();
+        _top_k(
+            &validities,
+            |c, r| unsafe { arrays[c].value_unchecked(r) },
+            $len,
+            $k,
+            $descending,
+        )
+    }};
+}
+
+#[polars_expr(output_type_func_with_kwargs=arg_top_k_output_type)]
+fn arg_top_k_horizontal(inputs: &[Series], kwargs: ArgTopKArgs) -> PolarsResult<Series> {
+    let len: usize = inputs[0].len();
+    let k: usize = kwargs.k;
+    let descending: bool = kwargs.descending;
+
+    polars_ensure!(k > 0, ComputeError: "`k` must be at least 1");
+
+    // Logical types compare on their physical values, booleans as 0/1 (false < true);
+    // mixed integer widths are cast to their supertype, as rows are gathered into one
+    // scratch buffer
+    let inputs: Vec<Series> = match _check_types(inputs)? {
+        InputKind::Uniform(DataType::Boolean) => inputs
+            .iter()
+            .map(|s| Ok(s.cast(&DataType::UInt8)?.rechunk()))
+            .collect::<PolarsResult<_>>()?,
+        InputKind::Uniform(_) => inputs
+            .iter()
+            .map(|s| s.to_physical_repr().rechunk())
+            .collect(),
+        InputKind::MixedInt(supertype) => inputs
+            .iter()
+            .map(|s| Ok(s.cast(&supertype)?.rechunk()))
+            .collect::<PolarsResult<_>>()?,
+    };
+
+    let (indices, validity): (Vec<u32>, Bitmap) = if len == 0 {
+        (Vec::new(), Bitmap::new())
+    } else {
+        match inputs[0].dtype() {
+            DataType::Float64 => impl_top_k_for_type!(inputs, len, k, descending, f64),
+            DataType::Float32 => impl_top_k_for_type!(inputs, len, k, descending, f32),
+            DataType::Int128 => impl_top_k_for_type!(inputs, len, k, descending, i128),
+            DataType::Int64 => impl_top_k_for_type!(inputs, len, k, descending, i64),
+            DataType::Int32 => impl_top_k_for_type!(inputs, len, k, descending, i32),
+            DataType::Int16 => impl_top_k_for_type!(inputs, len, k, descending, i16),
+            DataType::Int8 => impl_top_k_for_type!(inputs, len, k, descending, i8),
+            DataType::UInt64 => impl_top_k_for_type!(inputs, len, k, descending, u64),
+            DataType::UInt32 => impl_top_k_for_type!(inputs, len, k, descending, u32),
+            DataType::UInt16 => impl_top_k_for_type!(inputs, len, k, descending, u16),
+            DataType::UInt8 => impl_top_k_for_type!(inputs, len, k, descending, u8),
+            DataType::String => impl_top_k_for_type!(inputs, len, k, descending, str),
+            dtype => {
+                return Err(PolarsError::ComputeError(
+                    format!("Unsupported dtype: {:?}", dtype).into(),
+                ))
+            }
+        }
+    };
+
+    let values: Box<dyn Array> = if kwargs.return_colname {
+        // Gather the column names through the index buffer
+        let colnames: StringChunked = inputs.iter().map(|s| Some(s.name().as_str())).collect();
+        let idx: UInt32Chunked =
+            UInt32Chunked::from_vec_validity(PlSmallStr::EMPTY, indices, Some(validity));
+        colnames.take(&idx)?.into_series().rechunk().chunks()[0].clone()
+    } else {
+        PrimitiveArray::<u32>::from_vec(indices)
+            .with_validity(Some(validity))
+            .boxed()
+    };
+
+    let dtype: ArrowDataType = FixedSizeListArray::default_datatype(values.dtype().clone(), k);
+    let arr: FixedSizeListArray = FixedSizeListArray::new(dtype, len, values, None);
+
+    Ok(ArrayChunked::with_chunk(PlSmallStr::EMPTY, arr).into_series())
+}
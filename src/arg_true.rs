@@ -1,6 +1,9 @@
+use crate::bitmap::{bitmap_from_words, for_each_set_bit, full_words, true_words};
 use polars::datatypes::PlSmallStr;
 use polars::prelude::*;
-use polars_arrow::legacy::trusted_len::TrustedLenPush;
+use polars_arrow::array::{ListArray, PrimitiveArray};
+use polars_arrow::datatypes::ArrowDataType;
+use polars_arrow::offset::OffsetsBuffer;
 use pyo3_polars::derive::polars_expr;
 
 // -- Arg True
@@ -16,61 +19,105 @@ fn arg_true_output_type(_input_fields: &[Field]) -> PolarsResult<Field> {
 #[polars_expr(output_type_func=arg_true_output_type)]
 fn arg_true_horizontal(inputs: &[Series]) -> PolarsResult<Series> {
     let len: usize = inputs[0].len();
-    let width: usize = inputs.len();
 
-    // Preallocate a vector of Lists (one per row)
-    let mut builder = ListPrimitiveChunkedBuilder::<Int32Type>::new(
-        PlSmallStr::from_static(""),
-        len,
-        width,
-        DataType::Int32,
-    );
-
-    for row_idx in 0..len {
-        let mut indices = Vec::with_capacity(width);
-
-        for (col_idx, s) in inputs.iter().enumerate() {
-            let bool_s: Series = s.cast(&DataType::Boolean)?;
-
-            // We're assuming boolean-like inputs (could be bool or numeric)
-            // Null values are treated as false
-            match bool_s.bool().ok().and_then(|ca| ca.get(row_idx)) {
-                Some(true) => indices.push(col_idx as i32),
-                _ => {}
-            }
+    // Cast each column exactly once; boolean inputs are a cheap clone
+    // Null values are treated as false
+    let bools: Vec<Series> = inputs
+        .iter()
+        .map(|s| Ok(s.cast(&DataType::Boolean)?.rechunk()))
+        .collect::<PolarsResult<_>>()?;
+
+    // Counting pass: number of hits per row, so the buffers are sized exactly
+    let mut counts: Vec<i64> = vec![0; len];
+    for s in &bools {
+        for (word_idx, hits) in true_words(s)?.into_iter().enumerate() {
+            let offset: usize = word_idx * 64;
+            for_each_set_bit(hits, |bit| counts[offset + bit] += 1);
         }
+    }
 
-        builder.append_slice(&indices);
+    let mut offsets: Vec<i64> = Vec::with_capacity(len + 1);
+    offsets.push(0);
+    let mut total: i64 = 0;
+    for count in counts.iter_mut() {
+        total += *count;
+        offsets.push(total);
+        // Reuse as the per-row write cursor
+        *count = total - *count;
     }
+    let mut cursors: Vec<i64> = counts;
+
+    // Fill pass: columns are visited in order so each row stays sorted
+    let mut values: Vec<i32> = vec![0; total as usize];
+    for (col_idx, s) in bools.iter().enumerate() {
+        for (word_idx, hits) in true_words(s)?.into_iter().enumerate() {
+            let offset: usize = word_idx * 64;
+            for_each_set_bit(hits, |bit| {
+                let cursor: &mut i64 = &mut cursors[offset + bit];
+                values[*cursor as usize] = col_idx as i32;
+                *cursor += 1;
+            });
+        }
+    }
+
+    let offsets: OffsetsBuffer<i64> = unsafe { OffsetsBuffer::new_unchecked(offsets.into()) };
+    let arr: ListArray<i64> = ListArray::<i64>::new(
+        ListArray::<i64>::default_datatype(ArrowDataType::Int32),
+        offsets,
+        PrimitiveArray::<i32>::from_vec(values).boxed(),
+        None,
+    );
 
-    Ok(builder.finish().into_series())
+    Ok(ListChunked::with_chunk(PlSmallStr::EMPTY, arr).into_series())
 }
 
 // -- Arg First True
 
 #[polars_expr(output_type=UInt32)]
 fn arg_first_true_horizontal(inputs: &[Series]) -> PolarsResult<Series> {
-    let vec_size: usize = inputs[0].len();
+    // Same semantics as the `when/then` chain: a null never counts as a hit
+    let len: usize = inputs[0].len();
 
-    let mut result: Vec<Option<u32>> = Vec::with_capacity(vec_size);
+    let mut result: Vec<u32> = vec![0; len];
 
-    let bools: Vec<_> = inputs.iter().map(|s| s.bool().unwrap()).collect();
+    // One bit per row that has not seen a true yet
+    let mut unresolved: Vec<u64> = full_words(len);
+    let mut n_unresolved: usize = len;
 
-    for row_idx in 0..vec_size {
-        let mut found = None;
+    for (col_idx, s) in inputs.iter().enumerate() {
+        if n_unresolved == 0 {
+            break;
+        }
 
-        for (col_idx, col) in bools.iter().enumerate() {
-            if unsafe { col.get_unchecked(row_idx).unwrap_unchecked() } {
-                found = Some(col_idx as u32);
-                break;
+        let s: Series = s.rechunk();
+        let hits: Vec<u64> = true_words(&s)?;
+
+        for (word_idx, (hit, pending)) in hits.iter().zip(unresolved.iter_mut()).enumerate() {
+            // Every row in this block already found its true
+            if *pending == 0 {
+                continue;
             }
-        }
 
-        unsafe { result.push_unchecked(found) };
+            let new_hits: u64 = hit & *pending;
+            if new_hits == 0 {
+                continue;
+            }
+
+            *pending &= !new_hits;
+            n_unresolved -= new_hits.count_ones() as usize;
+
+            let offset: usize = word_idx * 64;
+            for_each_set_bit(new_hits, |bit| result[offset + bit] = col_idx as u32);
+        }
     }
 
-    Ok(
-        UInt32Chunked::from_iter_options(PlSmallStr::from_str(""), result.into_iter())
-            .into_series(),
-    )
+    // Rows without any true are null in the output
+    let resolved: Vec<u64> = full_words(len)
+        .iter()
+        .zip(unresolved.iter())
+        .map(|(all, pending)| all & !pending)
+        .collect();
+    let validity = bitmap_from_words(&resolved, len)?;
+
+    Ok(UInt32Chunked::from_vec_validity(PlSmallStr::EMPTY, result, Some(validity)).into_series())
 }
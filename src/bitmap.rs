@@ -0,0 +1,83 @@
+use polars::prelude::*;
+use polars_arrow::array::Array;
+use polars_arrow::bitmap::Bitmap;
+
+// -- Word-at-a-time helpers over arrow bitmaps (64 rows per word, LSB first)
+
+/// Number of 64-row words needed to cover `len` rows.
+#[inline]
+pub(crate) fn n_words(len: usize) -> usize {
+    len.div_ceil(64)
+}
+
+/// Mask of the bits in word `word_idx` that map onto real rows.
+#[inline]
+pub(crate) fn tail_mask(len: usize, word_idx: usize) -> u64 {
+    let remaining: usize = len - word_idx * 64;
+    if remaining >= 64 {
+        u64::MAX
+    } else {
+        (1u64 << remaining) - 1
+    }
+}
+
+/// Every row set, padding bits in the last word cleared.
+pub(crate) fn full_words(len: usize) -> Vec<u64> {
+    (0..n_words(len)).map(|w| tail_mask(len, w)).collect()
+}
+
+/// Iterate a bitmap as `u64` words; the last word is zero padded.
+pub(crate) fn words(bitmap: &Bitmap) -> impl Iterator<Item = u64> + '_ {
+    let chunks = bitmap.chunks::<u64>();
+    let remainder: u64 = chunks.remainder();
+    chunks
+        .chain(std::iter::once(remainder))
+        .take(n_words(bitmap.len()))
+}
+
+/// Materialize the validity of a series as words; `None` when it has no nulls.
+///
+/// The series must be a single chunk (see `rechunk`).
+pub(crate) fn validity_words(s: &Series) -> Option<Vec<u64>> {
+    if s.null_count() == 0 {
+        return None;
+    }
+    match s.chunks()[0].validity() {
+        Some(validity) => Some(words(validity).collect()),
+        // Null-typed arrays may carry no bitmap at all
+        None => Some(vec![0; n_words(s.len())]),
+    }
+}
+
+/// Words of the rows that are both valid and `true`; nulls read as false.
+///
+/// The series must be a single-chunk boolean (see `rechunk`).
+pub(crate) fn true_words(s: &Series) -> PolarsResult<Vec<u64>> {
+    let Some(arr) = s.bool()?.downcast_iter().next() else {
+        return Ok(Vec::new());
+    };
+    let values = words(arr.values());
+    let out: Vec<u64> = match arr.validity() {
+        Some(validity) if arr.null_count() > 0 => values
+            .zip(words(validity))
+            .map(|(value, valid)| value & valid)
+            .collect(),
+        _ => values.collect(),
+    };
+    Ok(out)
+}
+
+/// Pack words back into an arrow bitmap of `len` bits.
+pub(crate) fn bitmap_from_words(words: &[u64], len: usize) -> PolarsResult<Bitmap> {
+    let bytes: Vec<u8> = words.iter().flat_map(|w| w.to_le_bytes()).collect();
+    Bitmap::try_new(bytes, len)
+}
+
+/// Call `f` with the index of every set bit in `word`, lowest first.
+#[inline]
+pub(crate) fn for_each_set_bit(mut word: u64, mut f: impl FnMut(usize)) {
+    while word != 0 {
+        f(word.trailing_zeros() as usize);
+        word &= word - 1;
+    }
+}
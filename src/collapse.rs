@@ -1,95 +1,890 @@
-use polars::chunked_array::builder::ListStringChunkedBuilder;
+use crate::arg_minmax::{
+    _colname_enum_dtype, _ensure_unique_colnames, _idx_to_colname_enum, _value_dtype,
+};
+use crate::bitmap::{bitmap_from_words, for_each_set_bit, full_words, true_words, words};
 use polars::datatypes::PlSmallStr;
 use polars::prelude::*;
+use polars_arrow::array::{
+    Array, BooleanArray, FixedSizeListArray, ListArray, MutableBinaryViewArray, PrimitiveArray,
+    Utf8ViewArray, View,
+};
+use polars_arrow::bitmap::{Bitmap, MutableBitmap};
+use polars_arrow::buffer::Buffer;
+use polars_arrow::datatypes::ArrowDataType;
+use polars_arrow::offset::OffsetsBuffer;
+use polars_arrow::types::NativeType;
 use pyo3_polars::derive::polars_expr;
 use serde::Deserialize;
-use smallvec::SmallVec;
-
-fn collapse_columns_output_type(_input_fields: &[Field]) -> PolarsResult<Field> {
-    let field = Field::new(
-        PlSmallStr::from_static(""),
-        DataType::List(Box::new(DataType::String)),
-    );
-    Ok(field)
-}
+use std::hash::Hash;
+use std::sync::Arc;
 
 #[derive(Deserialize)]
 struct CollapseColumnsArgs {
     is_null_sentinel: bool,
+    zero_copy: bool,
+    to_array: Option<usize>,
+    has_fill: bool,
+    unique: bool,
 }
 
-fn _null_sentinel_fp(inputs: &[Series]) -> PolarsResult<Series> {
-    let len: usize = inputs[0].len();
-    let width: usize = inputs.len();
-    let mut builder =
-        ListStringChunkedBuilder::new(PlSmallStr::from_static("res"), len, len * inputs.len());
+fn collapse_columns_output_type(
+    input_fields: &[Field],
+    kwargs: CollapseColumnsArgs,
+) -> PolarsResult<Field> {
+    // The fill value, if any, is the last input and not collapsed
+    let n_columns: usize = input_fields.len() - kwargs.has_fill as usize;
+    let dtypes: Vec<&DataType> = input_fields[..n_columns]
+        .iter()
+        .map(|f| f.dtype())
+        .collect();
+    let inner: DataType = _value_dtype(&dtypes)?;
+    let dtype: DataType = match kwargs.to_array {
+        Some(width) => DataType::Array(Box::new(inner), width),
+        None => DataType::List(Box::new(inner)),
+    };
+    Ok(Field::new(PlSmallStr::from_static(""), dtype))
+}
+
+/// List offsets from a first pass over the validity bitmaps only, so the child
+/// values can be allocated exactly.
+fn _collapse_offsets(
+    validities: &[Option<&Bitmap>],
+    len: usize,
+    is_null_sentinel: bool,
+) -> Vec<i64> {
+    let counts: Vec<u32> = if is_null_sentinel {
+        _sentinel_lengths(validities, len)
+    } else {
+        let mut counts: Vec<u32> = vec![0; len];
+        for validity in validities {
+            match validity {
+                None => counts.iter_mut().for_each(|count| *count += 1),
+                Some(validity) => counts
+                    .iter_mut()
+                    .zip(validity.iter())
+                    .for_each(|(count, valid)| *count += valid as u32),
+            }
+        }
+        counts
+    };
+
+    let mut offsets: Vec<i64> = Vec::with_capacity(len + 1);
+    offsets.push(0);
+    let mut total: i64 = 0;
+    for count in counts {
+        total += count as i64;
+        offsets.push(total);
+    }
+    offsets
+}
+
+/// Null-sentinel row lengths: the column of each row's first null, or the width when
+/// it has none. Same word-at-a-time scan as `arg_first_null_horizontal`.
+fn _sentinel_lengths(validities: &[Option<&Bitmap>], len: usize) -> Vec<u32> {
+    let mut lengths: Vec<u32> = vec![validities.len() as u32; len];
+
+    // One bit per row that has not seen a null yet
+    let mut unresolved: Vec<u64> = full_words(len);
+    let mut n_unresolved: usize = len;
+
+    for (col_idx, validity) in validities.iter().enumerate() {
+        if n_unresolved == 0 {
+            break;
+        }
+        // No nulls, this column cannot end any row
+        let Some(validity) = validity else {
+            continue;
+        };
+
+        for (word_idx, (valid, pending)) in words(validity).zip(unresolved.iter_mut()).enumerate() {
+            let hits: u64 = !valid & *pending;
+            if hits == 0 {
+                continue;
+            }
 
-    // Borrow the chunked arrays once
-    let chunks: Vec<&ChunkedArray<StringType>> = inputs.iter().map(|s| s.str().unwrap()).collect();
+            *pending &= !hits;
+            n_unresolved -= hits.count_ones() as usize;
+
+            let offset: usize = word_idx * 64;
+            for_each_set_bit(hits, |bit| lengths[offset + bit] = col_idx as u32);
+        }
+    }
+    lengths
+}
+
+/// Fill the exactly sized child buffer, column by column.
+///
+/// `get(col_idx, row_idx)` reads a value, `fill` initializes the buffer.
+fn _collapse_values<T: Copy>(
+    validities: &[Option<&Bitmap>],
+    offsets: &[i64],
+    is_null_sentinel: bool,
+    fill: T,
+    get: impl Fn(usize, usize) -> T,
+) -> Vec<T> {
+    let len: usize = offsets.len() - 1;
+    let mut values: Vec<T> = vec![fill; *offsets.last().unwrap() as usize];
+
+    if is_null_sentinel {
+        // Column `c` lands at `offset + c` of every row still open, so there are no
+        // cursors and no validity checks; stop once every row is closed
+        let mut open: Vec<u64> = full_words(len);
+        for (col_idx, validity) in validities.iter().enumerate() {
+            if let Some(validity) = validity {
+                open.iter_mut()
+                    .zip(words(validity))
+                    .for_each(|(open, valid)| *open &= valid);
+            }
+            if open.iter().all(|word| *word == 0) {
+                break;
+            }
+
+            for (word_idx, word) in open.iter().enumerate() {
+                let base: usize = word_idx * 64;
+                for_each_set_bit(*word, |bit| {
+                    let row_idx: usize = base + bit;
+                    values[offsets[row_idx] as usize + col_idx] = get(col_idx, row_idx);
+                });
+            }
+        }
+        return values;
+    }
+
+    let mut cursors: Vec<usize> = offsets[..len].iter().map(|o| *o as usize).collect();
+    for (col_idx, validity) in validities.iter().enumerate() {
+        match validity {
+            None => {
+                for (row_idx, cursor) in cursors.iter_mut().enumerate() {
+                    values[*cursor] = get(col_idx, row_idx);
+                    *cursor += 1;
+                }
+            }
+            Some(validity) => {
+                for (row_idx, (cursor, valid)) in
+                    cursors.iter_mut().zip(validity.iter()).enumerate()
+                {
+                    if valid {
+                        values[*cursor] = get(col_idx, row_idx);
+                        *cursor += 1;
+                    }
+                }
+            }
+        }
+    }
+    values
+}
+
+/// Fixed-width collapse: each row keeps at most `width` values in `width` slots.
+///
+/// Rows are tracked as words of still-open rows; a row closes once it is full (or
+/// at its first null under `is_null_sentinel`), and the scan stops when none are open.
+/// Returns the slots and how many of each row's slots were filled.
+fn _collapse_fixed<T: Copy>(
+    validities: &[Option<&Bitmap>],
+    len: usize,
+    width: usize,
+    is_null_sentinel: bool,
+    fill: T,
+    get: impl Fn(usize, usize) -> T,
+) -> (Vec<T>, Vec<u32>) {
+    let mut values: Vec<T> = vec![fill; len * width];
+    let mut counts: Vec<u32> = vec![0; len];
+    let mut open: Vec<u64> = full_words(len);
+
+    for (col_idx, validity) in validities.iter().enumerate() {
+        let valid_words: Vec<u64> = match validity {
+            Some(validity) => words(validity).collect(),
+            None => full_words(len),
+        };
+        if is_null_sentinel {
+            open.iter_mut()
+                .zip(valid_words.iter())
+                .for_each(|(open, valid)| *open &= valid);
+        }
+
+        let mut any_open: bool = false;
+        for (word_idx, (open, valid)) in open.iter_mut().zip(valid_words.iter()).enumerate() {
+            let base: usize = word_idx * 64;
+            let mut full: u64 = 0;
+            for_each_set_bit(*open & valid, |bit| {
+                let row_idx: usize = base + bit;
+                let count: &mut u32 = &mut counts[row_idx];
+                values[row_idx * width + *count as usize] = get(col_idx, row_idx);
+                *count += 1;
+                full |= ((*count as usize == width) as u64) << bit;
+            });
+            *open &= !full;
+            any_open |= *open != 0;
+        }
+        if !any_open {
+            break;
+        }
+    }
+    (values, counts)
+}
+
+/// How the collapsed values are laid out per row.
+#[derive(Clone, Copy)]
+enum Shape {
+    List,
+    Array(usize),
+}
+
+#[derive(Clone, Copy)]
+struct CollapseOptions {
+    is_null_sentinel: bool,
+    shape: Shape,
+    unique: bool,
+}
+
+/// What turns the child values into the output: list offsets, or the fixed width and
+/// the validity of the unfilled slots (`None` when they were filled).
+enum Layout {
+    List(Vec<i64>),
+    Array {
+        width: usize,
+        validity: Option<Bitmap>,
+    },
+}
+
+impl Layout {
+    fn from_counts(counts: Vec<u32>, shape: Shape, filled: bool) -> Self {
+        match shape {
+            Shape::List => {
+                let mut offsets: Vec<i64> = Vec::with_capacity(counts.len() + 1);
+                offsets.push(0);
+                let mut total: i64 = 0;
+                for count in counts {
+                    total += count as i64;
+                    offsets.push(total);
+                }
+                Layout::List(offsets)
+            }
+            Shape::Array(width) => {
+                let validity: Option<Bitmap> = (!filled).then(|| {
+                    let mut validity: MutableBitmap =
+                        MutableBitmap::with_capacity(counts.len() * width);
+                    for count in counts {
+                        validity.extend_constant(count as usize, true);
+                        validity.extend_constant(width - count as usize, false);
+                    }
+                    validity.into()
+                });
+                Layout::Array { width, validity }
+            }
+        }
+    }
+}
+
+/// Collapse into `options.shape`; `fill` pads unfilled array slots, otherwise they are null.
+///
+/// `key(col_idx, row_idx)` is only read in `unique` mode, to compare values within a row.
+fn _collapse<T: Copy, K: Hash + Eq + Copy>(
+    validities: &[Option<&Bitmap>],
+    len: usize,
+    options: CollapseOptions,
+    default: T,
+    fill: Option<T>,
+    get: impl Fn(usize, usize) -> T,
+    key: impl Fn(usize, usize) -> K,
+) -> (Vec<T>, Layout) {
+    if options.unique {
+        return _collapse_unique(
+            validities,
+            len,
+            options,
+            fill.unwrap_or(default),
+            fill.is_some(),
+            get,
+            key,
+        );
+    }
+
+    match options.shape {
+        Shape::List => {
+            let offsets: Vec<i64> = _collapse_offsets(validities, len, options.is_null_sentinel);
+            let values: Vec<T> =
+                _collapse_values(validities, &offsets, options.is_null_sentinel, default, get);
+            (values, Layout::List(offsets))
+        }
+        Shape::Array(width) => {
+            let (values, counts) = _collapse_fixed(
+                validities,
+                len,
+                width,
+                options.is_null_sentinel,
+                fill.unwrap_or(default),
+                get,
+            );
+            (
+                values,
+                Layout::from_counts(counts, options.shape, fill.is_some()),
+            )
+        }
+    }
+}
+
+/// Widths up to this deduplicate by scanning the row's kept values, past it through a hash set.
+const LINEAR_DEDUP_MAX_WIDTH: usize = 16;
+
+/// Deduplicating collapse. A row's values have to be compared with each other, so this
+/// walks row by row: small widths check the kept values linearly, larger ones reuse one
+/// hash set. Both keep the first-seen order.
+fn _collapse_unique<T: Copy, K: Hash + Eq + Copy>(
+    validities: &[Option<&Bitmap>],
+    len: usize,
+    options: CollapseOptions,
+    pad: T,
+    filled: bool,
+    get: impl Fn(usize, usize) -> T,
+    key: impl Fn(usize, usize) -> K,
+) -> (Vec<T>, Layout) {
+    let width: usize = validities.len();
+    let linear: bool = width <= LINEAR_DEDUP_MAX_WIDTH;
+    let limit: usize = match options.shape {
+        Shape::List => usize::MAX,
+        Shape::Array(width) => width,
+    };
+
+    // The non-null count bounds the output, so the child is allocated once
+    let capacity: usize = match options.shape {
+        Shape::List => *_collapse_offsets(validities, len, options.is_null_sentinel)
+            .last()
+            .unwrap() as usize,
+        Shape::Array(width) => len * width,
+    };
+    let mut values: Vec<T> = Vec::with_capacity(capacity);
+    let mut counts: Vec<u32> = Vec::with_capacity(len);
+
+    let mut row: Vec<(K, T)> = Vec::with_capacity(width);
+    let mut seen: PlHashSet<K> = PlHashSet::default();
 
-    // Pre-allocate a small buffer for values which will be reused
-    let mut vals: SmallVec<[&str; 128]> = SmallVec::with_capacity(width);
     for row_idx in 0..len {
-        vals.clear();
+        row.clear();
+        seen.clear();
 
-        for arr in &chunks {
-            let v: Option<&str> = unsafe { arr.get_unchecked(row_idx) };
+        for (col_idx, validity) in validities.iter().enumerate() {
+            let valid: bool = validity.map_or(true, |v| unsafe { v.get_bit_unchecked(row_idx) });
+            if !valid {
+                if options.is_null_sentinel {
+                    break;
+                }
+                continue;
+            }
 
-            match v {
-                Some(s) => vals.push(s),
-                None => break,
+            let k: K = key(col_idx, row_idx);
+            let is_new: bool = if linear {
+                !row.iter().any(|(kept, _)| *kept == k)
+            } else {
+                seen.insert(k)
+            };
+            if is_new {
+                row.push((k, get(col_idx, row_idx)));
+                if row.len() == limit {
+                    break;
+                }
             }
         }
 
-        builder.append_trusted_len_iter(vals.as_slice().iter().cloned().map(Some));
+        values.extend(row.iter().map(|(_, value)| *value));
+        if let Shape::Array(width) = options.shape {
+            values.extend(std::iter::repeat(pad).take(width - row.len()));
+        }
+        counts.push(row.len() as u32);
     }
 
-    Ok(builder.finish().into_series())
+    (values, Layout::from_counts(counts, options.shape, filled))
 }
 
-#[polars_expr(output_type_func=collapse_columns_output_type)]
-fn collapse_columns(inputs: &[Series], kwargs: CollapseColumnsArgs) -> PolarsResult<Series> {
+/// Equality key for deduplicating values; floats compare on their bits with
+/// `-0.0 == 0.0` and a single NaN.
+trait DedupKey: Copy {
+    type Key: Hash + Eq + Copy;
+
+    fn dedup_key(self) -> Self::Key;
+}
+
+macro_rules! impl_dedup_key_int {
+    ($($t:ty),*) => {
+        $(impl DedupKey for $t {
+            type Key = $t;
+
+            #[inline(always)]
+            fn dedup_key(self) -> Self::Key {
+                self
+            }
+        })*
+    };
+}
+
+macro_rules! impl_dedup_key_float {
+    ($($t:ty => $bits:ty),*) => {
+        $(impl DedupKey for $t {
+            type Key = $bits;
+
+            #[inline(always)]
+            fn dedup_key(self) -> Self::Key {
+                if self == 0.0 {
+                    0
+                } else if self.is_nan() {
+                    <$t>::NAN.to_bits()
+                } else {
+                    self.to_bits()
+                }
+            }
+        })*
+    };
+}
+
+impl_dedup_key_int!(i8, i16, i32, i64, i128, u8, u16, u32, u64);
+impl_dedup_key_float!(f32 => u32, f64 => u64);
+
+fn _validities(arrays: &[&dyn Array]) -> Vec<Option<&Bitmap>> {
+    arrays
+        .iter()
+        .map(|arr| arr.validity().filter(|v| v.unset_bits() > 0))
+        .collect()
+}
+
+fn _collapse_primitive<T: NativeType + DedupKey>(
+    columns: &[&PrimitiveArray<T>],
+    fill: Option<&PrimitiveArray<T>>,
+    len: usize,
+    options: CollapseOptions,
+) -> (Box<dyn Array>, Layout) {
+    let arrays: Vec<&dyn Array> = columns.iter().map(|arr| *arr as &dyn Array).collect();
+    let validities: Vec<Option<&Bitmap>> = _validities(&arrays);
+
+    let slices: Vec<&[T]> = columns.iter().map(|arr| arr.values().as_slice()).collect();
+    let fill: Option<T> = fill.map(|arr| arr.value(0));
+    let get = |c: usize, r: usize| unsafe { *slices[c].get_unchecked(r) };
+    let (values, layout) = _collapse(
+        &validities,
+        len,
+        options,
+        T::default(),
+        fill,
+        get,
+        |c, r| get(c, r).dedup_key(),
+    );
+    (PrimitiveArray::<T>::from_vec(values).boxed(), layout)
+}
+
+fn _collapse_bool(
+    columns: &[&BooleanArray],
+    fill: Option<&BooleanArray>,
+    len: usize,
+    options: CollapseOptions,
+) -> (Box<dyn Array>, Layout) {
+    let arrays: Vec<&dyn Array> = columns.iter().map(|arr| *arr as &dyn Array).collect();
+    let validities: Vec<Option<&Bitmap>> = _validities(&arrays);
+
+    let fill: Option<bool> = fill.map(|arr| arr.value(0));
+    let get = |c: usize, r: usize| unsafe { columns[c].values().get_bit_unchecked(r) };
+    let (values, layout) = _collapse(&validities, len, options, false, fill, get, get);
+    (BooleanArray::from_slice(values).boxed(), layout)
+}
+
+/// Strings collapse on their 16-byte views: the child array shares the input data
+/// buffers, so no string bytes are copied and long strings are not duplicated.
+fn _collapse_str(
+    columns: &[&Utf8ViewArray],
+    fill: Option<&Utf8ViewArray>,
+    len: usize,
+    options: CollapseOptions,
+) -> (Box<dyn Array>, Layout) {
+    let arrays: Vec<&dyn Array> = columns.iter().map(|arr| *arr as &dyn Array).collect();
+    let validities: Vec<Option<&Bitmap>> = _validities(&arrays);
+
+    // Every column's data buffers, back to back (the fill value's last); a column's
+    // views are shifted by the number of buffers in front of it
+    let sources: Vec<&Utf8ViewArray> = columns.iter().copied().chain(fill).collect();
+    let buffers: Arc<[Buffer<u8>]> = sources
+        .iter()
+        .flat_map(|arr| arr.data_buffers().iter().cloned())
+        .collect();
+    let buffer_shifts: Vec<u32> = sources
+        .iter()
+        .scan(0u32, |shift, arr| {
+            let current: u32 = *shift;
+            *shift += arr.data_buffers().len() as u32;
+            Some(current)
+        })
+        .collect();
+    let shifted_view = |c: usize, r: usize| {
+        let mut view: View = unsafe { *sources[c].views().get_unchecked(r) };
+        // Short strings are inlined in the view and reference no buffer
+        if view.length > View::MAX_INLINE_SIZE {
+            view.buffer_idx += buffer_shifts[c];
+        }
+        view
+    };
+
+    let fill: Option<View> = fill.map(|_| shifted_view(columns.len(), 0));
+    let (views, layout) = _collapse(
+        &validities,
+        len,
+        options,
+        View::default(),
+        fill,
+        shifted_view,
+        |c, r| unsafe { columns[c].value_unchecked(r) },
+    );
+
+    let total_bytes_len: usize = views.iter().map(|view| view.length as usize).sum();
+    let total_buffer_len: usize = buffers.iter().map(|buffer| buffer.len()).sum();
+    let values: Utf8ViewArray = unsafe {
+        Utf8ViewArray::new_unchecked(
+            ArrowDataType::Utf8View,
+            views.into(),
+            buffers,
+            None,
+            total_bytes_len,
+            total_buffer_len,
+        )
+    };
+    (values.boxed(), layout)
+}
+
+/// Same as `_collapse_str`, but the kept strings are copied into fresh compact buffers.
+fn _collapse_str_copied(
+    columns: &[&Utf8ViewArray],
+    fill: Option<&Utf8ViewArray>,
+    len: usize,
+    options: CollapseOptions,
+) -> (Box<dyn Array>, Layout) {
+    let arrays: Vec<&dyn Array> = columns.iter().map(|arr| *arr as &dyn Array).collect();
+    let validities: Vec<Option<&Bitmap>> = _validities(&arrays);
+
+    let fill: Option<&str> = fill.map(|arr| arr.value(0));
+    let get = |c: usize, r: usize| unsafe { columns[c].value_unchecked(r) };
+    let (values, layout) = _collapse(&validities, len, options, "", fill, get, get);
+    let values: Utf8ViewArray =
+        MutableBinaryViewArray::<str>::from_values_iter(values.into_iter()).freeze();
+    (values.boxed(), layout)
+}
+
+/// Categoricals collapse on their codes, which is only sound if every column shares a dictionary.
+fn _check_categorical_sources(inputs: &[Series]) -> PolarsResult<()> {
+    let first = inputs[0].categorical()?.get_rev_map();
+    for s in inputs.iter().skip(1) {
+        polars_ensure!(
+            first.same_src(s.categorical()?.get_rev_map()),
+            ComputeError: "collapse_columns requires Categorical inputs to share a dictionary, \
+            enable the global string cache or use an Enum"
+        );
+    }
+    Ok(())
+}
+
+/// Resolve the collapsed dtype and bring the inputs (and fill) to single-chunk
+/// physical series of it.
+fn _collapse_inputs(
+    inputs: &[Series],
+    fill: Option<&Series>,
+) -> PolarsResult<(DataType, Vec<Series>, Option<Series>)> {
     // Ensure we have at least one input
     if inputs.is_empty() {
         polars_bail!(ComputeError: "collapse_columns requires at least one input column");
     }
 
-    // Verify all inputs are string columns
-    for (i, series) in inputs.iter().enumerate() {
-        if !matches!(series.dtype(), DataType::String) {
-            polars_bail!(ComputeError: "Input {} is not a string column, got: {}", i, series.dtype());
+    let dtypes: Vec<&DataType> = inputs.iter().map(|s| s.dtype()).collect();
+    let dtype: DataType = _value_dtype(&dtypes)?;
+
+    let fill: Option<Series> = match fill {
+        Some(fill) => {
+            let fill: Series = fill.cast(&dtype)?;
+            polars_ensure!(
+                fill.len() == 1 && fill.null_count() == 0,
+                ComputeError: "`fill` must be a single non-null value of the input dtype"
+            );
+            Some(fill)
         }
+        None => None,
+    };
+
+    if matches!(dtype, DataType::Categorical(_, _) | DataType::Enum(_, _)) {
+        let mut sources: Vec<Series> = inputs.to_vec();
+        sources.extend(fill.clone());
+        _check_categorical_sources(&sources)?;
     }
 
-    let is_null_sentinel: bool = kwargs.is_null_sentinel;
+    // Mixed integer widths are cast up front, logical types collapse on their physical values
+    let physical: Vec<Series> = inputs
+        .iter()
+        .map(|s| Ok(s.cast(&dtype)?.to_physical_repr().rechunk()))
+        .collect::<PolarsResult<_>>()?;
+    let fill: Option<Series> = fill.map(|s| s.to_physical_repr().rechunk());
+    Ok((dtype, physical, fill))
+}
 
-    // FAST PATH: Check if all columns have nulls only at the end
-    if is_null_sentinel {
-        return _null_sentinel_fp(&inputs);
+/// Dispatch the collapse on the physical dtype of `dtype`.
+fn _collapse_typed(
+    physical: &[Series],
+    fill: Option<&Series>,
+    dtype: &DataType,
+    len: usize,
+    options: CollapseOptions,
+    zero_copy: bool,
+) -> PolarsResult<(Box<dyn Array>, Layout)> {
+    macro_rules! typed {
+        ($accessor:ident, $collapse:expr) => {{
+            let columns = physical
+                .iter()
+                .map(|s| Ok(s.$accessor()?.downcast_iter().next().unwrap()))
+                .collect::<PolarsResult<Vec<_>>>()?;
+            let fill = match fill {
+                Some(s) => s.$accessor()?.downcast_iter().next(),
+                None => None,
+            };
+            $collapse(&columns, fill, len, options)
+        }};
     }
 
-    // Pre-extract chunked arrays so we don't call .str().unwrap() every row
-    // This avoids repeated calls to .str() which can be expensive
-    // when there are many rows.
-    let str_arrays: Vec<&ChunkedArray<StringType>> =
-        inputs.iter().map(|s| s.str().unwrap()).collect();
-    let length = inputs[0].len();
-    let mut row_buf: SmallVec<[&str; 128]> = SmallVec::with_capacity(inputs.len());
+    let out = match dtype.to_physical() {
+        DataType::Float64 => typed!(f64, _collapse_primitive),
+        DataType::Float32 => typed!(f32, _collapse_primitive),
+        DataType::Int128 => typed!(i128, _collapse_primitive),
+        DataType::Int64 => typed!(i64, _collapse_primitive),
+        DataType::Int32 => typed!(i32, _collapse_primitive),
+        DataType::Int16 => typed!(i16, _collapse_primitive),
+        DataType::Int8 => typed!(i8, _collapse_primitive),
+        DataType::UInt64 => typed!(u64, _collapse_primitive),
+        DataType::UInt32 => typed!(u32, _collapse_primitive),
+        DataType::UInt16 => typed!(u16, _collapse_primitive),
+        DataType::UInt8 => typed!(u8, _collapse_primitive),
+        DataType::Boolean => typed!(bool, _collapse_bool),
+        DataType::String if zero_copy => typed!(str, _collapse_str),
+        DataType::String => typed!(str, _collapse_str_copied),
+        dt => polars_bail!(ComputeError: "collapse_columns does not support dtype: {}", dt),
+    };
+    Ok(out)
+}
 
-    let mut result_builder: ListStringChunkedBuilder =
-        ListStringChunkedBuilder::new(PlSmallStr::from_static(""), length, length * inputs.len());
+fn _list_array(values: Box<dyn Array>, offsets: Vec<i64>) -> ListArray<i64> {
+    let offsets: OffsetsBuffer<i64> = unsafe { OffsetsBuffer::new_unchecked(offsets.into()) };
+    ListArray::<i64>::new(
+        ListArray::<i64>::default_datatype(values.dtype().clone()),
+        offsets,
+        values,
+        None,
+    )
+}
 
-    // DEFAULT/SLOW PATH: Path for when we do not stop on the first null
-    for row_idx in 0..length {
-        row_buf.clear();
+#[polars_expr(output_type_func_with_kwargs=collapse_columns_output_type)]
+fn collapse_columns(inputs: &[Series], kwargs: CollapseColumnsArgs) -> PolarsResult<Series> {
+    // The fill value, if any, is passed as the last input
+    let (inputs, fill): (&[Series], Option<&Series>) = match (kwargs.has_fill, inputs.split_last())
+    {
+        (true, Some((fill, inputs))) => (inputs, Some(fill)),
+        _ => (inputs, None),
+    };
+    let (dtype, physical, fill) = _collapse_inputs(inputs, fill)?;
 
-        for arr in &str_arrays {
-            if let Some(val) = arr.get(row_idx) {
-                row_buf.push(val);
-            }
+    let shape: Shape = match kwargs.to_array {
+        Some(width) => {
+            polars_ensure!(width > 0, ComputeError: "`to_array` must be at least 1");
+            Shape::Array(width)
         }
-        result_builder.append_values_iter(row_buf.iter().copied());
+        None => Shape::List,
+    };
+    let options = CollapseOptions {
+        is_null_sentinel: kwargs.is_null_sentinel,
+        shape,
+        unique: kwargs.unique,
+    };
+    let len: usize = inputs[0].len();
+
+    let (values, layout) = _collapse_typed(
+        &physical,
+        fill.as_ref(),
+        &dtype,
+        len,
+        options,
+        kwargs.zero_copy,
+    )?;
+
+    let (arr, out_dtype): (Box<dyn Array>, DataType) = match layout {
+        Layout::List(offsets) => (
+            _list_array(values, offsets).boxed(),
+            DataType::List(Box::new(dtype)),
+        ),
+        Layout::Array { width, validity } => {
+            let values: Box<dyn Array> = values.with_validity(validity);
+            let arr: FixedSizeListArray = FixedSizeListArray::new(
+                FixedSizeListArray::default_datatype(values.dtype().clone(), width),
+                len,
+                values,
+                None,
+            );
+            (arr.boxed(), DataType::Array(Box::new(dtype), width))
+        }
+    };
+
+    // The child was built on physical values, the output dtype restores the logical one
+    Ok(
+        unsafe {
+            Series::from_chunks_and_dtype_unchecked(PlSmallStr::EMPTY, vec![arr], &out_dtype)
+        },
+    )
+}
+
+#[derive(Deserialize)]
+struct CollapseColumnsSparseArgs {
+    is_null_sentinel: bool,
+}
+
+fn _sparse_struct_dtype(colnames: &[&str], value_dtype: DataType) -> DataType {
+    DataType::Struct(vec![
+        Field::new(
+            PlSmallStr::from_static("col"),
+            _colname_enum_dtype(colnames),
+        ),
+        Field::new(PlSmallStr::from_static("value"), value_dtype),
+    ])
+}
+
+fn collapse_columns_sparse_output_type(
+    input_fields: &[Field],
+    _kwargs: CollapseColumnsSparseArgs,
+) -> PolarsResult<Field> {
+    let dtypes: Vec<&DataType> = input_fields.iter().map(|f| f.dtype()).collect();
+    let colnames: Vec<&str> = input_fields.iter().map(|f| f.name().as_str()).collect();
+    _ensure_unique_colnames(&colnames)?;
+    let inner: DataType = _sparse_struct_dtype(&colnames, _value_dtype(&dtypes)?);
+    Ok(Field::new(
+        PlSmallStr::from_static(""),
+        DataType::List(Box::new(inner)),
+    ))
+}
+
+/// Collapse into `(col, value)` pairs: the values go through the regular list collapse,
+/// and the column of each value is written with the same offsets, so the pairs line up.
+/// Every row shares a single Enum dictionary of the column names.
+#[polars_expr(output_type_func_with_kwargs=collapse_columns_sparse_output_type)]
+fn collapse_columns_sparse(
+    inputs: &[Series],
+    kwargs: CollapseColumnsSparseArgs,
+) -> PolarsResult<Series> {
+    let (dtype, physical, _) = _collapse_inputs(inputs, None)?;
+    let options = CollapseOptions {
+        is_null_sentinel: kwargs.is_null_sentinel,
+        shape: Shape::List,
+        unique: false,
+    };
+    let len: usize = inputs[0].len();
+
+    let (values, layout) = _collapse_typed(&physical, None, &dtype, len, options, true)?;
+    let Layout::List(offsets) = layout else {
+        unreachable!()
+    };
+
+    let arrays: Vec<&dyn Array> = physical.iter().map(|s| s.chunks()[0].as_ref()).collect();
+    let validities: Vec<Option<&Bitmap>> = _validities(&arrays);
+    let codes: Vec<u32> = _collapse_values(
+        &validities,
+        &offsets,
+        options.is_null_sentinel,
+        0,
+        |c, _| c as u32,
+    );
+
+    let n_values: usize = codes.len();
+    let cols: Series = _idx_to_colname_enum(
+        UInt32Chunked::from_vec(PlSmallStr::from_static("col"), codes).into_series(),
+        inputs,
+    )?;
+    let values: Series = unsafe {
+        Series::from_chunks_and_dtype_unchecked(
+            PlSmallStr::from_static("value"),
+            vec![values],
+            &dtype,
+        )
+    };
+    let pairs: Series =
+        StructChunked::from_series(PlSmallStr::EMPTY, n_values, [cols, values].iter())?
+            .into_series()
+            .rechunk();
+
+    let arr: ListArray<i64> = _list_array(pairs.chunks()[0].clone(), offsets);
+    let out_dtype: DataType = DataType::List(Box::new(pairs.dtype().clone()));
+    Ok(unsafe {
+        Series::from_chunks_and_dtype_unchecked(PlSmallStr::EMPTY, vec![arr.boxed()], &out_dtype)
+    })
+}
+
+fn unpivot_sparse_output_type(input_fields: &[Field]) -> PolarsResult<Field> {
+    let dtypes: Vec<&DataType> = input_fields.iter().map(|f| f.dtype()).collect();
+    let inner: DataType = DataType::Struct(vec![
+        Field::new(PlSmallStr::from_static("row_idx"), IDX_DTYPE),
+        Field::new(PlSmallStr::from_static("col_idx"), DataType::UInt32),
+        Field::new(PlSmallStr::from_static("value"), _value_dtype(&dtypes)?),
+    ]);
+    Ok(Field::new(PlSmallStr::from_static(""), inner))
+}
+
+/// Boolean cells only count when true: false values are masked out as nulls.
+fn _true_as_valid(s: &Series) -> PolarsResult<Series> {
+    let validity: Bitmap = bitmap_from_words(&true_words(s)?, s.len())?;
+    let arr: BooleanArray = s
+        .bool()?
+        .downcast_iter()
+        .next()
+        .unwrap()
+        .clone()
+        .with_validity(Some(validity));
+    Ok(BooleanChunked::with_chunk(s.name().clone(), arr).into_series())
+}
+
+/// Wide to long coordinates `(row_idx, col_idx, value)` of the non-null (or true) cells,
+/// in row-major order.
+///
+/// The validity bitmaps are counted once to size every output exactly, then the values
+/// are written by the list collapse and the coordinates with the same offsets, so the
+/// rows x columns frame is never materialized.
+#[polars_expr(output_type_func=unpivot_sparse_output_type)]
+fn unpivot_sparse(inputs: &[Series]) -> PolarsResult<Series> {
+    let (dtype, physical, _) = _collapse_inputs(inputs, None)?;
+    let physical: Vec<Series> = if dtype == DataType::Boolean {
+        physical
+            .iter()
+            .map(_true_as_valid)
+            .collect::<PolarsResult<_>>()?
+    } else {
+        physical
+    };
+    let options = CollapseOptions {
+        is_null_sentinel: false,
+        shape: Shape::List,
+        unique: false,
+    };
+    let len: usize = inputs[0].len();
+
+    let (values, layout) = _collapse_typed(&physical, None, &dtype, len, options, true)?;
+    let Layout::List(offsets) = layout else {
+        unreachable!()
+    };
+
+    let arrays: Vec<&dyn Array> = physical.iter().map(|s| s.chunks()[0].as_ref()).collect();
+    let validities: Vec<Option<&Bitmap>> = _validities(&arrays);
+    let col_idx: Vec<u32> = _collapse_values(&validities, &offsets, false, 0, |c, _| c as u32);
+
+    let n_cells: usize = col_idx.len();
+    let mut row_idx: Vec<IdxSize> = Vec::with_capacity(n_cells);
+    for (row, window) in offsets.windows(2).enumerate() {
+        row_idx.extend(std::iter::repeat(row as IdxSize).take((window[1] - window[0]) as usize));
     }
 
-    Ok(result_builder.finish().into_series())
+    let fields: [Series; 3] = [
+        IdxCa::from_vec(PlSmallStr::from_static("row_idx"), row_idx).into_series(),
+        UInt32Chunked::from_vec(PlSmallStr::from_static("col_idx"), col_idx).into_series(),
+        unsafe {
+            Series::from_chunks_and_dtype_unchecked(
+                PlSmallStr::from_static("value"),
+                vec![values],
+                &dtype,
+            )
+        },
+    ];
+    Ok(StructChunked::from_series(PlSmallStr::EMPTY, n_cells, fields.iter())?.into_series())
 }
@@ -1,31 +1,411 @@
-use polars::chunked_array::ops::{ChunkFull, ChunkSet};
+use crate::arg_minmax::{KernelValue, _is_better};
 use polars::prelude::*;
+use polars_arrow::array::BooleanArray;
+use polars_arrow::bitmap::{Bitmap, MutableBitmap};
+use polars_arrow::datatypes::ArrowDataType;
 use pyo3_polars::derive::polars_expr;
+use serde::Deserialize;
+use std::cmp::Ordering;
+use std::collections::BinaryHeap;
+use std::sync::Arc;
 
-fn _build_mask(len: usize, idx: usize) -> PolarsResult<Series> {
-    let mask: ChunkedArray<BooleanType> = BooleanChunked::full(PlSmallStr::EMPTY, false, len);
-    let mask: ChunkedArray<BooleanType> = mask.scatter_single([idx as u32], Some(true))?;
-    Ok(mask.into_series())
+#[derive(Deserialize)]
+struct IsMinMaxArgs {
+    keep: String,
 }
 
-#[polars_expr(output_type=Boolean)]
-fn is_max(inputs: &[Series]) -> PolarsResult<Series> {
-    let s = &inputs[0];
-    let len = s.len();
+impl IsMinMaxArgs {
+    fn keep_all(&self) -> PolarsResult<bool> {
+        match self.keep.as_str() {
+            "first" => Ok(false),
+            "all" => Ok(true),
+            other => polars_bail!(InvalidOperation: "invalid `keep`: {}", other),
+        }
+    }
+}
+
+#[derive(Deserialize)]
+struct IsTopKArgs {
+    k: usize,
+    descending: bool,
+}
+
+/// Something a single scan over the values can feed, one valid value at a time.
+trait Scan<T> {
+    fn push(&mut self, idx: u32, value: T);
+}
+
+/// Running best with every position that currently ties with it.
+struct BestPositions<T, const IS_MAX: bool> {
+    best: Option<T>,
+    positions: Vec<u32>,
+    keep_all: bool,
+}
+
+impl<T: KernelValue, const IS_MAX: bool> Scan<T> for BestPositions<T, IS_MAX> {
+    #[inline(always)]
+    fn push(&mut self, idx: u32, value: T) {
+        match self.best {
+            Some(best) if _is_better::<T, IS_MAX>(value, best) => {
+                self.best = Some(value);
+                self.positions.clear();
+                self.positions.push(idx);
+            }
+            Some(best) => {
+                if self.keep_all && value == best {
+                    self.positions.push(idx);
+                }
+            }
+            None => {
+                self.best = Some(value);
+                self.positions.push(idx);
+            }
+        }
+    }
+}
+
+/// Orders so the heap top is the worst kept entry: the smaller value when
+/// `DESCENDING`, the larger otherwise; on ties the later position.
+struct Ranked<T, const DESCENDING: bool>(T, u32);
+
+impl<T: PartialOrd, const DESCENDING: bool> Ord for Ranked<T, DESCENDING> {
+    fn cmp(&self, other: &Self) -> Ordering {
+        let ord: Ordering = self.0.partial_cmp(&other.0).unwrap_or(Ordering::Equal);
+        let ord: Ordering = if DESCENDING { ord.reverse() } else { ord };
+        ord.then(self.1.cmp(&other.1))
+    }
+}
+
+impl<T: PartialOrd, const DESCENDING: bool> PartialOrd for Ranked<T, DESCENDING> {
+    fn partial_cmp(&self, other: &Self) -> Option<Ordering> {
+        Some(self.cmp(other))
+    }
+}
+
+impl<T: PartialOrd, const DESCENDING: bool> PartialEq for Ranked<T, DESCENDING> {
+    fn eq(&self, other: &Self) -> bool {
+        self.cmp(other) == Ordering::Equal
+    }
+}
+
+impl<T: PartialOrd, const DESCENDING: bool> Eq for Ranked<T, DESCENDING> {}
+
+/// The k best positions in a bounded heap, so the scan is O(n log k) with no copy of the values.
+struct TopKPositions<T, const DESCENDING: bool> {
+    k: usize,
+    heap: BinaryHeap<Ranked<T, DESCENDING>>,
+}
+
+impl<T: KernelValue, const DESCENDING: bool> Scan<T> for TopKPositions<T, DESCENDING> {
+    #[inline(always)]
+    fn push(&mut self, idx: u32, value: T) {
+        let candidate: Ranked<T, DESCENDING> = Ranked(value, idx);
+        if self.heap.len() < self.k {
+            self.heap.push(candidate);
+        } else if let Some(mut worst) = self.heap.peek_mut() {
+            if candidate < *worst {
+                *worst = candidate;
+            }
+        }
+    }
+}
+
+/// Feed every non-null, non-NaN value of `ca` to `scan`, straight off the value buffers.
+fn _scan_numeric<P, S>(ca: &ChunkedArray<P>, scan: &mut S)
+where
+    P: PolarsNumericType,
+    P::Native: KernelValue,
+    S: Scan<P::Native>,
+{
+    let mut offset: u32 = 0;
+    for arr in ca.downcast_iter() {
+        let values: &[P::Native] = arr.values().as_slice();
+        match arr.validity().filter(|v| v.unset_bits() > 0) {
+            None => {
+                for (i, value) in values.iter().enumerate() {
+                    if !KernelValue::is_nan(*value) {
+                        scan.push(offset + i as u32, *value);
+                    }
+                }
+            }
+            Some(validity) => {
+                for (i, (value, valid)) in values.iter().zip(validity.iter()).enumerate() {
+                    if valid && !KernelValue::is_nan(*value) {
+                        scan.push(offset + i as u32, *value);
+                    }
+                }
+            }
+        }
+        offset += arr.len() as u32;
+    }
+}
+
+fn _scan_str<'a, S: Scan<&'a str>>(ca: &'a StringChunked, scan: &mut S) {
+    for (i, value) in ca.iter().enumerate() {
+        if let Some(value) = value {
+            scan.push(i as u32, value);
+        }
+    }
+}
+
+// No position yet, also terminates a tie chain
+const NONE: u32 = u32::MAX;
+
+/// Running best of every group at once. With `keep_all`, the positions tied with a
+/// group's best are chained through `next`, newest first, so ties cost no extra pass.
+struct GroupBestPositions<T, const IS_MAX: bool> {
+    group_ids: Arc<[u32]>,
+    best: Vec<T>,
+    head: Vec<u32>,
+    next: Vec<u32>,
+    keep_all: bool,
+}
+
+impl<T: KernelValue, const IS_MAX: bool> Scan<T> for GroupBestPositions<T, IS_MAX> {
+    #[inline(always)]
+    fn push(&mut self, idx: u32, value: T) {
+        let group: usize = self.group_ids[idx as usize] as usize;
+        let head: u32 = self.head[group];
 
-    match s.arg_max() {
-        Some(idx) => _build_mask(len, idx),
-        None => Ok(BooleanChunked::full(PlSmallStr::EMPTY, false, len).into_series()),
+        if head == NONE || _is_better::<T, IS_MAX>(value, self.best[group]) {
+            self.best[group] = value;
+            self.head[group] = idx;
+            if self.keep_all {
+                self.next[idx as usize] = NONE;
+            }
+        } else if self.keep_all && value == self.best[group] {
+            self.next[idx as usize] = head;
+            self.head[group] = idx;
+        }
     }
 }
 
+/// Builds the scan for whichever value type the dtype dispatch lands on.
+trait ScanFactory {
+    type Scan<T: KernelValue>: Scan<T>;
+
+    fn new_scan<T: KernelValue>(&self) -> Self::Scan<T>;
+
+    fn positions<T: KernelValue>(&self, scan: Self::Scan<T>) -> Vec<u32>;
+}
+
+/// Positions of the best value, or of every tie with it when `keep_all`.
+struct BestOf<const IS_MAX: bool> {
+    keep_all: bool,
+}
+
+impl<const IS_MAX: bool> ScanFactory for BestOf<IS_MAX> {
+    type Scan<T: KernelValue> = BestPositions<T, IS_MAX>;
+
+    fn new_scan<T: KernelValue>(&self) -> Self::Scan<T> {
+        BestPositions {
+            best: None,
+            positions: Vec::new(),
+            keep_all: self.keep_all,
+        }
+    }
+
+    fn positions<T: KernelValue>(&self, scan: Self::Scan<T>) -> Vec<u32> {
+        scan.positions
+    }
+}
+
+/// Positions of the k largest (`DESCENDING`) or smallest values; ties keep the earlier row.
+struct TopKOf<const DESCENDING: bool> {
+    k: usize,
+}
+
+impl<const DESCENDING: bool> ScanFactory for TopKOf<DESCENDING> {
+    type Scan<T: KernelValue> = TopKPositions<T, DESCENDING>;
+
+    fn new_scan<T: KernelValue>(&self) -> Self::Scan<T> {
+        TopKPositions {
+            k: self.k,
+            heap: BinaryHeap::with_capacity(self.k),
+        }
+    }
+
+    fn positions<T: KernelValue>(&self, scan: Self::Scan<T>) -> Vec<u32> {
+        scan.heap.into_iter().map(|ranked| ranked.1).collect()
+    }
+}
+
+/// Positions of the best value within each group of `group_ids`.
+struct GroupBestOf<const IS_MAX: bool> {
+    group_ids: Arc<[u32]>,
+    n_groups: usize,
+    keep_all: bool,
+}
+
+impl<const IS_MAX: bool> ScanFactory for GroupBestOf<IS_MAX> {
+    type Scan<T: KernelValue> = GroupBestPositions<T, IS_MAX>;
+
+    fn new_scan<T: KernelValue>(&self) -> Self::Scan<T> {
+        let next: Vec<u32> = if self.keep_all {
+            vec![NONE; self.group_ids.len()]
+        } else {
+            Vec::new()
+        };
+        GroupBestPositions {
+            group_ids: self.group_ids.clone(),
+            best: vec![T::default(); self.n_groups],
+            head: vec![NONE; self.n_groups],
+            next,
+            keep_all: self.keep_all,
+        }
+    }
+
+    fn positions<T: KernelValue>(&self, scan: Self::Scan<T>) -> Vec<u32> {
+        let mut positions: Vec<u32> = Vec::with_capacity(self.n_groups);
+        for head in scan.head {
+            let mut idx: u32 = head;
+            while idx != NONE {
+                positions.push(idx);
+                idx = if self.keep_all {
+                    scan.next[idx as usize]
+                } else {
+                    NONE
+                };
+            }
+        }
+        positions
+    }
+}
+
+/// Dense group id per row, from the same hash grouping `over` uses; nulls form their own group.
+fn _group_ids(by: &Series) -> PolarsResult<(Vec<u32>, usize)> {
+    let groups: GroupsType = by.group_tuples(true, false)?;
+    let mut group_ids: Vec<u32> = vec![0; by.len()];
+
+    match &groups {
+        GroupsType::Idx(idx) => {
+            for (group, (_, rows)) in idx.iter().enumerate() {
+                for row in rows.iter() {
+                    group_ids[*row as usize] = group as u32;
+                }
+            }
+        }
+        GroupsType::Slice { groups, .. } => {
+            for (group, [start, len]) in groups.iter().enumerate() {
+                group_ids[*start as usize..(*start + *len) as usize].fill(group as u32);
+            }
+        }
+    }
+
+    Ok((group_ids, groups.len()))
+}
+
+/// Run one scan over `s`, dispatching on its physical dtype once.
+fn _scan_positions<F: ScanFactory>(s: &Series, factory: &F) -> PolarsResult<Vec<u32>> {
+    // Temporal and decimal columns compare on their physical values
+    let s: Series = match s.dtype() {
+        DataType::Boolean => s.cast(&DataType::UInt8)?,
+        _ => s.to_physical_repr().into_owned(),
+    };
+
+    macro_rules! numeric {
+        ($accessor:ident, $rust_type:ty) => {{
+            let mut scan = factory.new_scan::<$rust_type>();
+            _scan_numeric(s.$accessor()?, &mut scan);
+            factory.positions(scan)
+        }};
+    }
+
+    let positions: Vec<u32> = match s.dtype() {
+        DataType::Float64 => numeric!(f64, f64),
+        DataType::Float32 => numeric!(f32, f32),
+        DataType::Int128 => numeric!(i128, i128),
+        DataType::Int64 => numeric!(i64, i64),
+        DataType::Int32 => numeric!(i32, i32),
+        DataType::Int16 => numeric!(i16, i16),
+        DataType::Int8 => numeric!(i8, i8),
+        DataType::UInt64 => numeric!(u64, u64),
+        DataType::UInt32 => numeric!(u32, u32),
+        DataType::UInt16 => numeric!(u16, u16),
+        DataType::UInt8 => numeric!(u8, u8),
+        DataType::String => {
+            let mut scan = factory.new_scan::<&str>();
+            _scan_str(s.str()?, &mut scan);
+            factory.positions(scan)
+        }
+        dtype => {
+            return Err(PolarsError::ComputeError(
+                format!("Unsupported dtype: {:?}", dtype).into(),
+            ))
+        }
+    };
+    Ok(positions)
+}
+
+/// Mask with the bits at `positions` set.
+fn _mask_from_positions(len: usize, positions: &[u32]) -> Series {
+    let mut mask: MutableBitmap = MutableBitmap::from_len_zeroed(len);
+    for idx in positions {
+        mask.set(*idx as usize, true);
+    }
+    let mask: Bitmap = mask.into();
+    let arr: BooleanArray = BooleanArray::new(ArrowDataType::Boolean, mask, None);
+    BooleanChunked::with_chunk(PlSmallStr::EMPTY, arr).into_series()
+}
+
+fn _scan_mask<F: ScanFactory>(s: &Series, factory: &F) -> PolarsResult<Series> {
+    let positions: Vec<u32> = _scan_positions(s, factory)?;
+    Ok(_mask_from_positions(s.len(), &positions))
+}
+
 #[polars_expr(output_type=Boolean)]
-fn is_min(inputs: &[Series]) -> PolarsResult<Series> {
-    let s = &inputs[0];
-    let len = s.len();
+fn is_max(inputs: &[Series], kwargs: IsMinMaxArgs) -> PolarsResult<Series> {
+    _scan_mask(
+        &inputs[0],
+        &BestOf::<true> {
+            keep_all: kwargs.keep_all()?,
+        },
+    )
+}
 
-    match s.arg_min() {
-        Some(idx) => _build_mask(len, idx),
-        None => Ok(BooleanChunked::full(PlSmallStr::EMPTY, false, len).into_series()),
+#[polars_expr(output_type=Boolean)]
+fn is_min(inputs: &[Series], kwargs: IsMinMaxArgs) -> PolarsResult<Series> {
+    _scan_mask(
+        &inputs[0],
+        &BestOf::<false> {
+            keep_all: kwargs.keep_all()?,
+        },
+    )
+}
+
+#[polars_expr(output_type=Boolean)]
+fn is_top_k(inputs: &[Series], kwargs: IsTopKArgs) -> PolarsResult<Series> {
+    polars_ensure!(kwargs.k > 0, ComputeError: "`k` must be at least 1");
+    let k: usize = kwargs.k;
+    if kwargs.descending {
+        _scan_mask(&inputs[0], &TopKOf::<true> { k })
+    } else {
+        _scan_mask(&inputs[0], &TopKOf::<false> { k })
     }
 }
+
+fn _is_best_by<const IS_MAX: bool>(inputs: &[Series], keep_all: bool) -> PolarsResult<Series> {
+    let (values, by) = (&inputs[0], &inputs[1]);
+    polars_ensure!(
+        values.len() == by.len(),
+        ShapeMismatch: "`by` must have the same length as the values, got {} and {}", by.len(), values.len()
+    );
+
+    let (group_ids, n_groups) = _group_ids(by)?;
+    let factory = GroupBestOf::<IS_MAX> {
+        group_ids: group_ids.into(),
+        n_groups,
+        keep_all,
+    };
+    _scan_mask(values, &factory)
+}
+
+#[polars_expr(output_type=Boolean)]
+fn is_max_by(inputs: &[Series], kwargs: IsMinMaxArgs) -> PolarsResult<Series> {
+    _is_best_by::<true>(inputs, kwargs.keep_all()?)
+}
+
+#[polars_expr(output_type=Boolean)]
+fn is_min_by(inputs: &[Series], kwargs: IsMinMaxArgs) -> PolarsResult<Series> {
+    _is_best_by::<false>(inputs, kwargs.keep_all()?)
+}
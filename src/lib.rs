@@ -2,14 +2,21 @@ mod collapse;
 mod arg_true;
 mod multi_index;
 mod arg_minmax;
+mod arg_top_k;
 mod is_minmax;
 mod arg_first_null;
+mod bitmap;
+mod spread;
+mod lookup_cache;
 use pyo3::prelude::*;
 use pyo3_polars::PolarsAllocator;
 
 #[pymodule]
 fn _internal(_py: Python, m: &Bound<PyModule>) -> PyResult<()> {
     m.add("__version__", env!("CARGO_PKG_VERSION"))?;
+    m.add_function(wrap_pyfunction!(lookup_cache::register_lookup, m)?)?;
+    m.add_function(wrap_pyfunction!(lookup_cache::unregister_lookup, m)?)?;
+    m.add_function(wrap_pyfunction!(lookup_cache::set_lookup_cache_size, m)?)?;
     Ok(())
 }
 
@@ -0,0 +1,145 @@
+use crate::multi_index::{EnumDict, _enum_rev_map};
+use polars::prelude::*;
+use pyo3::prelude::*;
+use pyo3_polars::error::PyPolarsErr;
+use pyo3_polars::PySeries;
+use std::sync::{Mutex, MutexGuard};
+
+// -- Process-wide cache of registered `multi_index` lookups
+
+/// Default memory cap of the cache, 1 GiB.
+const DEFAULT_MAX_BYTES: usize = 1 << 30;
+
+/// A lookup as the gathers want it: one contiguous chunk, plus its Enum dictionary
+/// once it has been decoded `as_enum`.
+#[derive(Clone)]
+pub(crate) struct PreparedLookup {
+    pub(crate) values: Series,
+    pub(crate) enum_dict: Option<EnumDict>,
+}
+
+struct Entry {
+    name: String,
+    lookup: PreparedLookup,
+    bytes: usize,
+}
+
+/// Least recently used entries first; there are few lookups, so a scan beats hashing.
+struct LookupCache {
+    entries: Vec<Entry>,
+    max_bytes: usize,
+}
+
+static CACHE: Mutex<LookupCache> = Mutex::new(LookupCache {
+    entries: Vec::new(),
+    max_bytes: DEFAULT_MAX_BYTES,
+});
+
+impl LookupCache {
+    fn total_bytes(&self) -> usize {
+        self.entries.iter().map(|entry| entry.bytes).sum()
+    }
+
+    fn position(&self, name: &str) -> Option<usize> {
+        self.entries.iter().position(|entry| entry.name == name)
+    }
+
+    fn evict(&mut self) {
+        while self.total_bytes() > self.max_bytes && !self.entries.is_empty() {
+            self.entries.remove(0);
+        }
+    }
+
+    fn insert(&mut self, name: String, lookup: Series) -> PolarsResult<()> {
+        let values: Series = lookup.rechunk();
+        let bytes: usize = values.estimated_size();
+        polars_ensure!(
+            bytes <= self.max_bytes,
+            ComputeError: "lookup '{}' ({} bytes) exceeds the lookup cache limit of {} bytes",
+            name, bytes, self.max_bytes
+        );
+        self.remove(&name);
+        self.entries.push(Entry {
+            name,
+            lookup: PreparedLookup {
+                values,
+                enum_dict: None,
+            },
+            bytes,
+        });
+        self.evict();
+        Ok(())
+    }
+
+    fn remove(&mut self, name: &str) -> bool {
+        match self.position(name) {
+            Some(pos) => {
+                self.entries.remove(pos);
+                true
+            }
+            None => false,
+        }
+    }
+
+    fn entry(&self, name: &str) -> PolarsResult<&Entry> {
+        match self.position(name) {
+            Some(pos) => Ok(&self.entries[pos]),
+            None => polars_bail!(ComputeError: "no lookup is registered as '{}'", name),
+        }
+    }
+
+    /// Fetch a lookup and mark it as most recently used.
+    fn get(&mut self, name: &str, as_enum: bool) -> PolarsResult<PreparedLookup> {
+        let Some(pos) = self.position(name) else {
+            polars_bail!(ComputeError: "no lookup is registered as '{}'", name);
+        };
+        let mut entry: Entry = self.entries.remove(pos);
+        if as_enum && entry.lookup.enum_dict.is_none() {
+            match _enum_rev_map(&entry.lookup.values) {
+                Ok(dict) => entry.lookup.enum_dict = Some(dict),
+                Err(err) => {
+                    self.entries.insert(pos, entry);
+                    return Err(err);
+                }
+            }
+        }
+        let lookup: PreparedLookup = entry.lookup.clone();
+        self.entries.push(entry);
+        Ok(lookup)
+    }
+}
+
+fn _cache() -> MutexGuard<'static, LookupCache> {
+    // A panic while holding the lock cannot leave the entries half written
+    CACHE
+        .lock()
+        .unwrap_or_else(|poisoned| poisoned.into_inner())
+}
+
+/// The dtype of a registered lookup, for planning; does not count as a use.
+pub(crate) fn registered_dtype(name: &str) -> PolarsResult<DataType> {
+    Ok(_cache().entry(name)?.lookup.values.dtype().clone())
+}
+
+/// A registered lookup, prepared for gathering (and decoding `as_enum`).
+pub(crate) fn registered_lookup(name: &str, as_enum: bool) -> PolarsResult<PreparedLookup> {
+    _cache().get(name, as_enum)
+}
+
+#[pyfunction]
+pub(crate) fn register_lookup(name: String, lookup: PySeries) -> PyResult<()> {
+    _cache().insert(name, lookup.0).map_err(PyPolarsErr::from)?;
+    Ok(())
+}
+
+#[pyfunction]
+pub(crate) fn unregister_lookup(name: &str) -> bool {
+    _cache().remove(name)
+}
+
+#[pyfunction]
+pub(crate) fn set_lookup_cache_size(max_bytes: usize) {
+    let mut cache: MutexGuard<'static, LookupCache> = _cache();
+    cache.max_bytes = max_bytes;
+    cache.evict();
+}
@@ -1,36 +1,239 @@
+use crate::lookup_cache::{registered_dtype, registered_lookup, PreparedLookup};
+use polars::datatypes::PlSmallStr;
 use polars::prelude::*;
+use polars_arrow::array::Utf8ViewArray;
 use pyo3_polars::derive::polars_expr;
+use serde::Deserialize;
+use std::sync::Arc;
 
-#[polars_expr(output_type=String)]
-fn multi_index(inputs: &[Series]) -> PolarsResult<Series> {
-    let idx_series: &Series = &inputs[0];
+#[derive(Deserialize)]
+struct MultiIndexArgs {
+    as_struct: bool,
+    check_bounds: bool,
+    null_on_oob: bool,
+    as_enum: bool,
+    /// Name of a registered lookup; when set, every input is an index column.
+    lookup_name: Option<String>,
+    /// The values of a Series lookup decoded `as_enum`, passed here instead of as an
+    /// input so the categories are known when planning; every input is an index column.
+    enum_categories: Option<Vec<String>>,
+}
 
-    let _lookup: &Series = &inputs[1];
-    let lookup: &ChunkedArray<StringType> = _lookup.str()?;
+/// The dictionary of an `as_enum` decode.
+pub(crate) type EnumDict = (Arc<RevMapping>, CategoricalOrdering);
 
-    let out: ChunkedArray<StringType> = match idx_series.dtype() {
-        DataType::UInt32 => {
-            let idx: &ChunkedArray<UInt32Type> = idx_series.u32()?;
-            lookup.take(idx)?
-        }
-        DataType::Int32 => {
-            // reinterpret as u32
-            let idx: &ChunkedArray<Int32Type> = idx_series.i32()?;
-            let idx_u32: UInt32Chunked = idx.cast(&DataType::UInt32)?.u32()?.clone();
-            lookup.take(&idx_u32)?
+/// What to do with indices outside of the lookup.
+#[derive(Clone, Copy, PartialEq)]
+enum Bounds {
+    /// No prepass; indices that do not fit `IdxSize` fail the cast, too large ones `take`.
+    Unchecked,
+    Raise,
+    Null,
+}
+
+impl MultiIndexArgs {
+    fn bounds(&self) -> Bounds {
+        if self.null_on_oob {
+            Bounds::Null
+        } else if self.check_bounds || self.as_enum {
+            // Enum codes have to be valid, so they are always checked
+            Bounds::Raise
+        } else {
+            Bounds::Unchecked
         }
-        DataType::Int64 => {
-            // Downcast to 32 (not sure if this is good or bad!)
-            let idx: &ChunkedArray<Int64Type> = idx_series.i64()?;
-            let idx_u32: UInt32Chunked = idx.cast(&DataType::UInt32)?.u32()?.clone();
-            lookup.take(&idx_u32)?
+    }
+
+    /// The lookup when it does not come as an input: a registered one, or the Enum
+    /// categories.
+    fn known_lookup(&self) -> PolarsResult<Option<PreparedLookup>> {
+        match (&self.lookup_name, &self.enum_categories) {
+            (Some(name), _) => Ok(Some(registered_lookup(name, self.as_enum)?)),
+            (None, Some(categories)) => {
+                let values: Series = Series::new(PlSmallStr::EMPTY, categories.as_slice());
+                let enum_dict: EnumDict = _enum_rev_map(&values)?;
+                Ok(Some(PreparedLookup {
+                    values,
+                    enum_dict: Some(enum_dict),
+                }))
+            }
+            (None, None) => Ok(None),
         }
-        dt => {
-            return Err(PolarsError::ComputeError(
-                format!("Unsupported index dtype: {:?}", dt).into(),
-            ))
+    }
+}
+
+fn multi_index_output_type(input_fields: &[Field], kwargs: MultiIndexArgs) -> PolarsResult<Field> {
+    let dtype: DataType = if kwargs.as_enum {
+        // The categories are the lookup values, so they have to be known when planning
+        let Some(PreparedLookup {
+            enum_dict: Some((rev_map, ordering)),
+            ..
+        }) = kwargs.known_lookup()?
+        else {
+            polars_bail!(
+                InvalidOperation: "`as_enum` requires a Series or registered lookup, \
+                the categories of an expression lookup are not known when planning"
+            );
+        };
+        DataType::Enum(Some(rev_map), ordering)
+    } else if let Some(name) = &kwargs.lookup_name {
+        registered_dtype(name)?
+    } else {
+        input_fields.last().unwrap().dtype().clone()
+    };
+    // An inline lookup is always the last input, after the (expanded) index columns
+    let idx_fields: &[Field] =
+        match kwargs.lookup_name.is_some() || kwargs.enum_categories.is_some() {
+            true => input_fields,
+            false => &input_fields[..input_fields.len() - 1],
+        };
+    if kwargs.as_struct {
+        let fields: Vec<Field> = idx_fields
+            .iter()
+            .map(|f| Field::new(f.name().clone(), dtype.clone()))
+            .collect();
+        return Ok(Field::new(
+            PlSmallStr::from_static(""),
+            DataType::Struct(fields),
+        ));
+    }
+    // Named after the index column, typed after the lookup
+    let field = Field::new(idx_fields[0].name().clone(), dtype);
+    Ok(field)
+}
+
+/// Bring an index column to gather indices.
+///
+/// The checked modes first find the min and max index (a vectorized pass, much cheaper
+/// than the gather), so in-range columns are cast straight to `IdxSize` without ever
+/// going through a narrower type; wide indices are never truncated.
+fn _gather_idx(idx_series: &Series, lookup_len: usize, bounds: Bounds) -> PolarsResult<IdxCa> {
+    let dtype: &DataType = idx_series.dtype();
+    if !dtype.is_integer() {
+        return Err(PolarsError::ComputeError(
+            format!("Unsupported index dtype: {:?}", dtype).into(),
+        ));
+    }
+    if bounds == Bounds::Unchecked {
+        let idx: IdxCa = match dtype {
+            DataType::UInt32 => idx_series.u32()?.clone(),
+            // Strict, so negative or too wide indices raise instead of reading as null
+            _ => idx_series
+                .strict_cast(&IDX_DTYPE)
+                .map_err(|_| {
+                    polars_err!(
+                        OutOfBounds: "multi_index: column '{}' holds negative or too large indices, \
+                        pass `null_on_oob` to read them as null",
+                        idx_series.name()
+                    )
+                })?
+                .idx()?
+                .clone(),
+        };
+        return Ok(idx);
+    }
+
+    let min: Option<i128> = idx_series.min::<i128>()?;
+    let max: Option<i128> = idx_series.max::<i128>()?;
+    let in_bounds: bool =
+        min.map_or(true, |min| min >= 0) && max.map_or(true, |max| max < lookup_len as i128);
+    if in_bounds {
+        return Ok(idx_series.cast(&IDX_DTYPE)?.idx()?.clone());
+    }
+
+    if bounds == Bounds::Raise {
+        let bad: i128 = match min {
+            Some(min) if min < 0 => min,
+            _ => max.unwrap(),
+        };
+        polars_bail!(
+            OutOfBounds: "multi_index: index {} of column '{}' is out of bounds for a lookup of length {}",
+            bad, idx_series.name(), lookup_len
+        );
+    }
+
+    // Out-of-range indices become null
+    let out_of_bounds: BooleanChunked = idx_series.lt(0)? | idx_series.gt_eq(lookup_len as u64)?;
+    let idx: IdxCa = idx_series.cast(&IDX_DTYPE)?.idx()?.clone();
+    idx.set(&out_of_bounds, None)
+}
+
+/// The lookup as an Enum dictionary: its string views become the categories as they
+/// are, so decoding is only a reinterpretation of the indices as codes.
+pub(crate) fn _enum_rev_map(lookup: &Series) -> PolarsResult<EnumDict> {
+    polars_ensure!(
+        lookup.dtype() == &DataType::String,
+        InvalidOperation: "`as_enum` requires a String lookup, got: {}", lookup.dtype()
+    );
+    polars_ensure!(
+        lookup.null_count() == 0 && lookup.n_unique()? == lookup.len(),
+        InvalidOperation: "`as_enum` requires the lookup values to be unique and non-null"
+    );
+    let categories: Utf8ViewArray = lookup.str()?.downcast_iter().next().unwrap().clone();
+    let DataType::Enum(Some(rev_map), ordering) = create_enum_dtype(categories) else {
+        unreachable!()
+    };
+    Ok((rev_map, ordering))
+}
+
+/// Gather from a lookup of any dtype; `take` dispatches on the physical type, so
+/// primitive, temporal, string and nested lookups all share one path.
+///
+/// Any number of index columns can be gathered in one call: the lookup is brought to
+/// a single contiguous chunk once (for strings, one view array) and every column
+/// gathers from it. Registered lookups are prepared once when registered, and their
+/// Enum dictionary on the first `as_enum` call (at the latest, when planning).
+#[polars_expr(output_type_func_with_kwargs=multi_index_output_type)]
+fn multi_index(inputs: &[Series], kwargs: MultiIndexArgs) -> PolarsResult<Series> {
+    let (prepared, idx_columns): (PreparedLookup, &[Series]) = match kwargs.known_lookup()? {
+        Some(prepared) => (prepared, inputs),
+        None => {
+            let Some((lookup, idx_columns)) = inputs.split_last() else {
+                polars_bail!(ComputeError: "multi_index requires an index column and a lookup");
+            };
+            let values: Series = lookup.rechunk();
+            let enum_dict: Option<EnumDict> = match kwargs.as_enum {
+                true => Some(_enum_rev_map(&values)?),
+                false => None,
+            };
+            (PreparedLookup { values, enum_dict }, idx_columns)
         }
     };
+    polars_ensure!(!idx_columns.is_empty(), ComputeError: "multi_index requires at least one index column");
+
+    let PreparedLookup {
+        values: lookup,
+        enum_dict: rev_map,
+    } = prepared;
+    let bounds: Bounds = kwargs.bounds();
+    let gathered: Vec<Series> = idx_columns
+        .iter()
+        .map(|idx_series| {
+            let idx: IdxCa = _gather_idx(idx_series, lookup.len(), bounds)?;
+            let out: Series = match &rev_map {
+                // In-range UInt32 indices are the codes already, without a copy
+                Some((rev_map, ordering)) => {
+                    let cats: UInt32Chunked = idx.cast(&DataType::UInt32)?.u32()?.clone();
+                    let out: CategoricalChunked = unsafe {
+                        CategoricalChunked::from_cats_and_rev_map_unchecked(
+                            cats,
+                            rev_map.clone(),
+                            true,
+                            *ordering,
+                        )
+                    };
+                    out.into_series()
+                }
+                None => lookup.take(&idx)?,
+            };
+            Ok(out.with_name(idx_series.name().clone()))
+        })
+        .collect::<PolarsResult<_>>()?;
 
-    Ok(out.into_series())
+    if kwargs.as_struct {
+        let len: usize = idx_columns[0].len();
+        return Ok(
+            StructChunked::from_series(PlSmallStr::EMPTY, len, gathered.iter())?.into_series(),
+        );
+    }
+    Ok(gathered.into_iter().next().unwrap())
 }
@@ -0,0 +1,126 @@
+use polars::datatypes::PlSmallStr;
+use polars::prelude::*;
+use polars_arrow::array::Array;
+use polars_arrow::bitmap::MutableBitmap;
+use pyo3_polars::derive::polars_expr;
+use serde::Deserialize;
+
+#[derive(Deserialize)]
+struct SpreadListArgs {
+    names: Vec<String>,
+}
+
+fn _inner_dtype(dtype: &DataType) -> PolarsResult<&DataType> {
+    match dtype {
+        DataType::List(inner) | DataType::Array(inner, _) => Ok(inner),
+        dt => {
+            polars_bail!(ComputeError: "spread_list requires a List or Array column, got: {}", dt)
+        }
+    }
+}
+
+fn spread_list_output_type(input_fields: &[Field], kwargs: SpreadListArgs) -> PolarsResult<Field> {
+    let inner: &DataType = _inner_dtype(input_fields[0].dtype())?;
+    let fields: Vec<Field> = kwargs
+        .names
+        .iter()
+        .map(|name| Field::new(name.as_str().into(), inner.clone()))
+        .collect();
+    Ok(Field::new(
+        PlSmallStr::from_static(""),
+        DataType::Struct(fields),
+    ))
+}
+
+/// Per-field gather indices into the child values; slot `i` of a row is null when
+/// the row is null or shorter than `i + 1`.
+struct FieldIndices {
+    idx: Vec<Vec<IdxSize>>,
+    validity: Vec<MutableBitmap>,
+}
+
+impl FieldIndices {
+    fn new(n: usize, len: usize) -> Self {
+        Self {
+            idx: (0..n).map(|_| Vec::with_capacity(len)).collect(),
+            validity: (0..n).map(|_| MutableBitmap::with_capacity(len)).collect(),
+        }
+    }
+
+    /// Record one row whose values start at `start` in the child and hold `row_len` items.
+    #[inline]
+    fn push_row(&mut self, start: usize, row_len: usize) {
+        for (field, (idx, validity)) in self
+            .idx
+            .iter_mut()
+            .zip(self.validity.iter_mut())
+            .enumerate()
+        {
+            let present: bool = field < row_len;
+            idx.push(if present {
+                (start + field) as IdxSize
+            } else {
+                0
+            });
+            validity.push(present);
+        }
+    }
+
+    fn gather(self, values: &Series, names: &[String]) -> PolarsResult<Vec<Series>> {
+        self.idx
+            .into_iter()
+            .zip(self.validity)
+            .zip(names)
+            .map(|((idx, validity), name)| {
+                let idx: IdxCa =
+                    IdxCa::from_vec_validity(PlSmallStr::EMPTY, idx, Some(validity.into()));
+                Ok(values.take(&idx)?.with_name(name.as_str().into()))
+            })
+            .collect()
+    }
+}
+
+#[polars_expr(output_type_func_with_kwargs=spread_list_output_type)]
+fn spread_list(inputs: &[Series], kwargs: SpreadListArgs) -> PolarsResult<Series> {
+    let s: Series = inputs[0].rechunk();
+    let len: usize = s.len();
+    let mut indices: FieldIndices = FieldIndices::new(kwargs.names.len(), len);
+
+    // A single pass over the offsets collects the gather indices of every field; short
+    // rows (the null-sentinel layout) simply leave their trailing fields null
+    let values: Series = match s.dtype() {
+        DataType::List(_) => {
+            let ca: &ListChunked = s.list()?;
+            if let Some(arr) = ca.downcast_iter().next() {
+                let offsets = arr.offsets().as_slice();
+                for row_idx in 0..len {
+                    let start: usize = offsets[row_idx] as usize;
+                    let row_len: usize = if arr.is_valid(row_idx) {
+                        offsets[row_idx + 1] as usize - start
+                    } else {
+                        0
+                    };
+                    indices.push_row(start, row_len);
+                }
+            }
+            ca.get_inner()
+        }
+        DataType::Array(_, width) => {
+            let width: usize = *width;
+            let ca: &ArrayChunked = s.array()?;
+            if let Some(arr) = ca.downcast_iter().next() {
+                for row_idx in 0..len {
+                    let row_len: usize = if arr.is_valid(row_idx) { width } else { 0 };
+                    indices.push_row(row_idx * width, row_len);
+                }
+            }
+            ca.get_inner()
+        }
+        dt => {
+            polars_bail!(ComputeError: "spread_list requires a List or Array column, got: {}", dt)
+        }
+    };
+
+    let fields: Vec<Series> = indices.gather(&values, &kwargs.names)?;
+    Ok(StructChunked::from_series(PlSmallStr::EMPTY, len, fields.iter())?.into_series())
+}
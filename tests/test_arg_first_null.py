@@ -68,6 +68,25 @@ def test_empty_dataframe():
     assert result == expected
 
 
+def test_word_boundaries_and_chunks():
+    """Rows straddling the 64-row blocks and multi-chunk inputs"""
+    n = 200
+    df = pl.DataFrame(
+        {
+            "a": [None if i % 3 == 0 else i for i in range(n)],
+            "b": [None if i % 5 == 0 else i for i in range(n)],
+            "c": [None if i % 7 == 0 else i for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(70), df.tail(n - 70)], rechunk=False)
+    result = df.select(arg_first_null_horizontal(pl.all())).to_series().to_list()
+
+    expected = []
+    for row in df.iter_rows():
+        expected.append(next((i for i, v in enumerate(row) if v is None), None))
+    assert result == expected
+
+
 ## -- Bench
 
 
@@ -1,5 +1,7 @@
 import pytest
 import polars as pl
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from pl_horizontal import arg_max_horizontal
 
 
@@ -243,6 +245,194 @@ def test_arg_max_mixed_types(colname: bool):
     assert result["arg_max"].to_list() == expected
 
 
+def test_arg_max_mixed_integer_widths():
+    """Integer widths are compared in their supertype without a cast."""
+    df = pl.DataFrame(
+        {
+            "a": pl.Series([1, -5, None], dtype=pl.Int8),
+            "b": pl.Series([2**40, 3, None], dtype=pl.Int64),
+            "c": pl.Series([2**63, 2, 7], dtype=pl.UInt64),
+            "d": pl.Series([0, 200, None], dtype=pl.UInt8),
+        }
+    )
+    result = df.select(arg_max_horizontal(pl.all())).to_series().to_list()
+    assert result == [2, 3, 2]
+
+
+@pytest.mark.parametrize(
+    ("values", "expected"),
+    [
+        ({"a": ["apple", "pear"], "b": ["banana", None]}, [1, 0]),
+        ({"a": [True, False], "b": [False, None]}, [0, 0]),
+        (
+            {
+                "a": pl.Series([date(2020, 1, 1), None], dtype=pl.Date),
+                "b": pl.Series([date(2021, 1, 1), date(2019, 1, 1)], dtype=pl.Date),
+            },
+            [1, 1],
+        ),
+        (
+            {
+                "a": pl.Series([timedelta(hours=1), timedelta(0)]),
+                "b": pl.Series([timedelta(minutes=5), timedelta(days=1)]),
+            },
+            [0, 1],
+        ),
+        (
+            {
+                "a": pl.Series([datetime(2020, 1, 1), datetime(2022, 1, 1)]),
+                "b": pl.Series([datetime(2021, 1, 1), None]),
+            },
+            [1, 0],
+        ),
+        (
+            {
+                "a": pl.Series([Decimal("1.50"), Decimal("-2.00")]),
+                "b": pl.Series([Decimal("1.25"), Decimal("3.00")]),
+            },
+            [0, 1],
+        ),
+    ],
+)
+def test_arg_max_dtypes(values: dict, expected: list[int]):
+    df = pl.DataFrame(values)
+    result = df.select(arg_max_horizontal(pl.all())).to_series().to_list()
+    assert result == expected
+
+
+def test_arg_max_colname_as_enum():
+    """Column names come back as an Enum of the input columns."""
+    df = pl.DataFrame({"a": [1, 5, 3], "b": [4, 2, 6], "c": [2, 8, 1]})
+
+    result = (
+        df.lazy()
+        .select(f=arg_max_horizontal(pl.all(), return_colname=True, as_enum=True))
+        .collect(engine="streaming")
+    )
+
+    assert result.schema["f"] == pl.Enum(["a", "b", "c"])
+    assert result["f"].cast(pl.String).to_list() == ["b", "c", "b"]
+
+    with pytest.raises(ValueError, match="requires `return_colname=True`"):
+        arg_max_horizontal(pl.all(), as_enum=True)
+
+
+def test_arg_max_colname_as_enum_duplicate_names():
+    """Names are the Enum categories, so a column passed twice cannot form one."""
+    df = pl.DataFrame({"a": [1, 5], "b": [4, 2]})
+    expr = arg_max_horizontal(
+        [pl.col("a"), pl.col("b"), pl.col("a")], return_colname=True, as_enum=True
+    )
+    with pytest.raises(
+        pl.exceptions.ComputeError, match="'a' is passed more than once"
+    ):
+        df.select(expr)
+
+
+def test_arg_max_matches_reference_across_chunks():
+    """Column-major kernel over multi-chunk inputs with scattered nulls."""
+    n = 300
+    df = pl.DataFrame(
+        {
+            "a": [None if i % 3 == 0 else (i * 7) % 11 for i in range(n)],
+            "b": [None if i % 4 == 0 else (i * 5) % 13 for i in range(n)],
+            "c": [None if i % 5 == 0 else (i * 3) % 7 for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(100), df.tail(n - 100)], rechunk=False)
+
+    result = df.select(arg_max_horizontal(pl.all())).to_series().to_list()
+
+    expected = []
+    for row in df.iter_rows():
+        valid = [(v, i) for i, v in enumerate(row) if v is not None]
+        if not valid:
+            expected.append(None)
+            continue
+        best = max(v for v, _ in valid)
+        expected.append(next(i for v, i in valid if v == best))
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    ("ties", "expected"),
+    [
+        ("first", [0, 1, None]),
+        ("last", [2, 2, None]),
+        ("all", [[0, 2], [1, 2], None]),
+    ],
+)
+def test_arg_max_ties_option(ties: str, expected: list):
+    df = pl.DataFrame(
+        {"a": [3, 1, None], "b": [1, 4, None], "c": [3, 4, None]},
+        schema={"a": pl.Int64, "b": pl.Int64, "c": pl.Int64},
+    )
+    result = df.select(arg_max_horizontal(pl.all(), ties=ties)).to_series()
+    assert result.to_list() == expected
+
+
+def test_arg_max_ties_all_colname_and_wide():
+    """Tied names come back as a list; ties spanning more than 64 columns."""
+    df = pl.DataFrame({f"c{i}": [i % 7, 1] for i in range(150)})
+
+    result = df.select(arg_max_horizontal(pl.all(), ties="all")).to_series()
+    assert result.dtype == pl.List(pl.UInt32)
+    assert result.to_list() == [
+        [i for i in range(150) if i % 7 == 6],
+        list(range(150)),
+    ]
+
+    names = df.select(
+        arg_max_horizontal(pl.all(), return_colname=True, ties="all")
+    ).to_series()
+    assert names.to_list()[0] == [f"c{i}" for i in range(150) if i % 7 == 6]
+
+    with pytest.raises(ValueError, match="ties='all'"):
+        arg_max_horizontal(pl.all(), return_colname=True, as_enum=True, ties="all")
+
+
+@pytest.mark.parametrize(
+    ("nan", "expected"),
+    [
+        ("ignore", [0, 0, None]),
+        ("propagate", [1, 0, 0]),
+        ("as_max", [1, 0, 0]),
+    ],
+)
+def test_arg_max_nan_policy(nan: str, expected: list):
+    df = pl.DataFrame(
+        {
+            "a": [2.0, 5.0, float("nan")],
+            "b": [float("nan"), None, float("nan")],
+            "c": [1.0, 3.0, None],
+        }
+    )
+    result = df.select(arg_max_horizontal(pl.all(), nan=nan)).to_series()
+    assert result.to_list() == expected
+
+
+def test_arg_max_nan_free_column_enables_fast_path():
+    """A null- and NaN-free float column marks every row seen; later NaNs are still ignored."""
+    n = 150
+    df = pl.DataFrame(
+        {
+            "a": [float(i % 3) for i in range(n)],
+            "b": [float("nan") if i % 2 else 10.0 for i in range(n)],
+            "c": [None if i % 5 else 20.0 for i in range(n)],
+        }
+    )
+    result = df.select(arg_max_horizontal(pl.all())).to_series().to_list()
+    expected = [2 if i % 5 == 0 else 0 if i % 2 else 1 for i in range(n)]
+    assert result == expected
+
+
+def test_arg_max_invalid_options():
+    with pytest.raises(ValueError, match="`ties`"):
+        arg_max_horizontal(pl.all(), ties="middle")
+    with pytest.raises(ValueError, match="`nan`"):
+        arg_max_horizontal(pl.all(), nan="as_min")
+
+
 def test_arg_max_bench(benchmark, df_ints):
     benchmark.group = "arg_star"
     benchmark(lambda: df_ints.select(arg_max_horizontal(pl.all())))
@@ -253,10 +443,47 @@ def test_arg_max_bench_colname(benchmark, df_ints):
     benchmark(lambda: df_ints.select(arg_max_horizontal(pl.all(), return_colname=True)))
 
 
+def test_arg_max_bench_colname_enum(benchmark, df_ints):
+    benchmark.group = "arg_star"
+    benchmark(
+        lambda: df_ints.select(
+            arg_max_horizontal(pl.all(), return_colname=True, as_enum=True)
+        )
+    )
+
+
 def test_arg_max_bench_old(benchmark, df_ints):
     benchmark.group = "arg_star"
     benchmark(lambda: df_ints.select(pl.concat_arr(pl.all()).arr.arg_max()))
 
 
+@pytest.fixture
+def df_floats(df_ints) -> pl.DataFrame:
+    # The first column is dense, so every later column takes the all-seen path
+    return df_ints.cast(pl.Float64).with_columns(pl.first().fill_null(0.0))
+
+
+def test_arg_max_bench_floats(benchmark, df_floats):
+    benchmark.group = "arg_star_floats"
+    benchmark(lambda: df_floats.select(arg_max_horizontal(pl.all())))
+
+
+def test_arg_max_bench_floats_no_fast_path(benchmark, df_floats):
+    """Same frame, but a NaN in the first column leaves the rows unseen."""
+    benchmark.group = "arg_star_floats"
+    df = df_floats.with_columns(
+        pl.when(pl.int_range(pl.len()) == 0)
+        .then(float("nan"))
+        .otherwise(pl.first())
+        .alias(df_floats.columns[0])
+    )
+    benchmark(lambda: df.select(arg_max_horizontal(pl.all())))
+
+
+def test_arg_max_bench_floats_old(benchmark, df_floats):
+    benchmark.group = "arg_star_floats"
+    benchmark(lambda: df_floats.select(pl.concat_arr(pl.all()).arr.arg_max()))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
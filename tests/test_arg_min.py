@@ -229,5 +229,82 @@ def test_arg_min_mixed_types(colname: bool):
     assert result["arg_min"].to_list() == expected
 
 
+def test_arg_min_colname_as_enum():
+    """Column names come back as an Enum of the input columns."""
+    df = pl.DataFrame({"a": [1, 5, 3], "b": [4, 2, 6], "c": [2, 8, 1]})
+
+    result = (
+        df.lazy()
+        .select(f=arg_min_horizontal(pl.all(), return_colname=True, as_enum=True))
+        .collect(engine="streaming")
+    )
+
+    assert result.schema["f"] == pl.Enum(["a", "b", "c"])
+    assert result["f"].cast(pl.String).to_list() == ["a", "b", "c"]
+
+    with pytest.raises(ValueError, match="requires `return_colname=True`"):
+        arg_min_horizontal(pl.all(), as_enum=True)
+
+
+def test_arg_min_matches_reference_across_chunks():
+    """Column-major kernel over multi-chunk inputs with scattered nulls."""
+    n = 300
+    df = pl.DataFrame(
+        {
+            "a": [None if i % 3 == 0 else (i * 7) % 11 for i in range(n)],
+            "b": [None if i % 4 == 0 else (i * 5) % 13 for i in range(n)],
+            "c": [None if i % 5 == 0 else (i * 3) % 7 for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(100), df.tail(n - 100)], rechunk=False)
+
+    result = df.select(arg_min_horizontal(pl.all())).to_series().to_list()
+
+    expected = []
+    for row in df.iter_rows():
+        valid = [(v, i) for i, v in enumerate(row) if v is not None]
+        if not valid:
+            expected.append(None)
+            continue
+        best = min(v for v, _ in valid)
+        expected.append(next(i for v, i in valid if v == best))
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    ("ties", "expected"),
+    [
+        ("first", [0, 0]),
+        ("last", [2, 1]),
+        ("all", [[0, 2], [0, 1]]),
+    ],
+)
+def test_arg_min_ties_option(ties: str, expected: list):
+    df = pl.DataFrame({"a": [1, 2], "b": [4, 2], "c": [1, 3]})
+    result = df.select(arg_min_horizontal(pl.all(), ties=ties)).to_series()
+    assert result.to_list() == expected
+
+
+@pytest.mark.parametrize(
+    ("nan", "expected"),
+    [
+        ("ignore", [2, None]),
+        ("propagate", [1, 0]),
+        # NaN is the largest value, so it only wins a row with nothing else
+        ("as_max", [2, 0]),
+    ],
+)
+def test_arg_min_nan_policy(nan: str, expected: list):
+    df = pl.DataFrame(
+        {
+            "a": [2.0, float("nan")],
+            "b": [float("nan"), None],
+            "c": [1.0, None],
+        }
+    )
+    result = df.select(arg_min_horizontal(pl.all(), nan=nan)).to_series()
+    assert result.to_list() == expected
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,121 @@
+import pytest
+import polars as pl
+from pl_horizontal import arg_max_horizontal, arg_top_k_horizontal
+
+
+@pytest.mark.parametrize("colname", [True, False])
+def test_arg_top_k_basic(colname: bool):
+    df = pl.DataFrame({"a": [1, 5, 3], "b": [4, 2, 6], "c": [2, 8, 1]})
+
+    # Row 0: [1, 4, 2] -> b, c
+    # Row 1: [5, 2, 8] -> c, a
+    # Row 2: [3, 6, 1] -> b, a
+    result = df.select(top=arg_top_k_horizontal(pl.all(), 2, return_colname=colname))
+
+    if colname:
+        expected = [["b", "c"], ["c", "a"], ["b", "a"]]
+        assert result.schema["top"] == pl.Array(pl.String, 2)
+    else:
+        expected = [[1, 2], [2, 0], [1, 0]]
+        assert result.schema["top"] == pl.Array(pl.UInt32, 2)
+    assert result["top"].to_list() == expected
+
+
+def test_arg_top_k_ascending():
+    df = pl.DataFrame({"a": [1, 5, 3], "b": [4, 2, 6], "c": [2, 8, 1]})
+    result = df.select(arg_top_k_horizontal(pl.all(), 2, descending=False))
+    assert result.to_series().to_list() == [[0, 2], [1, 0], [2, 0]]
+
+
+def test_arg_top_k_nulls_pad():
+    """Rows with fewer than k non-null values are padded with nulls."""
+    df = pl.DataFrame({"a": [1, None, None], "b": [None, 2, None], "c": [3, 3, None]})
+    result = df.select(arg_top_k_horizontal(pl.all(), 2))
+    assert result.to_series().to_list() == [[2, 0], [2, 1], [None, None]]
+
+
+def test_arg_top_k_ties_keep_first():
+    df = pl.DataFrame({"a": [5, 7], "b": [5, 7], "c": [5, 1]})
+    result = df.select(arg_top_k_horizontal(pl.all(), 2))
+    assert result.to_series().to_list() == [[0, 1], [0, 1]]
+
+
+def test_arg_top_k_matches_list_arg_sort():
+    n = 200
+    df = pl.DataFrame(
+        {
+            f"c{j}": [
+                None if (i + j) % 7 == 0 else (i * (j + 3)) % 17 for i in range(n)
+            ]
+            for j in range(6)
+        }
+    )
+    result = df.select(arg_top_k_horizontal(pl.all(), 3)).to_series().to_list()
+
+    expected = []
+    for row in df.iter_rows():
+        valid = sorted(
+            ((v, i) for i, v in enumerate(row) if v is not None),
+            key=lambda t: (-t[0], t[1]),
+        )
+        top = [i for _, i in valid[:3]]
+        expected.append(top + [None] * (3 - len(top)))
+    assert result == expected
+
+
+def test_arg_top_k_bool_and_str():
+    """Booleans rank true above false, strings lexicographically, like arg_max."""
+    df = pl.DataFrame({"a": [False, True], "b": [True, None], "c": [True, False]})
+    result = df.select(arg_top_k_horizontal(pl.all(), 2)).to_series()
+    assert result.to_list() == [[1, 2], [0, 2]]
+
+    df = pl.DataFrame(
+        {"a": ["pear", None], "b": ["apple", "fig"], "c": ["zoo", "date"]}
+    )
+    result = df.select(arg_top_k_horizontal(pl.all(), 2, descending=False)).to_series()
+    assert result.to_list() == [[1, 0], [2, 1]]
+    result = df.select(
+        arg_top_k_horizontal(pl.all(), 1, return_colname=True)
+    ).to_series()
+    assert result.to_list() == [["c"], ["b"]]
+
+
+def test_arg_top_k_nan_skipped():
+    """NaN is skipped like a null, as arg_max's default nan="ignore"; -0.0 ties 0.0."""
+    nan = float("nan")
+    df = pl.DataFrame(
+        {"a": [nan, -0.0, nan], "b": [1.0, nan, nan], "c": [0.0, 0.0, nan]}
+    )
+    result = df.select(arg_top_k_horizontal(pl.all(), 2)).to_series()
+    assert result.to_list() == [[1, 2], [0, 2], [None, None]]
+    result = df.select(arg_top_k_horizontal(pl.all(), 2, descending=False)).to_series()
+    assert result.to_list() == [[2, 1], [0, 2], [None, None]]
+
+    top = df.select(arg_top_k_horizontal(pl.all(), 1)).to_series().to_list()
+    arg_max = df.select(arg_max_horizontal(pl.all())).to_series().to_list()
+    assert [t[0] for t in top] == arg_max
+
+
+def test_arg_top_k_invalid_k():
+    with pytest.raises(ValueError, match="at least 1"):
+        arg_top_k_horizontal(pl.all(), 0)
+
+
+## -- Benchmarks
+def test_arg_top_k_bench(benchmark, df_ints):
+    benchmark.group = "arg_top_k"
+    benchmark(lambda: df_ints.select(arg_top_k_horizontal(pl.all(), 3)))
+
+
+def test_arg_top_k_bench_old(benchmark, df_ints):
+    benchmark.group = "arg_top_k"
+    expr = (
+        pl.concat_list(pl.all())
+        .list.eval(pl.element().arg_sort(descending=True, nulls_last=True))
+        .list.head(3)
+    )
+    benchmark(lambda: df_ints.select(expr))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
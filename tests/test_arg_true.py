@@ -1,6 +1,7 @@
 import polars as pl
 import pytest
 from pl_horizontal import arg_true_horizontal, arg_first_true_horizontal
+from pl_horizontal._expr_builders import build_arg_true_horizontal_first_known_col
 import numpy as np
 
 
@@ -99,6 +100,39 @@ def test_with_nulls(stop_on_first: bool, selector: pl.Expr):
     assert result.to_series().to_list() == expected
 
 
+def test_arg_true_numeric_and_chunks():
+    n = 150
+    df = pl.DataFrame(
+        {
+            "a": [i % 2 for i in range(n)],
+            "b": [None if i % 3 == 0 else i % 4 == 0 for i in range(n)],
+            "c": [i % 5 == 0 for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(64), df.tail(n - 64)], rechunk=False)
+    result = df.select(arg_true_horizontal(pl.all())).to_series().to_list()
+    expected = [[i for i, v in enumerate(row) if v] for row in df.iter_rows()]
+    assert result == expected
+
+
+def test_arg_first_true_null_semantics_match_when_then():
+    """The plugin and the when/then fallback must agree, nulls never count as a hit."""
+    n = 150
+    df = pl.DataFrame(
+        {
+            "a": [None if i % 2 == 0 else i % 7 == 0 for i in range(n)],
+            "b": [None if i % 3 == 0 else i % 5 == 0 for i in range(n)],
+            "c": [None if i % 4 == 0 else True for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(64), df.tail(n - 64)], rechunk=False)
+
+    dynamic = df.select(arg_first_true_horizontal(pl.all())).to_series()
+    static = df.select(arg_first_true_horizontal(df.columns)).to_series()
+
+    assert dynamic.to_list() == static.to_list()
+
+
 ## Benchmaks:
 # TODO: These should all be conf fixtures
 @pytest.fixture
@@ -146,11 +180,7 @@ def test_arg_first_true_bench_static(benchmark, df) -> None:
     """Benchmark for when columns are known at calltime; my function may fallback to this.."""
     benchmark.group = "arg_first_true"
 
-    # TODO: Insert the builder function here
-    col_iter = iter(df.columns)
-    exprs = pl.when(next(col_iter)).then(0)
-    for i, col in enumerate(col_iter, 1):
-        exprs = exprs.when(col).then(i)
+    exprs = build_arg_true_horizontal_first_known_col(df.columns)
 
     res = df.select(exprs.alias("col0"))
     mine = df.select(arg_first_true_horizontal(pl.all()))
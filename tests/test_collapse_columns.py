@@ -1,5 +1,5 @@
 import polars as pl
-from pl_horizontal import collapse_columns
+from pl_horizontal import collapse_columns, collapse_columns_sparse
 import pytest
 import itertools
 import polars.selectors as cs
@@ -116,10 +116,300 @@ def test_mixed_types(is_null_sentinel: bool):
         }
     )
 
-    with pytest.raises(pl.exceptions.ComputeError, match="is not a string column"):
+    with pytest.raises(pl.exceptions.ComputeError, match="same data type"):
         df.select(res=collapse_columns(pl.all(), is_null_sentinel=is_null_sentinel))
 
 
+@pytest.mark.parametrize("is_null_sentinel", [True, False])
+@pytest.mark.parametrize(
+    "dtype",
+    [
+        pl.Int8,
+        pl.Int64,
+        pl.UInt16,
+        pl.UInt64,
+        pl.Float32,
+        pl.Float64,
+        pl.Boolean,
+        pl.Date,
+        pl.Datetime("us"),
+        pl.Duration("ms"),
+        pl.Decimal(10, 2),
+    ],
+)
+def test_typed_dtypes(is_null_sentinel: bool, dtype: pl.DataType):
+    """Typed kernels keep the dtype, matching the concat_list reference."""
+    df = pl.DataFrame(
+        {
+            "c1": [1, None, 0, None],
+            "c2": [None, 1, 1, None],
+            "c3": [0, 1, None, None],
+        }
+    ).cast(dtype)
+    result = df.select(
+        res=collapse_columns(pl.all(), is_null_sentinel=is_null_sentinel)
+    )
+    if is_null_sentinel:
+        expected = df.select(
+            res=pl.concat_list(
+                [
+                    pl.when(
+                        pl.all_horizontal(
+                            pl.col(prev).is_not_null() for prev in df.columns[: i + 1]
+                        )
+                    ).then(pl.col(c))
+                    for i, c in enumerate(df.columns)
+                ]
+            ).list.drop_nulls()
+        )
+    else:
+        expected = df.select(res=pl.concat_list(pl.all()).list.drop_nulls())
+
+    assert result.schema["res"] == pl.List(dtype)
+    assert result.equals(expected)
+
+
+def test_mixed_integer_widths():
+    df = pl.DataFrame(
+        {"a": [1, None], "b": [-2, 3]}, schema={"a": pl.UInt8, "b": pl.Int32}
+    )
+    result = df.select(res=collapse_columns(pl.all(), is_null_sentinel=False))
+
+    assert result.schema["res"] == pl.List(pl.Int64)
+    assert result["res"].to_list() == [[1, -2], [3]]
+
+
+@pytest.mark.parametrize("as_enum", [True, False])
+def test_categorical(as_enum: bool):
+    with pl.StringCache():
+        df = pl.DataFrame(
+            {
+                "a": ["x", None, "z"],
+                "b": ["y", "y", None],
+            }
+        )
+        dtype = pl.Enum(["x", "y", "z"]) if as_enum else pl.Categorical
+        df = df.cast(dtype)
+        result = df.select(res=collapse_columns(pl.all(), is_null_sentinel=False))
+
+    assert result.schema["res"] == pl.List(dtype)
+    assert result["res"].to_list() == [["x", "y"], ["y"], ["z"]]
+
+
+@pytest.mark.parametrize("is_null_sentinel", [True, False])
+def test_word_boundaries_and_chunks(is_null_sentinel: bool):
+    """Rows straddling the 64-row words, multi-chunk inputs and column-less rows."""
+    n = 200
+    df = pl.DataFrame(
+        {
+            "a": [None if i % 9 == 0 else f"a{i}" for i in range(n)],
+            "b": [None if i % 4 == 0 else f"b{i}" for i in range(n)],
+            "c": [None if i % 3 == 0 else f"c{i}" for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(70), df.tail(n - 70)], rechunk=False)
+    result = df.select(
+        res=collapse_columns(pl.all(), is_null_sentinel=is_null_sentinel)
+    )["res"].to_list()
+
+    expected = []
+    for row in df.iter_rows():
+        if is_null_sentinel:
+            kept = []
+            for v in row:
+                if v is None:
+                    break
+                kept.append(v)
+        else:
+            kept = [v for v in row if v is not None]
+        expected.append(kept)
+    assert result == expected
+
+
+@pytest.mark.parametrize("is_null_sentinel", [True, False])
+def test_zero_copy_long_strings(is_null_sentinel: bool):
+    """Inline and buffer-backed strings from several columns, with and without copying."""
+    n = 100
+    df = pl.DataFrame(
+        {
+            "a": [None if i % 5 == 0 else "short" for i in range(n)],
+            "b": [
+                None if i % 3 == 0 else f"a much longer string number {i}"
+                for i in range(n)
+            ],
+            "c": [f"{i} " * 20 for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(30), df.tail(n - 30)], rechunk=False)
+
+    shared = df.select(
+        res=collapse_columns(
+            pl.all(), is_null_sentinel=is_null_sentinel, zero_copy=True
+        )
+    )
+    copied = df.select(
+        res=collapse_columns(pl.all(), is_null_sentinel=is_null_sentinel)
+    )
+
+    assert shared.equals(copied)
+    assert shared["res"].list.len().sum() > 0
+
+
+@pytest.mark.parametrize("is_null_sentinel", [True, False])
+@pytest.mark.parametrize("fill", [None, "-"])
+def test_to_array(is_null_sentinel: bool, fill: str | None):
+    df = pl.DataFrame(
+        {
+            "c1": ["a", None, "c", None],
+            "c2": ["b", "e", None, None],
+            "c3": ["long string past the inline size", "f", "g", None],
+        }
+    )
+    result = df.select(
+        res=collapse_columns(
+            pl.all(), is_null_sentinel=is_null_sentinel, to_array=2, fill=fill
+        )
+    )
+
+    if is_null_sentinel:
+        rows = [["a", "b"], [], ["c"], []]
+    else:
+        rows = [["a", "b"], ["e", "f"], ["c", "g"], []]
+    expected = [row + [fill] * (2 - len(row)) for row in rows]
+
+    assert result.schema["res"] == pl.Array(pl.String, 2)
+    assert result["res"].to_list() == expected
+
+
+def test_to_array_typed_and_wide():
+    """Typed fill, rows straddling 64-row words and early-stopping full rows."""
+    n = 150
+    df = pl.DataFrame(
+        {
+            f"c{j}": [None if (i + j) % 4 == 0 else i * 10 + j for i in range(n)]
+            for j in range(6)
+        }
+    )
+    result = df.select(
+        res=collapse_columns(pl.all(), is_null_sentinel=False, to_array=3, fill=-1)
+    )
+    expected = [
+        ([v for v in row if v is not None] + [-1] * 3)[:3] for row in df.iter_rows()
+    ]
+
+    assert result.schema["res"] == pl.Array(pl.Int64, 3)
+    assert result["res"].to_list() == expected
+
+    with pytest.raises(ValueError, match="requires `to_array`"):
+        collapse_columns(pl.all(), is_null_sentinel=False, fill=0)
+
+
+@pytest.mark.parametrize("is_null_sentinel", [True, False])
+@pytest.mark.parametrize("width", [3, 40])
+@pytest.mark.parametrize("dtype", [pl.String, pl.Int64, pl.Float64])
+def test_unique(is_null_sentinel: bool, width: int, dtype: pl.DataType):
+    """Linear (narrow) and hashed (wide) dedup agree with `list.unique` in first-seen order."""
+    n = 100
+    df = pl.DataFrame(
+        {
+            f"c{j}": [None if (i * j) % 11 == 5 else (i + j) % 4 for i in range(n)]
+            for j in range(width)
+        }
+    ).cast(dtype)
+
+    result = df.select(
+        res=collapse_columns(pl.all(), is_null_sentinel=is_null_sentinel, unique=True)
+    )
+    expected = df.select(
+        res=collapse_columns(pl.all(), is_null_sentinel=is_null_sentinel).list.unique(
+            maintain_order=True
+        )
+    )
+    assert result.equals(expected)
+
+
+def test_unique_to_array_and_floats():
+    df = pl.DataFrame(
+        {
+            "a": [0.0, float("nan"), 1.0],
+            "b": [-0.0, float("nan"), 1.0],
+            "c": [2.0, 3.0, 1.0],
+        }
+    )
+    result = df.select(
+        res=collapse_columns(pl.all(), is_null_sentinel=False, unique=True, to_array=2)
+    )["res"].to_list()
+
+    assert result[0] == [0.0, 2.0]
+    assert result[1][1] == 3.0
+    assert result[2] == [1.0, None]
+
+
+@pytest.mark.parametrize("is_null_sentinel", [True, False])
+def test_sparse(is_null_sentinel: bool):
+    df = pl.DataFrame(
+        {
+            "a": [1, None, 3, None],
+            "b": [2, None, None, None],
+            "c": [None, None, None, 6],
+        }
+    )
+    result = df.select(
+        res=collapse_columns_sparse(pl.all(), is_null_sentinel=is_null_sentinel)
+    )
+
+    colnames = pl.Enum(["a", "b", "c"])
+    assert result.schema["res"] == pl.List(
+        pl.Struct({"col": colnames, "value": pl.Int64})
+    )
+    if is_null_sentinel:
+        expected = [[("a", 1), ("b", 2)], [], [("a", 3)], []]
+    else:
+        expected = [[("a", 1), ("b", 2)], [], [("a", 3)], [("c", 6)]]
+    assert result["res"].to_list() == [
+        [{"col": col, "value": value} for col, value in row] for row in expected
+    ]
+
+
+def test_sparse_duplicate_names():
+    df = pl.DataFrame({"a": [1, None], "b": [2, 3]})
+    expr = collapse_columns_sparse([pl.col("a"), pl.col("b"), pl.col("a")])
+    with pytest.raises(
+        pl.exceptions.ComputeError, match="'a' is passed more than once"
+    ):
+        df.select(expr)
+
+
+def test_sparse_matches_collapse():
+    """The values of the pairs are exactly the regular collapse, across word boundaries."""
+    n = 200
+    df = pl.DataFrame(
+        {
+            "x": [None if i % 3 == 0 else f"x{i}" for i in range(n)],
+            "y": [None if i % 5 == 0 else f"a long string {i}" for i in range(n)],
+            "z": [None if i % 7 == 0 else f"z{i}" for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(64), df.tail(n - 64)], rechunk=False)
+    result = df.select(
+        sparse=collapse_columns_sparse(pl.all()),
+        dense=collapse_columns(pl.all(), is_null_sentinel=False),
+    )
+
+    exploded = result.select(
+        pl.col("sparse").list.eval(pl.element().struct.field("value"))
+    )
+    assert exploded["sparse"].to_list() == result["dense"].to_list()
+    expected_cols = [
+        [c for c in df.columns if row[c] is not None]
+        for row in df.iter_rows(named=True)
+    ]
+    cols = result.select(
+        pl.col("sparse").list.eval(pl.element().struct.field("col").cast(pl.String))
+    )
+    assert cols["sparse"].to_list() == expected_cols
+
+
 ## Benchmarks:
 @pytest.fixture
 def df() -> pl.DataFrame:
@@ -158,6 +448,49 @@ def test_collapse_columns_bench(df, benchmark) -> None:
     benchmark(lambda: df.select(collapse_columns(pl.all(), is_null_sentinel=True)))
 
 
+def test_collapse_columns_zero_copy_bench(df, benchmark) -> None:
+    benchmark.group = "collapse_columns"
+    benchmark(
+        lambda: df.select(
+            collapse_columns(pl.all(), is_null_sentinel=True, zero_copy=True)
+        )
+    )
+
+
+def test_collapse_columns_unique_bench(df, benchmark) -> None:
+    benchmark.group = "collapse_columns_unique"
+    benchmark(
+        lambda: df.select(
+            collapse_columns(pl.all(), is_null_sentinel=True, unique=True)
+        )
+    )
+
+
+def test_collapse_columns_unique_old_bench(df, benchmark) -> None:
+    benchmark.group = "collapse_columns_unique"
+    benchmark(
+        lambda: df.select(
+            collapse_columns(pl.all(), is_null_sentinel=True).list.unique()
+        )
+    )
+
+
+def test_collapse_columns_sparse_bench(df, benchmark) -> None:
+    benchmark.group = "collapse_columns_sparse"
+    benchmark(
+        lambda: df.select(collapse_columns_sparse(pl.all(), is_null_sentinel=True))
+    )
+
+
+def test_collapse_columns_sparse_old_bench(df, benchmark) -> None:
+    benchmark.group = "collapse_columns_sparse"
+    exprs = [
+        pl.when(pl.col(c).is_not_null()).then(pl.struct(col=pl.lit(c), value=pl.col(c)))
+        for c in df.columns
+    ]
+    benchmark(lambda: df.select(pl.concat_list(exprs).list.drop_nulls()))
+
+
 def test_collapse_columns_old_bench(df, benchmark) -> None:
     benchmark.group = "collapse_columns"
     benchmark(lambda: df.select(pl.concat_list(pl.all()).list.drop_nulls()))
@@ -1,6 +1,6 @@
 import pytest
 import polars as pl
-from pl_horizontal import is_max, is_min
+from pl_horizontal import is_max, is_max_by, is_min, is_min_by, is_top_k
 import polars.testing.parametric as ptp
 from hypothesis import given
 import polars.selectors as cs
@@ -135,6 +135,105 @@ def test_no_over_min() -> None:
     assert res.equals(exp)
 
 
+@pytest.mark.parametrize(
+    ("keep", "expected"),
+    [
+        ("first", [False, True, False, False, True, False]),
+        ("all", [False, True, True, False, True, True]),
+    ],
+)
+def test_keep_all_max(keep: str, expected: list[bool]) -> None:
+    df = pl.DataFrame(
+        {
+            "cola": ["a", "a", "a", "b", "b", "b"],
+            "colb": [1, 5, 5, None, 7, 7],
+        }
+    )
+    res = df.select(top=is_max(pl.col("colb"), keep=keep).over("cola"))
+
+    assert res["top"].to_list() == expected
+
+
+def test_keep_all_min_matches_broadcast() -> None:
+    """Same mask as the `== min().over()` workaround, without the broadcast column."""
+    df = pl.DataFrame(
+        {
+            "cola": ["a", "b", "a", "b", "a", "b", "c"],
+            "colb": [2.0, 1.0, 2.0, None, 3.0, 1.0, None],
+        }
+    )
+    res = df.select(top=is_min(pl.col("colb"), keep="all").over("cola"))
+    exp = df.select(
+        top=(pl.col("colb") == pl.col("colb").min().over("cola")).fill_null(False)
+    )
+
+    assert res.equals(exp)
+
+
+def test_keep_invalid() -> None:
+    with pytest.raises(ValueError, match="`keep`"):
+        is_max(pl.all(), keep="last")
+
+
+def test_is_top_k_over() -> None:
+    df = pl.DataFrame(
+        {
+            "cola": ["a", "a", "a", "a", "b", "b"],
+            "colb": [4, None, 9, 4, 1, 2],
+        }
+    )
+    res = df.select(top=is_top_k(pl.col("colb"), 2).over("cola"))
+    # ties keep the earlier row, groups smaller than k are marked whole
+    assert res["top"].to_list() == [True, False, True, False, True, True]
+
+    res = df.select(top=is_top_k(pl.col("colb"), 1, descending=False).over("cola"))
+    assert res["top"].to_list() == [True, False, False, False, True, False]
+
+
+@given(df=ptp.dataframes(min_cols=1, allowed_dtypes={pl.Int64, pl.Float64, pl.UInt32}))
+def test_is_top_k_hypothesis(df: pl.DataFrame) -> None:
+    df = df.select(cs.float().fill_nan(None))
+
+    res = df.select(is_top_k(pl.all(), 3))
+
+    for col in df.columns:
+        marked = df[col].filter(res[col]).sort(descending=True)
+        expected = df[col].drop_nulls().sort(descending=True).head(3)
+        assert marked.to_list() == expected.to_list()
+
+
+@pytest.mark.parametrize("keep", ["first", "all"])
+@pytest.mark.parametrize("func", ["max", "min"])
+def test_by_matches_over(keep: str, func: str) -> None:
+    n = 500
+    df = pl.DataFrame(
+        {
+            "g": [None if i % 11 == 0 else i % 7 for i in range(n)],
+            "v": [None if i % 5 == 0 else (i * 13) % 17 for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(200), df.tail(n - 200)], rechunk=False)
+
+    over_fn, by_fn = (is_max, is_max_by) if func == "max" else (is_min, is_min_by)
+    res = df.select(top=by_fn(pl.col("v"), "g", keep=keep))
+    exp = df.select(top=over_fn(pl.col("v"), keep=keep).over("g"))
+
+    assert res.equals(exp)
+
+
+def test_by_multiple_keys() -> None:
+    df = pl.DataFrame(
+        {
+            "a": ["x", "x", "x", "y"],
+            "b": [1, 1, 2, 1],
+            "v": [3, 4, 1, 0],
+        }
+    )
+    res = df.select(top=is_max_by(pl.col("v"), ["a", "b"]))
+
+    assert res["top"].to_list() == [False, True, True, True]
+
+
 ## -- Benchmarks
 def test_bench_is_max(benchmark, df_ints) -> None:
     benchmark.group = "is_minmax"
@@ -153,6 +252,27 @@ def test_bench_is_max_old(benchmark, df_ints) -> None:
     benchmark(lambda: df_ints.select(expr))
 
 
+def test_bench_is_max_all_over(benchmark, df_ints) -> None:
+    benchmark.group = "is_minmax_all"
+    benchmark(lambda: df_ints.select(is_max(pl.all(), keep="all").over("col1")))
+
+
+def test_bench_is_max_all_over_old(benchmark, df_ints) -> None:
+    benchmark.group = "is_minmax_all"
+    expr = (pl.all() == pl.all().max().over("col1")).fill_null(False)
+    assert df_ints.select(expr).equals(
+        df_ints.select(is_max(pl.all(), keep="all").over("col1"))
+    )
+    benchmark(lambda: df_ints.select(expr))
+
+
+def test_bench_is_max_by(benchmark, df_ints) -> None:
+    benchmark.group = "is_minmax"
+    ref = df_ints.select(is_max(pl.col("col0")).over("col1"))
+    assert df_ints.select(is_max_by(pl.col("col0"), "col1")).equals(ref)
+    benchmark(lambda: df_ints.select(is_max_by(pl.col("col0"), "col1")))
+
+
 def test_bench_is_max_over_old(benchmark, df_ints) -> None:
     benchmark.group = "is_minmax"
     exprs: tuple[pl.Expr, ...] = (
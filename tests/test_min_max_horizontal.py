@@ -0,0 +1,128 @@
+import pytest
+import polars as pl
+from datetime import date
+from pl_horizontal import (
+    arg_max_horizontal,
+    arg_min_horizontal,
+    max_with_arg_horizontal,
+    min_max_horizontal,
+    min_with_arg_horizontal,
+)
+
+
+def test_min_max_basic():
+    df = pl.DataFrame({"a": [1, 5, 3], "b": [4, 2, 6], "c": [2, 8, 1]})
+    result = df.select(f=min_max_horizontal(pl.all())).unnest("f")
+
+    assert result.columns == ["min", "max", "arg_min", "arg_max"]
+    assert result["min"].to_list() == [1, 2, 1]
+    assert result["max"].to_list() == [4, 8, 6]
+    assert result["arg_min"].to_list() == [0, 1, 2]
+    assert result["arg_max"].to_list() == [1, 2, 1]
+
+
+def test_min_max_matches_native():
+    n = 10_000
+    df = pl.DataFrame(
+        {
+            f"c{j}": [
+                None if (i + j) % 11 == 0 else (i * (j + 7)) % 23 for i in range(n)
+            ]
+            for j in range(5)
+        }
+    )
+    df = pl.concat([df.head(5_000), df.tail(5_000)], rechunk=False)
+
+    result = df.select(f=min_max_horizontal(pl.all())).unnest("f")
+    expected = df.select(
+        min=pl.min_horizontal(pl.all()),
+        max=pl.max_horizontal(pl.all()),
+        arg_min=arg_min_horizontal(pl.all()),
+        arg_max=arg_max_horizontal(pl.all()),
+    )
+    assert result.equals(expected)
+
+
+def test_min_max_subset_of_fields():
+    df = pl.DataFrame({"a": [1, None], "b": [3, None]})
+    result = df.select(f=min_max_horizontal(pl.all(), fields=["arg_max", "min"]))
+
+    assert result.schema["f"] == pl.Struct({"min": pl.Int64, "arg_max": pl.UInt32})
+    assert result["f"].to_list() == [
+        {"min": 1, "arg_max": 1},
+        {"min": None, "arg_max": None},
+    ]
+
+
+def test_min_max_keeps_logical_dtype():
+    df = pl.DataFrame(
+        {"a": [date(2020, 1, 1), date(2024, 1, 1)], "b": [date(2021, 1, 1), None]}
+    )
+    result = df.select(f=min_max_horizontal(pl.all(), fields=["min", "max"])).unnest(
+        "f"
+    )
+    assert result.schema == pl.Schema({"min": pl.Date, "max": pl.Date})
+    assert result["min"].to_list() == [date(2020, 1, 1), date(2024, 1, 1)]
+    assert result["max"].to_list() == [date(2021, 1, 1), date(2024, 1, 1)]
+
+
+@pytest.mark.parametrize(
+    ("fn", "native", "arg"),
+    [
+        (max_with_arg_horizontal, pl.max_horizontal, arg_max_horizontal),
+        (min_with_arg_horizontal, pl.min_horizontal, arg_min_horizontal),
+    ],
+)
+def test_value_with_arg(fn, native, arg):
+    df = pl.DataFrame(
+        {
+            "a": [1.5, None, 3.0, None],
+            "b": [2.5, 2.0, None, None],
+            "c": [0.5, 3.0, 1.0, None],
+        }
+    )
+    result = df.select(f=fn(pl.all())).unnest("f")
+    expected = df.select(value=native(pl.all()), index=arg(pl.all()))
+
+    assert result.schema == pl.Schema({"value": pl.Float64, "index": pl.UInt32})
+    assert result.equals(expected)
+
+
+def test_min_max_invalid_fields():
+    with pytest.raises(ValueError, match="non-empty subset"):
+        min_max_horizontal(pl.all(), fields=["median"])
+
+
+## -- Benchmarks
+def test_min_max_bench(benchmark, df_ints):
+    benchmark.group = "min_max"
+    benchmark(lambda: df_ints.select(min_max_horizontal(pl.all())))
+
+
+def test_min_max_bench_old(benchmark, df_ints):
+    benchmark.group = "min_max"
+    exprs = (
+        pl.min_horizontal(pl.all()).alias("min"),
+        pl.max_horizontal(pl.all()).alias("max"),
+        arg_min_horizontal(pl.all()).alias("arg_min"),
+        arg_max_horizontal(pl.all()).alias("arg_max"),
+    )
+    benchmark(lambda: df_ints.select(exprs))
+
+
+def test_max_with_arg_bench(benchmark, df_ints):
+    benchmark.group = "max_with_arg"
+    benchmark(lambda: df_ints.select(max_with_arg_horizontal(pl.all())))
+
+
+def test_max_with_arg_bench_old(benchmark, df_ints):
+    benchmark.group = "max_with_arg"
+    exprs = (
+        pl.max_horizontal(pl.all()).alias("value"),
+        arg_max_horizontal(pl.all()).alias("index"),
+    )
+    benchmark(lambda: df_ints.select(exprs))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,7 +1,12 @@
 import pytest
 import polars as pl
 
-from pl_horizontal import multi_index
+from pl_horizontal import (
+    multi_index,
+    register_lookup,
+    set_lookup_cache_size,
+    unregister_lookup,
+)
 import numpy as np
 import string
 import itertools
@@ -125,6 +130,260 @@ def test_multi_gather_simple(_args: tuple[pl.DataType, Context]) -> None:
     assert expected.equals(res)
 
 
+LOOKUPS = [
+    pl.Series([10, 20, 30], dtype=pl.Int64),
+    pl.Series([1.5, 2.5, 3.5], dtype=pl.Float32),
+    pl.Series([True, False, True]),
+    pl.Series(["2024-01-01", "2024-01-02", "2024-01-03"]).str.to_date(),
+    pl.Series([[1], [2, 2], []], dtype=pl.List(pl.Int8)),
+    pl.Series([{"a": 1}, {"a": 2}, {"a": 3}]),
+    pl.Series(["x", "y", "z"], dtype=pl.Enum(["z", "y", "x"])),
+]
+
+
+@pytest.mark.parametrize("lookup", LOOKUPS)
+@pytest.mark.parametrize("fn", CONTEXTS.values())
+def test_any_lookup_dtype(lookup: pl.Series, fn: Context):
+    df = pl.DataFrame({"idx": [2, None, 0]}, schema={"idx": pl.UInt32})
+    out = fn(df, multi_index(pl.col("idx"), lookup))
+
+    assert out.schema["idx"] == lookup.dtype
+    assert out.to_series().to_list() == [lookup[2], None, lookup[0]]
+
+
+@pytest.mark.parametrize("fn", CONTEXTS.values())
+def test_expression_lookup(fn: Context):
+    df = pl.DataFrame({"idx": [1, 0, 1, None], "dim": ["a", "b", "c", "d"]})
+
+    out = fn(df, multi_index(pl.col("idx"), pl.col("dim").head(2)))
+    assert out.to_series().to_list() == ["b", "a", "b", None]
+
+    out = fn(df, multi_index(pl.col("idx"), "dim"))
+    assert out.to_series().to_list() == ["b", "a", "b", None]
+
+
+@pytest.mark.parametrize("_args", args)
+def test_as_struct(_args: tuple[pl.DataType, Context]) -> None:
+    s = pl.Series(values=["hi", "how", "are", "you"])
+    df = pl.DataFrame({"foo": [0, 1, 2], "duchess": [None, 3, 0]})
+    df = pl.concat([df.head(1), df.tail(2)], rechunk=False)
+
+    dtype, fn = _args
+    expr = multi_index(pl.all().cast(dtype), s, as_struct=True).alias("out")
+    res = fn(df, expr)
+
+    assert res.schema["out"] == pl.Struct({"foo": pl.String, "duchess": pl.String})
+    expected = pl.DataFrame(
+        {"foo": ["hi", "how", "are"], "duchess": [None, "you", "hi"]}
+    )
+    assert res.unnest("out").equals(expected)
+
+
+INT_DTYPES = [
+    pl.Int8,
+    pl.Int16,
+    pl.Int32,
+    pl.Int64,
+    pl.UInt8,
+    pl.UInt16,
+    pl.UInt32,
+    pl.UInt64,
+]
+
+
+@pytest.mark.parametrize("dtype", INT_DTYPES)
+@pytest.mark.parametrize("fn", CONTEXTS.values())
+def test_check_bounds_in_range(dtype: pl.DataType, fn: Context):
+    df = pl.DataFrame({"idx": [2, None, 0]}, schema={"idx": dtype})
+    ser = pl.Series(["a", "b", "c"])
+    out = fn(df, multi_index(pl.col("idx"), ser, check_bounds=True))
+    assert out.to_series().to_list() == ["c", None, "a"]
+
+
+@pytest.mark.parametrize("bad", [-1, 3, 2**32 + 1, 2**63 - 1])
+@pytest.mark.parametrize("fn", CONTEXTS.values())
+def test_check_bounds_raises(bad: int, fn: Context):
+    df = pl.DataFrame({"idx": [0, bad, 1]}, schema={"idx": pl.Int64})
+    ser = pl.Series(["a", "b", "c"])
+    with pytest.raises(
+        pl.exceptions.ComputeError, match=f"index {bad} of column 'idx'"
+    ):
+        fn(df, multi_index(pl.col("idx"), ser, check_bounds=True))
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        ({}, None),
+        ({"check_bounds": True}, None),
+        ({"null_on_oob": True}, ["b", None]),
+        ({"as_enum": True}, None),
+        ({"as_enum": True, "null_on_oob": True}, ["b", None]),
+    ],
+)
+@pytest.mark.parametrize("dtype", [pl.Int64, pl.UInt64])
+@pytest.mark.parametrize("fn", CONTEXTS.values())
+def test_index_above_u32_every_mode(
+    mode: dict, expected: list | None, dtype: pl.DataType, fn: Context
+):
+    """2**32 + 1 would wrap onto row 1 if it went through UInt32; it never does."""
+    df = pl.DataFrame({"idx": [1, 2**32 + 1]}, schema={"idx": dtype})
+    ser = pl.Series(["a", "b", "c"])
+    expr = multi_index(pl.col("idx"), ser, **mode)
+    if expected is None:
+        with pytest.raises(pl.exceptions.ComputeError, match="column 'idx'"):
+            fn(df, expr)
+    else:
+        assert fn(df, expr).to_series().to_list() == expected
+
+
+@pytest.mark.parametrize("fn", CONTEXTS.values())
+def test_unchecked_negative_raises(fn: Context):
+    df = pl.DataFrame({"idx": [0, -1]})
+    ser = pl.Series(["a", "b"])
+    with pytest.raises(pl.exceptions.ComputeError, match="null_on_oob"):
+        fn(df, multi_index(pl.col("idx"), ser))
+
+
+@pytest.mark.parametrize("dtype", [pl.Int64, pl.UInt64])
+@pytest.mark.parametrize("fn", CONTEXTS.values())
+def test_null_on_oob(dtype: pl.DataType, fn: Context):
+    """Wide indices map to null, they do not wrap around into the lookup."""
+    df = pl.DataFrame({"idx": [0, 3, None, 2**32 + 1, 2]}, schema={"idx": dtype})
+    ser = pl.Series(["a", "b", "c"])
+    out = fn(df, multi_index(pl.col("idx"), ser, null_on_oob=True))
+    assert out.to_series().to_list() == ["a", None, None, None, "c"]
+
+
+@pytest.mark.parametrize("_args", args)
+def test_as_enum(_args: tuple[pl.DataType, Context]):
+    df = pl.DataFrame({"idx": [2, None, 0, 2], "other": [1, 1, 1, 0]})
+    ser = pl.Series(["alpha", "beta", "gamma"])
+    dtype, fn = _args
+    out = fn(df, multi_index(pl.all().cast(dtype), ser, as_enum=True))
+
+    assert out.schema == {"idx": pl.Enum(ser), "other": pl.Enum(ser)}
+    assert out["idx"].to_list() == ["gamma", None, "alpha", "gamma"]
+    assert out["other"].to_physical().to_list() == [1, 1, 1, 0]
+
+
+def test_as_enum_struct_and_oob():
+    df = pl.DataFrame({"a": [0, 5], "b": [1, 1]})
+    ser = pl.Series(["x", "y"])
+    out = df.select(
+        multi_index(
+            pl.all(), ser, as_struct=True, as_enum=True, null_on_oob=True
+        ).struct.unnest()
+    )
+    assert out.rows() == [("x", "y"), (None, "y")]
+
+    with pytest.raises(pl.exceptions.ComputeError, match="index 5 of column 'a'"):
+        df.select(multi_index(pl.col("a"), ser, as_enum=True))
+
+
+@pytest.mark.parametrize(
+    "lookup", [pl.Series(["x", "x"]), pl.Series(["x", None]), pl.Series([1, 2])]
+)
+def test_as_enum_invalid_lookup(lookup: pl.Series):
+    df = pl.DataFrame({"idx": [0, 1]})
+    with pytest.raises(ValueError, match="as_enum"):
+        df.select(multi_index(pl.col("idx"), lookup, as_enum=True))
+
+
+def test_as_enum_expression_lookup_raises():
+    df = pl.DataFrame({"idx": [0, 1], "dim": ["x", "y"]})
+    with pytest.raises(ValueError, match="not known when planning"):
+        df.select(multi_index(pl.col("idx"), pl.col("dim"), as_enum=True))
+
+
+@pytest.mark.parametrize("as_struct", [True, False])
+def test_as_enum_planned_schema(as_struct: bool):
+    """The planned Enum carries the lookup's categories, same as the collected frame."""
+    ser = pl.Series(["alpha", "beta", "gamma"])
+    lf = pl.LazyFrame(
+        {"a": [2, 0], "b": [1, 1]}, schema={"a": pl.UInt32, "b": pl.Int64}
+    )
+    lf = lf.select(multi_index(pl.all(), ser, as_struct=as_struct, as_enum=True))
+
+    planned = lf.collect_schema()
+    collected = lf.collect()
+    assert planned == collected.schema
+    dtype = planned["a"].fields[0].dtype if as_struct else planned["a"]
+    assert dtype == pl.Enum(ser)
+
+    if not as_struct:
+        # Comparing to a category is resolved against the planned dtype
+        out = lf.select(pl.col("a") == "gamma").collect()
+        assert out["a"].to_list() == [True, False]
+
+
+@pytest.mark.parametrize("_args", args)
+def test_registered_lookup(_args: tuple[pl.DataType, Context]):
+    register_lookup("test_words", pl.Series(["alpha", "beta", "gamma"]))
+    df = pl.DataFrame({"a": [2, None, 0], "b": [1, 1, 0]})
+    dtype, fn = _args
+    try:
+        out = fn(df, multi_index(pl.all().cast(dtype), lookup_name="test_words"))
+        assert out.rows() == [("gamma", "beta"), (None, "beta"), ("alpha", "alpha")]
+
+        out = fn(
+            df,
+            multi_index(
+                pl.col("b").cast(dtype), lookup_name="test_words", as_enum=True
+            ),
+        )
+        assert out.schema["b"] == pl.Enum(["alpha", "beta", "gamma"])
+        assert out["b"].to_list() == ["beta", "beta", "alpha"]
+
+        # Registering again replaces the lookup
+        register_lookup("test_words", pl.Series([10, 20, 30]))
+        out = fn(df, multi_index(pl.col("b").cast(dtype), lookup_name="test_words"))
+        assert out["b"].to_list() == [20, 20, 10]
+    finally:
+        assert unregister_lookup("test_words")
+
+    with pytest.raises(pl.exceptions.ComputeError, match="no lookup is registered"):
+        fn(df, multi_index(pl.col("a"), lookup_name="test_words"))
+
+
+def test_lookup_and_lookup_name_are_exclusive():
+    with pytest.raises(ValueError, match="exactly one"):
+        multi_index(pl.col("idx"))
+    with pytest.raises(ValueError, match="exactly one"):
+        multi_index(pl.col("idx"), "dim", lookup_name="dim")
+
+
+def test_lookup_cache_eviction():
+    big = pl.Series(range(1_000), dtype=pl.Int64)
+    size = int(big.estimated_size())
+    df = pl.DataFrame({"idx": [1]})
+    try:
+        set_lookup_cache_size(2 * size)
+        register_lookup("test_first", big)
+        register_lookup("test_second", big)
+        # Using the first makes the second the least recently used
+        df.select(multi_index(pl.col("idx"), lookup_name="test_first"))
+        register_lookup("test_third", big)
+
+        assert (
+            df.select(multi_index(pl.col("idx"), lookup_name="test_first")).item() == 1
+        )
+        assert (
+            df.select(multi_index(pl.col("idx"), lookup_name="test_third")).item() == 1
+        )
+        with pytest.raises(pl.exceptions.ComputeError, match="test_second"):
+            df.select(multi_index(pl.col("idx"), lookup_name="test_second"))
+
+        with pytest.raises(
+            pl.exceptions.ComputeError, match="exceeds the lookup cache limit"
+        ):
+            register_lookup("test_huge", pl.Series(range(10_000), dtype=pl.Int64))
+    finally:
+        set_lookup_cache_size(2**30)
+        for name in ("test_first", "test_second", "test_third"):
+            unregister_lookup(name)
+
+
 ## Benchmarks:
 @pytest.fixture
 def df() -> tuple[pl.DataFrame, pl.Series]:
@@ -162,6 +421,50 @@ def test_multi_index_bench(df, benchmark) -> None:
     benchmark(lambda: data.select(multi_index(pl.all(), ser)))
 
 
+def test_multi_index_struct_bench(df, benchmark) -> None:
+    benchmark.group = "multi_index"
+    data, ser = df
+    data = data.select(pl.all().cast(pl.UInt32))
+
+    benchmark(lambda: data.select(multi_index(pl.all(), ser, as_struct=True)))
+
+
+def test_multi_index_check_bounds_bench(df, benchmark) -> None:
+    benchmark.group = "multi_index"
+    data, ser = df
+    data = data.select(pl.all().cast(pl.Int64))
+
+    benchmark(lambda: data.select(multi_index(pl.all(), ser, check_bounds=True)))
+
+
+def test_multi_index_enum_bench(df, benchmark) -> None:
+    benchmark.group = "multi_index_enum"
+    data, _ = df
+    data = data.select(pl.all().cast(pl.UInt32))
+    ser = pl.Series([f"value{i}" for i in range(1_000)])
+
+    benchmark(lambda: data.select(multi_index(pl.all(), ser, as_enum=True)))
+
+
+def test_multi_index_enum_bench_old(df, benchmark) -> None:
+    benchmark.group = "multi_index_enum"
+    data, _ = df
+    data = data.select(pl.all().cast(pl.UInt32))
+    ser = pl.Series([f"value{i}" for i in range(1_000)])
+
+    benchmark(lambda: data.select(multi_index(pl.all(), ser).cast(pl.Enum(ser))))
+
+
+def test_multi_index_registered_bench(df, benchmark) -> None:
+    benchmark.group = "multi_index"
+    data, ser = df
+    data = data.select(pl.all().cast(pl.UInt32))
+    register_lookup("bench", ser)
+
+    benchmark(lambda: data.select(multi_index(pl.all(), lookup_name="bench")))
+    unregister_lookup("bench")
+
+
 def test_multi_index_bench_old(df, benchmark) -> None:
     benchmark.group = "multi_index"
     data, ser = df
@@ -0,0 +1,89 @@
+import polars as pl
+import pytest
+from pl_horizontal import collapse_columns, spread_list
+
+
+CONTEXTS = {
+    "ldf_stream": lambda df, expr: df.lazy().select(expr).collect(engine="streaming"),
+    "ldf_eager": lambda df, expr: df.lazy().select(expr).collect(engine="in-memory"),
+    "eager": lambda df, expr: df.select(expr),
+}
+
+
+@pytest.mark.parametrize("context", CONTEXTS.values())
+def test_basic(context):
+    df = pl.DataFrame({"a": [["x", "y", "z"], ["w"], [], None]})
+    result = context(df, spread_list(pl.col("a"), 2)).unnest("a")
+
+    assert result.columns == ["field_0", "field_1"]
+    assert result["field_0"].to_list() == ["x", "w", None, None]
+    assert result["field_1"].to_list() == ["y", None, None, None]
+
+
+def test_names_and_dtype():
+    df = pl.DataFrame({"a": [[1, 2], [3]]}, schema={"a": pl.List(pl.Int16)})
+    result = df.select(spread_list(pl.col("a"), 3, names=["p", "q", "r"])).unnest("a")
+
+    assert result.schema == pl.Schema({"p": pl.Int16, "q": pl.Int16, "r": pl.Int16})
+    assert result.rows() == [(1, 2, None), (3, None, None)]
+
+    with pytest.raises(ValueError, match="3 names"):
+        spread_list(pl.col("a"), 3, names=["p"])
+
+
+def test_array_input():
+    df = pl.DataFrame(
+        {"a": [[1, 2], None, [5, 6]]}, schema={"a": pl.Array(pl.Int64, 2)}
+    )
+    result = df.select(spread_list(pl.col("a"), 2)).unnest("a")
+
+    assert result.rows() == [(1, 2), (None, None), (5, 6)]
+
+
+@pytest.mark.parametrize("is_null_sentinel", [True, False])
+def test_round_trip_null_sentinel(is_null_sentinel: bool):
+    """Collapsing a null-sentinel frame and spreading it back is the identity."""
+    n = 150
+    df = pl.DataFrame(
+        {
+            "a": [f"a{i}" if i % 7 else None for i in range(n)],
+            "b": [f"b{i}" if i % 3 and i % 7 else None for i in range(n)],
+            "c": [f"c{i}" if i % 2 and i % 3 and i % 7 else None for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(70), df.tail(n - 70)], rechunk=False)
+    result = df.select(
+        spread_list(
+            collapse_columns(pl.all(), is_null_sentinel=is_null_sentinel),
+            3,
+            names=df.columns,
+        ).alias("s")
+    ).unnest("s")
+
+    assert result.equals(df)
+
+
+## -- Benchmarks
+@pytest.fixture
+def df_lists(df_ints) -> pl.DataFrame:
+    return df_ints.select(a=collapse_columns(pl.all(), is_null_sentinel=False))
+
+
+def test_spread_list_bench(benchmark, df_lists):
+    benchmark.group = "spread_list"
+    benchmark(lambda: df_lists.select(spread_list(pl.col("a"), 20)))
+
+
+def test_spread_list_bench_old(benchmark, df_lists):
+    benchmark.group = "spread_list"
+    exprs = [
+        pl.col("a").list.get(i, null_on_oob=True).alias(f"field_{i}") for i in range(20)
+    ]
+    assert df_lists.select(exprs).equals(
+        df_lists.select(spread_list(pl.col("a"), 20)).unnest("a")
+    )
+    benchmark(lambda: df_lists.select(exprs))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
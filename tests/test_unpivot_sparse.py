@@ -0,0 +1,114 @@
+import polars as pl
+import pytest
+import numpy as np
+from pl_horizontal import unpivot_sparse, _unpivot_sparse_expr
+
+
+def _expected(df: pl.DataFrame) -> list[tuple]:
+    return [
+        (row_idx, col_idx, value)
+        for row_idx, row in enumerate(df.iter_rows())
+        for col_idx, value in enumerate(row)
+        if value is not None and value is not False
+    ]
+
+
+def test_basic():
+    df = pl.DataFrame(
+        {
+            "a": [1, None, 3],
+            "b": [None, None, 5],
+            "c": [7, None, None],
+        }
+    )
+    result = unpivot_sparse(df)
+
+    assert result.columns == ["row_idx", "col_idx", "value"]
+    assert result.schema["value"] == pl.Int64
+    assert result.rows() == [(0, 0, 1), (0, 2, 7), (2, 0, 3), (2, 1, 5)]
+
+
+def test_bool_keeps_true_cells():
+    df = pl.DataFrame(
+        {
+            "a": [True, False, None],
+            "b": [None, True, True],
+        }
+    )
+    result = unpivot_sparse(df)
+    assert result.rows() == [(0, 0, True), (1, 1, True), (2, 1, True)]
+
+
+def test_strings_lazy_and_selection():
+    n = 200
+    df = pl.DataFrame(
+        {
+            "x": [None if i % 3 == 0 else f"x{i}" for i in range(n)],
+            "skip": list(range(n)),
+            "y": [None if i % 5 == 0 else f"a long string {i}" for i in range(n)],
+        }
+    )
+    df = pl.concat([df.head(64), df.tail(n - 64)], rechunk=False)
+    result = unpivot_sparse(df.lazy(), pl.col("x", "y")).collect()
+
+    assert result.rows() == _expected(df.select("x", "y"))
+
+
+def test_lazy_select_next_to_other_expressions():
+    """The output length is the number of kept cells, not the frame height."""
+    lf = pl.LazyFrame({"a": [1, None, 3], "b": [None, None, 5]})
+    result = lf.select(
+        _unpivot_sparse_expr(pl.all()).alias("coo"),
+        total=pl.col("a").sum(),
+    ).collect()
+
+    assert result.height == 3
+    assert result["total"].to_list() == [4, 4, 4]
+    assert result.unnest("coo").select("row_idx", "col_idx", "value").rows() == [
+        (0, 0, 1),
+        (2, 0, 3),
+        (2, 1, 5),
+    ]
+
+    result = unpivot_sparse(lf).with_columns(n_cells=pl.len()).collect()
+    assert result["n_cells"].to_list() == [3, 3, 3]
+
+
+def test_all_null():
+    df = pl.DataFrame(
+        {"a": [None, None], "b": [None, None]}, schema={"a": pl.Int32, "b": pl.Int32}
+    )
+    result = unpivot_sparse(df)
+    assert result.height == 0
+    assert result.schema["value"] == pl.Int32
+
+
+## Benchmarks:
+@pytest.fixture
+def df() -> pl.DataFrame:
+    n_rows = 100_000
+    n_cols = 50
+    rng = np.random.default_rng(seed=42)
+    data = {}
+    for i in range(n_cols):
+        values = rng.integers(0, 1_000, size=n_rows)
+        # Mostly empty, like the frames this is for
+        mask = rng.random(n_rows) < 0.9
+        data[f"col{i}"] = np.where(mask, None, values).tolist()
+    return pl.DataFrame(data)
+
+
+def test_unpivot_sparse_bench(df, benchmark) -> None:
+    benchmark.group = "unpivot_sparse"
+    benchmark(lambda: unpivot_sparse(df))
+
+
+def test_unpivot_sparse_old_bench(df, benchmark) -> None:
+    benchmark.group = "unpivot_sparse"
+    benchmark(
+        lambda: df.with_row_index("row_idx").unpivot(index="row_idx").drop_nulls()
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])